@@ -14,6 +14,8 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from flask_migrate import Migrate
 from flask_login import LoginManager, current_user, login_required, logout_user
 from utils.logger import setup_logger
+from utils.archiving import init_archive
+from commands import register_commands
 from supabase import create_client, Client
 
 from models import (
@@ -425,6 +427,9 @@ app.register_blueprint(attendance_bp, url_prefix='/attendance')
 app.register_blueprint(admin_bp)
 app.register_blueprint(staff_bp)
 
+# 관리용 CLI 명령 등록
+register_commands(app)
+
 # 스케줄러 초기화
 scheduler = BackgroundScheduler()
 # 스케줄러 초기화 및 시작 비활성화 (문제 해결을 위해)
@@ -438,6 +443,7 @@ with app.app_context():
         # 기존 데이터와의 충돌을 방지하기 위해 데이터베이스를 재생성
         db.drop_all()  # 모든 테이블 삭제
         db.create_all()  # 테이블 다시 생성
+        init_archive(app)  # 보관 테이블 준비
         
         # 기존 관리자 계정 생성
         admin = User(
@@ -0,0 +1,56 @@
+import click
+from datetime import date, timedelta
+from flask.cli import with_appcontext
+
+@click.command('rebuild-workload-rollups')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='재계산 시작일 (기본값: 종료일 30일 전)')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='재계산 종료일 (기본값: 오늘)')
+@with_appcontext
+def rebuild_workload_rollups_command(start_date, end_date):
+    """기간의 시간대별 근무 집계를 출근 기록과 피드백으로 다시 계산"""
+    from utils.workload_rollup import collect_workload_records, rebuild_workload_rollups
+
+    end_date = end_date.date() if end_date else date.today()
+    start_date = start_date.date() if start_date else end_date - timedelta(days=30)
+    if start_date > end_date:
+        raise click.BadParameter('시작일이 종료일보다 늦습니다.', param_hint='--start')
+
+    shifts, feedbacks = collect_workload_records(start_date, end_date)
+    rows = rebuild_workload_rollups(start_date, end_date, shifts, feedbacks)
+    click.echo(f"근무 집계 재계산 완료: {start_date} ~ {end_date}, {rows}행")
+
+@click.command('rebuild-daily-usage')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='재계산 시작일 (기본값: 종료일 30일 전)')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='재계산 종료일 (기본값: 오늘)')
+@with_appcontext
+def rebuild_daily_usage_command(start_date, end_date):
+    """기간의 일별 사용량 집계를 재고 거래(보관 데이터 포함)로 다시 계산"""
+    from extensions import db
+    from utils.usage_rollup import rebuild_daily_usage
+
+    end_date = end_date.date() if end_date else date.today()
+    start_date = start_date.date() if start_date else end_date - timedelta(days=30)
+    if start_date > end_date:
+        raise click.BadParameter('시작일이 종료일보다 늦습니다.', param_hint='--start')
+
+    count = rebuild_daily_usage(db.session, start_date, end_date)
+    click.echo(f"일별 사용량 집계 재계산 완료: {start_date} ~ {end_date}, 사용 거래 {count}건")
+
+@click.command('init-ledger')
+@with_appcontext
+def init_ledger_command():
+    """기초 잔량이 없는 계정에 현재 수량 기준 재고 원장 기초 잔량 추가 (원장 도입 시 실행)"""
+    from utils.inventory_ledger import initialize_ledger
+
+    count = initialize_ledger()
+    click.echo(f"재고 원장 기초 잔량 추가 완료: {count}건")
+
+def register_commands(app):
+    """관리용 CLI 명령 등록 (flask <명령>으로 실행)"""
+    app.cli.add_command(rebuild_workload_rollups_command)
+    app.cli.add_command(rebuild_daily_usage_command)
+    app.cli.add_command(init_ledger_command)
@@ -46,6 +46,14 @@ class Config:
     KAKAO_REST_API_KEY = os.environ.get('KAKAO_REST_API_KEY', 'your-kakao-rest-api-key')
     KAKAO_TEMPLATE_ID = os.environ.get('KAKAO_TEMPLATE_ID', 'your-kakao-template-id')
     
+    # 데이터 보관 설정 (보관 기준일보다 오래된 발주/알림 로그/재고 거래를 보관 테이블로 이동)
+    ARCHIVE_HORIZON_DAYS = int(os.getenv('ARCHIVE_HORIZON_DAYS', 365))
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+    ARCHIVE_DATABASE_PATH = os.getenv('ARCHIVE_DATABASE_PATH')  # 지정 시 별도 SQLite 파일에 보관
+
+    # 재고 사용 통계 캐시 유지 시간(초)
+    USAGE_STATS_CACHE_TTL = int(os.getenv('USAGE_STATS_CACHE_TTL', 300))
+    
     FLASK_APP = os.getenv('FLASK_APP', 'app.py')
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
 
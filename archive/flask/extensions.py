@@ -1,3 +1,6 @@
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
@@ -8,6 +11,19 @@ from flask_cors import CORS
 # SQLAlchemy 인스턴스 생성
 db = SQLAlchemy()
 
+# SQLite 트랜잭션 처리
+# pysqlite는 첫 DML 전까지 BEGIN을 보내지 않아, 트랜잭션 시작 직후의 SAVEPOINT(begin_nested)를
+# 해제하면 바로 커밋된다. 드라이버의 BEGIN 처리를 끄고 SQLAlchemy가 트랜잭션 시작 시 BEGIN을 보낸다.
+@event.listens_for(Engine, 'connect')
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.isolation_level = None
+
+@event.listens_for(Engine, 'begin')
+def _sqlite_begin(conn):
+    if conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql('BEGIN')
+
 # Migrate 인스턴스 생성
 migrate = Migrate()
 
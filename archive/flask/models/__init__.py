@@ -14,12 +14,18 @@ from .inventory import (
     StockItem,
     StockTransaction,
     StockUsageAlert,
+    InventoryMonthlySnapshot,
+    DailyUsageRollup,
+    InventoryLedgerEntry,
+    InventoryLedgerSnapshot,
     Inventory,
     Disposal
 )
 
-from .schedule import Schedule, ScheduleHistory
+from .schedule import Schedule, ScheduleHistory, WorkFeedback
 from .attendance import Attendance
+from .scheduler import SchedulerJobRun, ScheduleDigestState
+from .workload import WorkloadRollup
 
 from extensions import db
 
@@ -37,10 +43,15 @@ __all__ = [
     'StockItem',
     'StockTransaction',
     'StockUsageAlert',
+    'InventoryMonthlySnapshot',
+    'DailyUsageRollup',
+    'InventoryLedgerEntry',
+    'InventoryLedgerSnapshot',
     'Inventory',
     'Disposal',
     'Schedule',
     'ScheduleHistory',
+    'WorkFeedback',
     'Notification',
     'AlertLog',
     'Attendance',
@@ -53,6 +64,9 @@ __all__ = [
     'NotificationSetting',
     'NotificationLog',
     'Payroll',
+    'SchedulerJobRun',
+    'ScheduleDigestState',
+    'WorkloadRollup',
 ]
 
 # models 패키지 초기화
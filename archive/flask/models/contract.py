@@ -12,6 +12,7 @@ class Contract(db.Model):
     position = db.Column(db.String(50))
     salary = db.Column(db.Float)
     contract_type = db.Column(db.String(20))  # full-time, part-time, temporary
+    pay_day = db.Column(db.Integer, index=True)  # 급여일 (1~31, 말일보다 크면 말일)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -31,6 +32,7 @@ class Contract(db.Model):
             'position': self.position,
             'salary': self.salary,
             'contract_type': self.contract_type,
+            'pay_day': self.pay_day,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -82,6 +82,15 @@ class InventoryItem(db.Model):
 class InventoryBatch(db.Model):
     """재고 배치 모델"""
     __tablename__ = 'inventory_batches'
+    __table_args__ = (
+        # 품목별 남은 배치를 유통기한 순으로 조회 (남은 수량이 있는 배치만 색인)
+        # 조건식은 available_quantity 표현식과 같아야 부분 인덱스가 사용된다
+        db.Index(
+            'ix_inventory_batches_item_id_expiration_date_available', 'item_id', 'expiration_date',
+            sqlite_where=db.text('quantity - COALESCE(used_quantity, 0) > 0'),
+            postgresql_where=db.text('quantity - COALESCE(used_quantity, 0) > 0')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     item_id = db.Column(db.Integer, db.ForeignKey('inventory_items.id'), nullable=False)
@@ -98,6 +107,16 @@ class InventoryBatch(db.Model):
     # 관계 설정
     item = db.relationship('InventoryItem', back_populates='batches')
     
+    @hybrid_property
+    def available_quantity(self):
+        """남은 수량"""
+        return self.quantity - (self.used_quantity or 0)
+
+    @available_quantity.expression
+    def available_quantity(cls):
+        # 0은 바인드 파라미터가 아닌 리터럴로 두어야 SQLite가 부분 인덱스 조건과 같은 식으로 인식한다
+        return cls.quantity - db.func.coalesce(cls.used_quantity, db.literal_column('0'))
+
     @property
     def expire_soon(self):
         """유통기한이 3일 이내로 남았는지 확인"""
@@ -150,6 +169,9 @@ class StockItem(db.Model):
 class StockTransaction(db.Model):
     """재고 거래 모델"""
     __tablename__ = 'stock_transactions'
+    __table_args__ = (
+        db.Index('ix_stock_transactions_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     stock_item_id = db.Column(db.Integer, db.ForeignKey('stock_items.id'), nullable=False)
@@ -166,6 +188,87 @@ class StockTransaction(db.Model):
     def __repr__(self):
         return f'<StockTransaction {self.id}>'
 
+class InventoryMonthlySnapshot(db.Model):
+    """월말 재고 스냅샷 모델 (마감된 월의 품목별 기초/기말 재고와 합계)"""
+    __tablename__ = 'inventory_monthly_snapshots'
+    __table_args__ = (
+        db.UniqueConstraint('year', 'month', 'item_id', name='uq_inventory_monthly_snapshots_month_item'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory_items.id'), nullable=False)
+    item_name = db.Column(db.String(100), nullable=False)
+    ingredient_names = db.Column(db.String(500))  # 이 품목을 쓰는 재료 이름 (쉼표 구분)
+    unit = db.Column(db.String(20))
+    opening_stock = db.Column(db.Float, default=0)   # 월초 재고
+    closing_stock = db.Column(db.Float, default=0)   # 월말 재고
+    min_stock = db.Column(db.Float, default=0)
+    ordered_quantity = db.Column(db.Float, default=0)
+    ordered_cost = db.Column(db.Float, default=0)
+    received_quantity = db.Column(db.Float, default=0)
+    used_quantity = db.Column(db.Float, default=0)
+    cost_per_unit = db.Column(db.Float, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<InventoryMonthlySnapshot {self.year}-{self.month:02d} {self.item_id}>'
+
+class DailyUsageRollup(db.Model):
+    """일별 재고 사용량 집계 모델 (날짜, 품목, 사용자별, 사용 거래마다 증분 갱신)"""
+    __tablename__ = 'daily_usage_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('date', 'item_id', 'user_id', name='uq_daily_usage_rollups_date_item_user'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory_items.id'), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False, default=0)  # 0: 사용자 미지정
+    quantity = db.Column(db.Float, nullable=False, default=0)  # 사용량 (양수)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DailyUsageRollup {self.date} {self.item_id} {self.user_id}>'
+
+class InventoryLedgerEntry(db.Model):
+    """재고 원장 모델 (재고 변동을 추가만 하는 기록, stock_item_id 0은 품목 수량 계정)"""
+    __tablename__ = 'inventory_ledger'
+    __table_args__ = (
+        db.Index('ix_inventory_ledger_account_id', 'item_id', 'stock_item_id', 'id'),
+        db.Index('ix_inventory_ledger_created_at', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory_items.id'), nullable=False)
+    stock_item_id = db.Column(db.Integer, nullable=False, default=0)  # 0: InventoryItem.current_quantity
+    quantity = db.Column(db.Float, nullable=False)  # 변동량 (입고 +, 사용 -)
+    source = db.Column(db.String(30), nullable=False)  # opening, receipt, usage, batch_consumption 등
+    reference = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<InventoryLedgerEntry {self.id} {self.item_id}/{self.stock_item_id} {self.quantity}>'
+
+class InventoryLedgerSnapshot(db.Model):
+    """재고 원장 스냅샷 모델 (ledger_id까지의 변동을 합산한 계정별 잔량)"""
+    __tablename__ = 'inventory_ledger_snapshots'
+    __table_args__ = (
+        db.Index('ix_inventory_ledger_snapshots_account', 'item_id', 'stock_item_id', 'ledger_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory_items.id'), nullable=False)
+    stock_item_id = db.Column(db.Integer, nullable=False, default=0)
+    ledger_id = db.Column(db.Integer, nullable=False)  # 포함한 마지막 원장 ID
+    quantity = db.Column(db.Float, nullable=False)
+    taken_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<InventoryLedgerSnapshot {self.item_id}/{self.stock_item_id} @{self.ledger_id}>'
+
 class StockUsageAlert(db.Model):
     """재고 사용 알림 모델"""
     __tablename__ = 'stock_usage_alerts'
@@ -4,6 +4,9 @@ from extensions import db
 class Notification(db.Model):
     """알림 모델"""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_user_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -59,7 +62,7 @@ class NotificationLog(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     notification_id = db.Column(db.Integer, db.ForeignKey('notifications.id'), nullable=False)
-    delivery_status = db.Column(db.String(20))  # sent, failed, delivered
+    delivery_status = db.Column(db.String(20))  # queued, sent, failed, delivered
     delivery_time = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -4,6 +4,9 @@ from datetime import datetime
 class Order(db.Model):
     """발주 모델"""
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -41,4 +41,24 @@ class ScheduleHistory(db.Model):
     user = db.relationship('User', back_populates='schedule_history')
 
     def __repr__(self):
-        return f'<ScheduleHistory {self.id}: {self.action} {self.schedule_id}>' 
\ No newline at end of file
+        return f'<ScheduleHistory {self.id}: {self.action} {self.schedule_id}>' 
+
+class WorkFeedback(db.Model):
+    """근무 피드백 모델 (일정별 1건)"""
+    __tablename__ = 'work_feedbacks'
+    __table_args__ = (
+        # 피드백 목록 키셋 페이지네이션 (submitted_at, id) 내림차순
+        db.Index('ix_work_feedbacks_submitted_at_id', 'submitted_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    schedule_id = db.Column(db.Integer, db.ForeignKey('schedules.id'), nullable=False, unique=True)
+    rating = db.Column(db.Integer, nullable=False)  # 1~5
+    comment = db.Column(db.Text)
+    submitted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # 관계 설정
+    schedule = db.relationship('Schedule', backref=db.backref('feedback', uselist=False))
+
+    def __repr__(self):
+        return f'<WorkFeedback {self.schedule_id}: {self.rating}>'
@@ -0,0 +1,49 @@
+from datetime import datetime
+from extensions import db
+
+class SchedulerJobRun(db.Model):
+    """스케줄러 작업 실행 이력 모델"""
+    __tablename__ = 'scheduler_job_runs'
+    __table_args__ = (
+        db.Index('ix_scheduler_job_runs_job_started', 'job_name', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Float)
+    rows_scanned = db.Column(db.Integer, default=0)
+    notifications_created = db.Column(db.Integer, default=0)
+    status = db.Column(db.String(20), nullable=False)  # success, failed
+    error = db.Column(db.Text)
+    over_budget = db.Column(db.Boolean, default=False)
+
+    def to_dict(self):
+        """실행 이력을 딕셔너리로 변환"""
+        return {
+            'id': self.id,
+            'job_name': self.job_name,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_ms': self.duration_ms,
+            'rows_scanned': self.rows_scanned,
+            'notifications_created': self.notifications_created,
+            'status': self.status,
+            'error': self.error,
+            'over_budget': self.over_budget
+        }
+
+    def __repr__(self):
+        return f'<SchedulerJobRun {self.job_name} - {self.status}>'
+
+class ScheduleDigestState(db.Model):
+    """관리자별 마지막 미확인 스케줄 요약 알림 (재시작, 워커, 리더 변경 후에도 병합 유지)"""
+    __tablename__ = 'schedule_digest_states'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    last_sent_at = db.Column(db.DateTime, nullable=False)
+    schedule_ids = db.Column(db.JSON)  # 마지막 요약에 포함된 스케줄 ID 목록
+
+    def __repr__(self):
+        return f'<ScheduleDigestState {self.user_id} - {self.last_sent_at}>'
@@ -0,0 +1,23 @@
+from datetime import datetime
+from extensions import db
+
+class WorkloadRollup(db.Model):
+    """매장/날짜/시간(0~23시)별 근무 및 피드백 집계 모델 (퇴근, 피드백 제출 시 증분 갱신)"""
+    __tablename__ = 'workload_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('store_id', 'date', 'hour', name='uq_workload_rollups_store_date_hour'),
+        db.Index('ix_workload_rollups_date', 'date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    store_id = db.Column(db.Integer, nullable=False, default=0)  # 0: 매장 미지정
+    date = db.Column(db.Date, nullable=False)
+    hour = db.Column(db.Integer, nullable=False)  # 0~23
+    headcount = db.Column(db.Integer, nullable=False, default=0)  # 이 시간에 출근한 인원
+    worked_minutes = db.Column(db.Integer, nullable=False, default=0)  # 이 시간 안에 근무한 시간(분) 합계
+    feedback_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<WorkloadRollup {self.store_id} {self.date} {self.hour}시>'
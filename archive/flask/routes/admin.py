@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, jsonify
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta, date
 from models import Employee, Contract, Attendance, Schedule, WorkEvaluation, Notification, TerminationDocument, db, NotificationSetting, NotificationLog
@@ -7,7 +7,8 @@ from utils.statistics import get_attendance_stats, get_wage_stats, get_evaluatio
 from utils.kakao import send_kakao_alert
 from utils.pdf import generate_termination_pdf
 from sqlalchemy import func, and_
-from scheduler.low_stock_notifier import notify_low_stock
+from scheduler.job_metrics import get_job_metrics
+from scheduler.tasks import get_scheduler_status, schedule_low_stock_notifier
 import logging
 import os
 
@@ -262,19 +263,8 @@ def notification_settings():
         setting.minute = int(request.form['minute'])
         db.session.commit()
 
-        # 스케줄러 재등록
-        sched = current_app.scheduler
-        try:
-            sched.remove_job('low_stock_notifier')
-        except Exception:
-            pass
-        sched.add_job(
-            notify_low_stock,
-            'cron',
-            hour=setting.hour,
-            minute=setting.minute,
-            id='low_stock_notifier'
-        )
+        # 스케줄러 재등록 (시작 시 등록한 작업과 같이 리더 프로세스에서만 실행하고 실행 이력을 기록)
+        schedule_low_stock_notifier(setting.hour, setting.minute)
         return redirect(url_for('admin.notification_settings'))
 
     return render_template('admin/notification_settings.html', setting=setting)
@@ -329,4 +319,20 @@ def notification_logs():
     except Exception as e:
         logger.error(f"알림 로그 조회 중 오류 발생: {str(e)}")
         flash('알림 로그 조회 중 오류가 발생했습니다.', 'error')
-        return redirect(url_for('admin.dashboard')) 
\ No newline at end of file
+        return redirect(url_for('admin.dashboard')) 
+
+@admin_bp.route('/admin/scheduler/jobs')
+@login_required
+@admin_required
+def scheduler_job_metrics():
+    """스케줄러 작업별 실행 통계 (p50/p95 소요 시간, 실패 횟수, 마지막 오류)"""
+    try:
+        days = request.args.get('days', 7, type=int)
+        return jsonify({
+            'status': get_scheduler_status(),
+            'days': days,
+            'jobs': get_job_metrics(days=days)
+        })
+    except Exception as e:
+        logger.error(f"스케줄러 작업 통계 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '스케줄러 작업 통계 조회 중 오류가 발생했습니다.'}), 500
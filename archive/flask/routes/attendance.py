@@ -6,6 +6,7 @@ from utils.wage import calculate_monthly_wage
 from utils.pdf import generate_payroll_pdf, generate_evaluation_pdf
 from utils.statistics import get_attendance_stats, get_wage_stats, get_evaluation_stats
 from utils.contract import renew_contract
+from utils.workload_rollup import record_shift, get_store_id
 from datetime import datetime, timedelta
 from routes.auth import token_required
 from utils.decorators import admin_required
@@ -60,6 +61,14 @@ def clock_out(user_id):
             return jsonify({'status': 'error', 'message': '이미 퇴근했습니다.'}), 400
             
         attendance.clock_out = datetime.now().time()
+        # 시간대별 근무 집계 반영
+        work_date = attendance.timestamp.date()
+        shift_start = datetime.combine(work_date, attendance.clock_in)
+        shift_end = datetime.combine(work_date, attendance.clock_out)
+        if shift_end <= shift_start:
+            # 자정을 넘긴 근무
+            shift_end += timedelta(days=1)
+        record_shift(shift_start, shift_end, get_store_id(user_id))
         db.session.commit()
         
         return jsonify({'status': 'success', 'message': '퇴근이 기록되었습니다.'})
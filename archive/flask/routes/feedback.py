@@ -3,6 +3,8 @@ from models import db, WorkFeedback, Schedule, User
 from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import logging
+from utils.pagination import keyset_paginate, get_page_args
+from utils.workload_rollup import record_feedback, get_store_id
 
 feedback_bp = Blueprint('feedback', __name__)
 logger = logging.getLogger(__name__)
@@ -83,6 +85,8 @@ def feedback_submit():
         )
         
         db.session.add(feedback)
+        # 시간대별 근무 집계 반영
+        record_feedback(feedback.submitted_at, feedback.rating, get_store_id(current_user_id))
         db.session.commit()
         
         flash('피드백이 성공적으로 제출되었습니다. 감사합니다!', 'success')
@@ -108,7 +112,15 @@ def get_feedback_list():
                 'message': '권한이 없습니다.'
             }), 403
             
-        feedbacks = WorkFeedback.query.order_by(WorkFeedback.submitted_at.desc()).all()
+        cursor, limit = get_page_args()
+        try:
+            page = keyset_paginate(WorkFeedback.query, WorkFeedback.submitted_at, WorkFeedback.id, cursor, limit)
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        feedbacks = page.items
         result = [{
             'id': f.id,
             'schedule_id': f.schedule_id,
@@ -119,7 +131,8 @@ def get_feedback_list():
 
         return jsonify({
             'status': 'success',
-            'feedbacks': result
+            'feedbacks': result,
+            'pagination': page.to_dict()
         })
         
     except Exception as e:
@@ -1,18 +1,23 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, send_file
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, send_file, Response, stream_with_context
 from flask_login import login_required, current_user
 from models import db, InventoryItem, Ingredient, OrderItem, StockItem, StockTransaction, StockUsageAlert, User, InventoryBatch, Order
 from datetime import datetime, date, timedelta
 from utils.alerts import send_alert
 from utils.inventory_report import get_monthly_inventory_report
-from utils.inventory import consume_stock
+from utils.inventory import consume_stock, get_low_stock_ingredients, get_items_with_head_batch, deduct_stock_bulk
 from utils.decorators import admin_required
 from utils.inventory_stats import get_usage_statistics
-from utils.excel_export import export_stock_usage_to_excel
+from utils.usage_rollup import set_usage_user
+from utils.excel_export import (
+    export_stock_usage_to_excel, stock_usage_rows, iter_stock_usage_csv, iter_file, export_filename
+)
 from utils.kakao import send_kakao_to_admin
 from utils.notification import send_notification
+from utils.pagination import keyset_paginate, get_page_args
 import logging
 import os
 from werkzeug.utils import secure_filename
+from urllib.parse import quote
 
 inventory_bp = Blueprint('inventory', __name__, url_prefix='/inventory')
 logger = logging.getLogger(__name__)
@@ -128,27 +133,20 @@ def transaction():
 @inventory_bp.route('/history')
 @login_required
 def history():
-    """재고 변동 내역"""
-    transactions = StockTransaction.query.order_by(StockTransaction.created_at.desc()).all()
-    return render_template('inventory/history.html', transactions=transactions)
+    """재고 변동 내역 (cursor, limit 파라미터로 키셋 페이지 조회)"""
+    cursor, limit = get_page_args()
+    try:
+        page = keyset_paginate(StockTransaction.query, StockTransaction.created_at, StockTransaction.id, cursor, limit)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('inventory.history'))
+    return render_template('inventory/history.html', transactions=page.items, page=page)
 
 @inventory_bp.route('/low-stock')
 @login_required
 def low_stock():
     """부족 재고 목록"""
-    low_stock_items = []
-    ingredients = Ingredient.query.all()
-    
-    for ingredient in ingredients:
-        stock_item = StockItem.query.filter_by(ingredient_id=ingredient.id).first()
-        current_quantity = stock_item.quantity if stock_item else 0
-        
-        if current_quantity <= ingredient.min_quantity:
-            low_stock_items.append({
-                'ingredient': ingredient,
-                'current_quantity': current_quantity
-            })
-    
+    low_stock_items = get_low_stock_ingredients()
     return render_template('inventory/low_stock.html', low_stock_items=low_stock_items)
 
 @inventory_bp.route('/api/inventory/item', methods=['POST'])
@@ -298,8 +296,13 @@ def order():
 @login_required
 @admin_required
 def orders():
-    orders = Order.query.order_by(Order.created_at.desc()).all()
-    return render_template('inventory/orders.html', orders=orders)
+    cursor, limit = get_page_args()
+    try:
+        page = keyset_paginate(Order.query, Order.created_at, Order.id, cursor, limit)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('inventory.orders'))
+    return render_template('inventory/orders.html', orders=page.items, page=page)
 
 @inventory_bp.route('/order/new', methods=['GET', 'POST'])
 @login_required
@@ -457,7 +460,8 @@ def deduct_stock(ingredient_id):
         # 재고 업데이트
         ingredient.current_stock -= quantity
         
-        # 거래 내역 기록
+        # 거래 내역 기록 (일별 사용량은 현재 사용자로 집계)
+        set_usage_user(db.session, current_user.id)
         transaction = StockTransaction(
             ingredient_id=ingredient.id,
             transaction_type='usage',
@@ -492,36 +496,9 @@ def batch_deduct_stock():
         items = data['items']
         notes = data.get('notes', '')
         
-        # 트랜잭션 시작
-        db.session.begin_nested()
+        # 재고 일괄 차감 (하나라도 부족하면 전체 취소)
+        deduct_stock_bulk(items, notes, current_user.id)
         
-        for item in items:
-            ingredient_id = item.get('ingredient_id')
-            quantity = float(item.get('quantity', 0))
-            
-            if not ingredient_id or quantity <= 0:
-                continue
-                
-            ingredient = Ingredient.query.get(ingredient_id)
-            if not ingredient:
-                continue
-                
-            if ingredient.current_stock < quantity:
-                raise ValueError(f'{ingredient.name}의 재고가 부족합니다.')
-                
-            # 재고 업데이트
-            ingredient.current_stock -= quantity
-            
-            # 거래 내역 기록
-            transaction = StockTransaction(
-                ingredient_id=ingredient.id,
-                transaction_type='usage',
-                quantity=-quantity,
-                created_by=current_user.id,
-                notes=notes
-            )
-            db.session.add(transaction)
-            
         # 트랜잭션 커밋
         db.session.commit()
         return jsonify({'message': '재고가 차감되었습니다.'}), 200
@@ -782,44 +759,37 @@ def stock_usage_stats():
 @login_required
 @admin_required
 def export_stock_usage():
-    """재고 사용 내역 엑셀 다운로드"""
+    """재고 사용 내역 엑셀(CSV) 다운로드 (format=csv면 CSV를 스트리밍)"""
     try:
         # 필터 파라미터
         ingredient_id = request.args.get('ingredient_id', type=int)
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-        
-        # 기본 쿼리
-        query = StockTransaction.query.filter_by(transaction_type='usage')
-        
-        # 필터 적용
-        if ingredient_id:
-            query = query.filter_by(ingredient_id=ingredient_id)
-        if start_date:
-            query = query.filter(StockTransaction.created_at >= start_date)
-        if end_date:
-            query = query.filter(StockTransaction.created_at <= end_date)
-            
-        # 데이터 조회
-        transactions = query.order_by(StockTransaction.created_at.desc()).all()
-        
-        # 엑셀 파일 생성
-        excel_file = export_stock_usage_to_excel(transactions)
-        if not excel_file:
-            flash('엑셀 파일 생성에 실패했습니다.', 'error')
-            return redirect(url_for('inventory.stock_usage_history'))
-            
-        # 파일명 생성
-        filename = f'재고사용내역_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        
-        return send_file(
-            excel_file,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
+        file_format = request.args.get('format', 'xlsx')
+        
+        rows = stock_usage_rows(ingredient_id, start_date, end_date)
+        
+        if file_format == 'csv':
+            # 행을 읽는 대로 CSV로 변환하여 전송
+            body = stream_with_context(iter_stock_usage_csv(rows))
+            mimetype = 'text/csv; charset=utf-8'
+            filename = export_filename('csv')
+        else:
+            # 엑셀 파일은 임시 파일에 쓴 뒤 나눠서 전송
+            excel_path = export_stock_usage_to_excel(rows)
+            if not excel_path:
+                flash('엑셀 파일 생성에 실패했습니다.', 'error')
+                return redirect(url_for('inventory.stock_usage_history'))
+            body = iter_file(excel_path)
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            filename = export_filename('xlsx')
+        
+        return Response(body, mimetype=mimetype, headers={
+            'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}"
+        })
         
     except Exception as e:
+        logger.error(f"재고 사용 내역 내보내기 중 오류 발생: {str(e)}")
         flash(f'오류가 발생했습니다: {str(e)}', 'error')
         return redirect(url_for('inventory.stock_usage_history'))
 
@@ -910,24 +880,16 @@ def delete_stock_usage_alert(alert_id):
 @login_required
 def item_list():
     """재고 품목 목록"""
-    items = InventoryItem.query.all()
-    inventory_list = []
-    
-    for item in items:
-        # 남은 수량이 있는 배치만 필터링하고 유통기한 순으로 정렬
-        batches = InventoryBatch.query.filter_by(item_id=item.id)\
-            .filter(InventoryBatch.quantity - InventoryBatch.used_quantity > 0)\
-            .order_by(InventoryBatch.expiration_date).all()
-        
-        if batches:
-            # 첫 번째 배치 정보 사용
-            first_batch = batches[0]
-            inventory_list.append({
-                'item': item,
-                'expire_date': first_batch.expiration_date,
-                'expire_soon': first_batch.expire_soon,
-                'available_quantity': first_batch.available_quantity
-            })
+    # 품목별로 유통기한이 가장 이른 배치 정보 사용
+    inventory_list = [
+        {
+            'item': item,
+            'expire_date': first_batch.expiration_date,
+            'expire_soon': first_batch.expire_soon,
+            'available_quantity': first_batch.available_quantity
+        }
+        for item, first_batch in get_items_with_head_batch()
+    ]
     
     return render_template('inventory/items.html', inventory_list=inventory_list)
 
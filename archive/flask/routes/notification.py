@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, jsonify
 from flask_login import login_required, current_user
 from models import db, Notification
 from datetime import datetime
+from utils.pagination import keyset_paginate, get_page_args
 
 notification_bp = Blueprint('notification', __name__, url_prefix='/notification')
 
@@ -17,10 +18,15 @@ def index():
 @notification_bp.route('/api/notifications')
 @login_required
 def get_notifications():
-    """알림 목록 API"""
-    notifications = Notification.query.filter_by(user_id=current_user.id)\
-        .order_by(Notification.created_at.desc())\
-        .all()
+    """알림 목록 API (cursor, limit 파라미터로 키셋 페이지 조회)"""
+    cursor, limit = get_page_args()
+    try:
+        page = keyset_paginate(
+            Notification.query.filter_by(user_id=current_user.id),
+            Notification.created_at, Notification.id, cursor, limit
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     return jsonify({
         'status': 'success',
         'notifications': [{
@@ -29,7 +35,8 @@ def get_notifications():
             'message': n.message,
             'created_at': n.created_at.strftime('%Y-%m-%d %H:%M:%S'),
             'is_read': n.is_read
-        } for n in notifications]
+        } for n in page.items],
+        'pagination': page.to_dict()
     })
 
 @notification_bp.route('/api/notifications/read/<int:notification_id>', methods=['POST'])
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional
 from utils.notification import send_notification
+from utils.archiving import with_archive
 from flask_login import login_required, current_user
 
 logger = logging.getLogger(__name__)
@@ -228,11 +229,14 @@ def filter_order_statistics():
         start_date = datetime.strptime(data['start_date'], '%Y-%m-%d')
         end_date = datetime.strptime(data['end_date'], '%Y-%m-%d')
         
+        # 조회 기간이 보관 기준일 이전까지 닿으면 보관된 발주도 포함
+        source = with_archive(Order, start_date)
+        
         # 카테고리별 발주 금액
         category_stats = {}
         for category in ProductCategory:
-            orders = Order.query.join(Inventory).filter(
-                Order.order_date.between(start_date, end_date),
+            orders = db.session.query(source).join(Inventory).filter(
+                source.order_date.between(start_date, end_date),
                 Inventory.category == category
             ).all()
             
@@ -241,8 +245,8 @@ def filter_order_statistics():
         
         # 업체별 발주 횟수
         supplier_stats = {}
-        orders = Order.query.join(Inventory).filter(
-            Order.order_date.between(start_date, end_date)
+        orders = db.session.query(source).join(Inventory).filter(
+            source.order_date.between(start_date, end_date)
         ).all()
         
         for order in orders:
@@ -255,8 +259,8 @@ def filter_order_statistics():
         current_date = start_date
         while current_date <= end_date:
             next_date = current_date + timedelta(days=1)
-            daily_orders = Order.query.filter(
-                Order.order_date.between(current_date, next_date)
+            daily_orders = db.session.query(source).filter(
+                source.order_date.between(current_date, next_date)
             ).all()
             
             daily_stats[current_date.strftime('%Y-%m-%d')] = {
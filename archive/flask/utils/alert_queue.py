@@ -0,0 +1,90 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class AlertQueue:
+    """
+    알림 비동기 발송 큐
+
+    스케줄러 작업은 발송 함수와 인자를 큐에 넣기만 하고 바로 다음 작업을 진행한다.
+    백그라운드 스레드가 큐에 쌓인 알림을 최대 batch_size건씩 꺼내 발송한다.
+    """
+
+    def __init__(self, batch_size: int = 50, poll_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='alert-queue', daemon=True)
+            self._thread.start()
+
+    def put(self, func: Callable, *args, **kwargs):
+        """발송 함수와 인자를 큐에 추가"""
+        self._queue.put((func, args, kwargs))
+        self._ensure_worker()
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            failed = 0
+            for func, args, kwargs in batch:
+                try:
+                    if func(*args, **kwargs) is False:
+                        failed += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"알림 발송 중 오류 발생: {str(e)}")
+                finally:
+                    self._queue.task_done()
+            if batch:
+                self.sent += len(batch) - failed
+                self.failed += failed
+                logger.info(f"알림 {len(batch)}건 발송 완료 (실패 {failed}건)")
+
+    def flush(self):
+        """큐에 쌓인 알림이 모두 발송될 때까지 대기"""
+        if self._thread and self._thread.is_alive():
+            self._queue.join()
+
+    def pending(self) -> int:
+        """발송 대기 중인 알림 수"""
+        return self._queue.qsize()
+
+
+# 전역 알림 큐 인스턴스
+alert_queue = AlertQueue()
+
+# 프로세스 종료 시 남은 알림 발송
+atexit.register(alert_queue.flush)
+
+
+def queue_alert(func: Callable, *args, **kwargs):
+    """알림을 비동기 발송 큐에 추가"""
+    alert_queue.put(func, *args, **kwargs)
@@ -0,0 +1,208 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Optional, Tuple
+from flask import current_app
+from sqlalchemy import (
+    MetaData, Table, Column, Index, String, DateTime, select, insert, delete, update, union_all, event
+)
+from sqlalchemy.orm import aliased
+from extensions import db
+from models.order import Order, OrderItem
+from models.notification import AlertLog
+from models.inventory import StockTransaction
+
+logger = logging.getLogger(__name__)
+
+# 별도 SQLite 파일을 연결할 때 사용하는 스키마 이름
+ARCHIVE_SCHEMA = 'archive'
+
+# 보관 테이블 메타데이터 (앱 모델 메타데이터와 분리하여 마이그레이션 대상에서 제외)
+archive_metadata = MetaData()
+
+# 테이블별 보관 기준 시각 (이 시각 이전 행은 보관 테이블에만 있다)
+archive_watermarks = Table(
+    'archive_watermarks', archive_metadata,
+    Column('table_name', String(100), primary_key=True),
+    Column('archived_before', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+@dataclass
+class ArchivePolicy:
+    """보관 대상 테이블 정책 (children: 부모와 함께 옮길 (모델, 외래 키 컬럼) 목록)"""
+    model: type
+    date_column: str
+    children: Tuple[Tuple[type, str], ...] = field(default_factory=tuple)
+
+ARCHIVE_POLICIES = {
+    'orders': ArchivePolicy(Order, 'order_date', ((OrderItem, 'order_id'),)),
+    'alert_logs': ArchivePolicy(AlertLog, 'created_at'),
+    'stock_transactions': ArchivePolicy(StockTransaction, 'created_at'),
+}
+
+# 연결된 보관 DB 파일 경로 (None이면 같은 DB의 *_archive 테이블 사용)
+_attached_path = None
+_archive_tables: Dict[Tuple[str, Optional[str]], Table] = {}
+
+def _archive_schema() -> Optional[str]:
+    return ARCHIVE_SCHEMA if _attached_path else None
+
+def archive_table(table: Table) -> Table:
+    """원본 테이블과 같은 컬럼을 가진 보관 테이블 (외래 키 없이, 날짜/외래 키 컬럼 인덱스 포함)"""
+    schema = _archive_schema()
+    key = (table.name, schema)
+    if key not in _archive_tables:
+        name = f'{table.name}_archive'
+        columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in table.columns]
+        indexed = {c.name for c in table.columns if c.foreign_keys}
+        indexed.update(p.date_column for p in ARCHIVE_POLICIES.values() if p.model.__table__ is table)
+        indexes = [Index(f'ix_{name}_{column}', column) for column in sorted(indexed)]
+        _archive_tables[key] = Table(name, archive_metadata, *columns, *indexes, schema=schema)
+    return _archive_tables[key]
+
+def attach_archive_database(engine, path: str):
+    """모든 연결에 보관용 SQLite 파일을 ARCHIVE_SCHEMA 이름으로 연결 (SQLite 전용)"""
+    global _attached_path
+
+    @event.listens_for(engine, 'connect')
+    def _attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+
+    _attached_path = path
+    # 이미 열린 연결에는 ATTACH가 적용되지 않으므로 풀을 비운다
+    engine.dispose()
+
+def init_archive(app):
+    """
+    보관 설정 초기화
+
+    ARCHIVE_DATABASE_PATH가 지정되면 보관 테이블을 별도 SQLite 파일에 두고,
+    아니면 같은 DB의 *_archive 테이블에 둔다.
+    """
+    with app.app_context():
+        path = app.config.get('ARCHIVE_DATABASE_PATH')
+        if path:
+            if db.engine.dialect.name != 'sqlite':
+                raise ValueError("별도 보관 파일은 SQLite 데이터베이스에서만 지원합니다.")
+            attach_archive_database(db.engine, path)
+        ensure_archive_tables()
+
+def ensure_archive_tables():
+    """보관 테이블과 기준 시각 테이블 생성"""
+    tables = [archive_watermarks]
+    for policy in ARCHIVE_POLICIES.values():
+        tables.append(archive_table(policy.model.__table__))
+        tables.extend(archive_table(child.__table__) for child, _ in policy.children)
+    archive_metadata.create_all(db.engine, tables=tables)
+
+def get_watermark(table_name: str) -> Optional[datetime]:
+    """테이블의 보관 기준 시각 (보관한 적이 없으면 None)"""
+    return db.session.execute(
+        select(archive_watermarks.c.archived_before)
+        .where(archive_watermarks.c.table_name == table_name)
+    ).scalar()
+
+def _set_watermark(conn, table_name: str, cutoff: datetime):
+    now = datetime.utcnow()
+    current = conn.execute(
+        select(archive_watermarks.c.archived_before)
+        .where(archive_watermarks.c.table_name == table_name)
+    ).scalar()
+    if current is None:
+        conn.execute(insert(archive_watermarks).values(table_name=table_name, archived_before=cutoff, updated_at=now))
+    elif cutoff > current:
+        conn.execute(
+            update(archive_watermarks)
+            .where(archive_watermarks.c.table_name == table_name)
+            .values(archived_before=cutoff, updated_at=now)
+        )
+
+def _move_rows(conn, table: Table, condition):
+    """조건에 맞는 행을 보관 테이블로 복사한 뒤 원본에서 삭제"""
+    target = archive_table(table)
+    conn.execute(
+        insert(target).from_select([c.name for c in table.columns], select(*table.columns).where(condition))
+    )
+    return conn.execute(delete(table).where(condition)).rowcount
+
+def archive_table_rows(table_name: str, horizon_days: int, batch_size: int = 1000) -> int:
+    """
+    보관 기준일(오늘 - horizon_days)보다 오래된 행을 batch_size개씩 보관 테이블로 이동
+
+    배치마다 트랜잭션을 나누고, 부모 행과 자식 행(예: 주문과 주문 품목)은 같은 배치에서 옮긴다.
+    보관 기준 시각은 첫 배치와 같은 트랜잭션에서 올려, 일부만 옮겨진 동안에도
+    with_archive 조회가 보관 테이블을 함께 읽도록 한다.
+
+    Returns:
+        int: 이동한 부모 행 수
+    """
+    policy = ARCHIVE_POLICIES[table_name]
+    table = policy.model.__table__
+    date_column = table.c[policy.date_column]
+    cutoff = datetime.combine(date.today() - timedelta(days=horizon_days), time.min)
+
+    moved = 0
+    watermark_set = False
+    while True:
+        with db.engine.begin() as conn:
+            if not watermark_set:
+                _set_watermark(conn, table_name, cutoff)
+            ids = conn.execute(
+                select(table.c.id).where(date_column < cutoff).order_by(table.c.id).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            for child, foreign_key in policy.children:
+                child_table = child.__table__
+                _move_rows(conn, child_table, child_table.c[foreign_key].in_(ids))
+            moved += _move_rows(conn, table, table.c.id.in_(ids))
+        watermark_set = True
+        logger.info(f"{table_name} 보관 중: {moved}건")
+    return moved
+
+def archive_cold_rows(horizon_days: Optional[int] = None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    모든 보관 대상 테이블의 오래된 행 이동
+
+    Returns:
+        Dict[str, int]: 테이블별 이동한 행 수
+    """
+    horizon_days = horizon_days or current_app.config.get('ARCHIVE_HORIZON_DAYS', 365)
+    batch_size = batch_size or current_app.config.get('ARCHIVE_BATCH_SIZE', 1000)
+    ensure_archive_tables()
+
+    results = {}
+    for table_name in ARCHIVE_POLICIES:
+        try:
+            results[table_name] = archive_table_rows(table_name, horizon_days, batch_size)
+        except Exception as e:
+            logger.error(f"{table_name} 보관 중 오류 발생: {str(e)}")
+            raise
+    logger.info(f"오래된 데이터 보관 완료: {results}")
+    return results
+
+def with_archive(model, start_date=None):
+    """
+    조회 시작일에 맞는 조회 대상 엔티티
+
+    start_date가 보관 기준 시각 이전이면(또는 지정되지 않으면) 원본과 보관 테이블의
+    UNION ALL에 매핑된 엔티티를, 아니면 원본 모델을 그대로 돌려준다.
+    합집합 엔티티의 관계(예: Order.items)는 원본 테이블만 조회한다.
+    """
+    table = model.__table__
+    watermark = get_watermark(table.name)
+    if watermark is None:
+        return model
+    if start_date is not None:
+        if not isinstance(start_date, datetime):
+            start_date = datetime.combine(start_date, time.min)
+        if start_date >= watermark:
+            return model
+
+    target = archive_table(table)
+    combined = union_all(
+        select(*table.columns),
+        select(*[target.c[c.name] for c in table.columns])
+    ).subquery(f'{table.name}_all')
+    return aliased(model, combined, adapt_on_names=True)
@@ -0,0 +1,177 @@
+import heapq
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+from extensions import db
+from models.inventory import InventoryItem, InventoryBatch
+from utils.inventory_ledger import append_ledger_entries
+
+logger = logging.getLogger(__name__)
+
+# 부동소수점 비교 허용 오차
+QUANTITY_TOLERANCE = 1e-9
+
+@dataclass
+class BatchAllocation:
+    """배치별 차감 내역 (batch_id가 None이면 배치 없이 품목 현재 수량에만 있던 재고)"""
+    batch_id: Optional[int]
+    batch_number: Optional[str]
+    expiration_date: Optional[date]
+    quantity: float
+
+    def to_dict(self) -> dict:
+        return {
+            'batch_id': self.batch_id,
+            'batch_number': self.batch_number,
+            'expiration_date': self.expiration_date.isoformat() if self.expiration_date else None,
+            'quantity': self.quantity
+        }
+
+class BatchHeap:
+    """
+    한 품목의 남은 배치를 유통기한 순(FEFO)으로 꺼내는 힙
+
+    유통기한이 같으면 먼저 들어온 배치(ID 순)부터, 유통기한이 없는 배치는 마지막에 꺼낸다.
+    배치 추적 이전에 등록되어 배치 없이 현재 수량에만 있는 재고(unbatched)는 모든 배치 뒤에 꺼낸다.
+    k개 배치에 걸친 차감은 O(k log n)이다.
+    """
+
+    def __init__(self, batches, unbatched: float = 0.0):
+        self._heap = []
+        self.available = 0.0
+        for batch in batches:
+            remaining = batch.quantity - (batch.used_quantity or 0)
+            if remaining > QUANTITY_TOLERANCE:
+                self._push(batch.expiration_date, batch.id, batch.batch_number, remaining)
+        if unbatched > QUANTITY_TOLERANCE:
+            self._push(None, None, None, unbatched)
+        heapq.heapify(self._heap)
+
+    def _push(self, expiration_date, batch_id, batch_number, remaining):
+        sort_key = (expiration_date or date.max, batch_id is None, batch_id or 0)
+        self._heap.append((sort_key, batch_id, batch_number, expiration_date, remaining))
+        self.available += remaining
+
+    def __len__(self):
+        return len(self._heap)
+
+    def allocate(self, quantity: float) -> List[BatchAllocation]:
+        """
+        quantity만큼 앞쪽 배치부터 차감할 내역 계산 (힙에서 차감된 상태로 남는다)
+
+        Raises:
+            ValueError: 남은 수량이 부족한 경우 (힙은 바뀌지 않는다)
+        """
+        if quantity > self.available + QUANTITY_TOLERANCE:
+            raise ValueError(f"재고 부족: 필요 수량 {quantity}, 가용 수량 {self.available}")
+
+        allocations = []
+        while quantity > QUANTITY_TOLERANCE:
+            sort_key, batch_id, batch_number, expiration_date, remaining = heapq.heappop(self._heap)
+            draw = min(remaining, quantity)
+            allocations.append(BatchAllocation(batch_id, batch_number, expiration_date, draw))
+            quantity -= draw
+            self.available -= draw
+            if remaining - draw > QUANTITY_TOLERANCE:
+                heapq.heappush(self._heap, (sort_key, batch_id, batch_number, expiration_date, remaining - draw))
+        return allocations
+
+def load_batch_heaps(item_ids) -> Dict[int, BatchHeap]:
+    """
+    품목들의 남은 배치를 한 번에 조회하여 품목별 힙 생성 (품목과 배치 행은 잠근다)
+
+    품목 현재 수량이 남은 배치 수량의 합보다 크면 그 차이를 배치 없는 재고로 힙에 넣는다.
+    """
+    current = dict(db.session.query(InventoryItem.id, InventoryItem.current_quantity).filter(
+        InventoryItem.id.in_(item_ids)
+    ).with_for_update().all())
+    batches = InventoryBatch.query.filter(
+        InventoryBatch.item_id.in_(item_ids),
+        InventoryBatch.available_quantity > 0
+    ).with_for_update().all()
+
+    grouped = {item_id: [] for item_id in item_ids}
+    for batch in batches:
+        grouped[batch.item_id].append(batch)
+
+    heaps = {}
+    for item_id, item_batches in grouped.items():
+        batched = sum(batch.quantity - (batch.used_quantity or 0) for batch in item_batches)
+        unbatched = max((current.get(item_id) or 0) - batched, 0)
+        heaps[item_id] = BatchHeap(item_batches, unbatched)
+    return heaps
+
+def _batch_label(allocation: BatchAllocation) -> str:
+    return str(allocation.batch_number or allocation.batch_id or '배치 없음')
+
+def consume_batches(requested: Dict[int, float]) -> Dict[int, List[BatchAllocation]]:
+    """
+    품목별 수량을 유통기한이 빠른 배치부터 차감 (커밋은 호출한 쪽에서 한다)
+
+    모든 품목의 배치 차감을 먼저 계산한 뒤 배치 used_quantity와 품목 current_quantity를
+    각각 한 번의 executemany로 갱신한다.
+
+    Args:
+        requested: {품목 ID: 차감 수량}
+
+    Returns:
+        Dict[int, List[BatchAllocation]]: 품목별 배치 차감 내역
+
+    Raises:
+        ValueError: 배치 재고가 부족하거나 동시 차감으로 배치 수량이 바뀐 경우
+    """
+    requested = {item_id: quantity for item_id, quantity in requested.items() if quantity > 0}
+    if not requested:
+        return {}
+
+    heaps = load_batch_heaps(list(requested))
+    allocations = {}
+    for item_id, quantity in requested.items():
+        try:
+            allocations[item_id] = heaps[item_id].allocate(quantity)
+        except ValueError as e:
+            raise ValueError(f"품목 {item_id}의 {str(e)}")
+
+    batch_table = InventoryBatch.__table__
+    draws = [
+        {'batch_id': allocation.batch_id, 'draw': allocation.quantity}
+        for item_allocations in allocations.values() for allocation in item_allocations
+        if allocation.batch_id is not None
+    ]
+    if draws:
+        used = db.func.coalesce(batch_table.c.used_quantity, 0)
+        result = db.session.execute(
+            batch_table.update()
+            .where(batch_table.c.id == db.bindparam('batch_id'),
+                   batch_table.c.quantity - used >= db.bindparam('draw') - QUANTITY_TOLERANCE)
+            .values(used_quantity=used + db.bindparam('draw')),
+            draws
+        )
+        if db.session.get_bind().dialect.supports_sane_multi_rowcount and result.rowcount != len(draws):
+            raise ValueError("다른 요청에서 배치 재고가 변경되었습니다. 다시 시도해주세요.")
+
+    item_table = InventoryItem.__table__
+    db.session.execute(
+        item_table.update()
+        .where(item_table.c.id == db.bindparam('target_id'))
+        .values(current_quantity=item_table.c.current_quantity - db.bindparam('amount')),
+        [{'target_id': item_id, 'amount': quantity} for item_id, quantity in requested.items()]
+    )
+
+    append_ledger_entries(db.session.connection(), [
+        dict(item_id=item_id, quantity=-quantity, source='batch_consumption',
+             reference=", ".join(_batch_label(a) for a in allocations[item_id])[:200])
+        for item_id, quantity in requested.items()
+    ])
+
+    # 일괄 갱신한 배치와 품목을 세션에서 다시 읽도록 만료
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, (InventoryBatch, InventoryItem)):
+            db.session.expire(obj)
+
+    for item_id, item_allocations in allocations.items():
+        logger.info(f"배치 차감: 품목 {item_id} " + ", ".join(
+            f"{_batch_label(a)}({a.expiration_date}) {a.quantity}" for a in item_allocations
+        ))
+    return allocations
@@ -1,53 +1,151 @@
-import pandas as pd
-from io import BytesIO
+import os
+import csv
+import logging
+import tempfile
+from io import StringIO
 from datetime import datetime
+import xlsxwriter
+from sqlalchemy import select
+from extensions import db
+from models import Ingredient, InventoryItem, StockItem, StockTransaction
 
-def export_stock_usage_to_excel(transactions):
-    """재고 사용 내역을 엑셀 파일로 내보내기"""
+logger = logging.getLogger(__name__)
+
+# 재고 사용 내역 열 (제목, 엑셀 열 너비)
+STOCK_USAGE_COLUMNS = [
+    ('날짜', 20),
+    ('품목', 20),
+    ('사용량', 15),
+    ('단위', 10),
+    ('참조', 20),
+    ('메모', 30),
+]
+
+# 한 번에 DB에서 읽어 오는 행 수
+EXPORT_BATCH_SIZE = 1000
+
+def stock_usage_rows(ingredient_id=None, start_date=None, end_date=None):
+    """
+    재고 사용 내역 행을 순서대로 반환 (제너레이터)
+
+    거래, 재고 항목, 품목을 한 번의 JOIN으로 조회하고 yield_per로 EXPORT_BATCH_SIZE행씩
+    나눠 읽으므로 조회 기간이 길어도 메모리 사용량이 일정하다.
+    """
+    stmt = select(
+        StockTransaction.created_at,
+        InventoryItem.name,
+        StockTransaction.quantity,
+        db.func.coalesce(StockTransaction.unit, StockItem.unit, InventoryItem.unit),
+        StockTransaction.reference,
+        StockTransaction.notes
+    ).join(
+        StockItem, StockItem.id == StockTransaction.stock_item_id
+    ).join(
+        InventoryItem, InventoryItem.id == StockItem.item_id
+    ).where(StockTransaction.transaction_type == 'usage')
+
+    if ingredient_id:
+        stmt = stmt.where(StockItem.item_id == select(Ingredient.item_id).where(
+            Ingredient.id == ingredient_id
+        ).scalar_subquery())
+    if start_date:
+        stmt = stmt.where(StockTransaction.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(StockTransaction.created_at <= end_date)
+
+    stmt = stmt.order_by(StockTransaction.created_at.desc(), StockTransaction.id.desc())
+    result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for created_at, name, quantity, unit, reference, notes in result:
+        yield [
+            created_at.strftime('%Y-%m-%d %H:%M') if created_at else '',
+            name,
+            abs(quantity or 0),
+            unit or '',
+            reference or '',
+            notes or ''
+        ]
+
+def write_stock_usage_xlsx(rows, path):
+    """
+    재고 사용 내역을 엑셀 파일로 저장
+
+    xlsxwriter의 constant_memory 모드로 행을 쓰는 즉시 임시 파일로 내보내므로
+    행 수와 관계없이 메모리에는 한 행만 유지된다.
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
     try:
-        # 데이터프레임 생성
-        data = []
-        for trans in transactions:
-            data.append({
-                '날짜': trans.created_at.strftime('%Y-%m-%d %H:%M'),
-                '식자재': trans.ingredient.name,
-                '사용량': abs(trans.quantity),
-                '단위': trans.ingredient.unit,
-                '요청자': trans.created_by_user.name,
-                '메모': trans.notes or '',
-                '상태': {
-                    'pending': '승인 대기',
-                    'approved': '승인됨',
-                    'rejected': '거절됨'
-                }.get(trans.status, trans.status),
-                '처리일시': trans.approved_at.strftime('%Y-%m-%d %H:%M') if trans.approved_at else '',
-                '거절사유': trans.rejection_reason or ''
-            })
-            
-        df = pd.DataFrame(data)
-        
-        # 엑셀 파일 생성
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='재고사용내역', index=False)
-            
-            # 워크시트 가져오기
-            worksheet = writer.sheets['재고사용내역']
-            
-            # 열 너비 조정
-            worksheet.set_column('A:A', 20)  # 날짜
-            worksheet.set_column('B:B', 20)  # 식자재
-            worksheet.set_column('C:C', 15)  # 사용량
-            worksheet.set_column('D:D', 10)  # 단위
-            worksheet.set_column('E:E', 15)  # 요청자
-            worksheet.set_column('F:F', 30)  # 메모
-            worksheet.set_column('G:G', 15)  # 상태
-            worksheet.set_column('H:H', 20)  # 처리일시
-            worksheet.set_column('I:I', 30)  # 거절사유
-            
-        output.seek(0)
-        return output
-        
+        worksheet = workbook.add_worksheet('재고사용내역')
+        header_format = workbook.add_format({'bold': True})
+        for col, (title, width) in enumerate(STOCK_USAGE_COLUMNS):
+            worksheet.set_column(col, col, width)
+            worksheet.write(0, col, title, header_format)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+        return count
+    finally:
+        workbook.close()
+
+def export_stock_usage_to_excel(rows):
+    """
+    재고 사용 내역을 임시 엑셀 파일로 저장
+
+    Returns:
+        str: 임시 파일 경로 (다 읽은 뒤 iter_file()이 삭제), 실패 시 None
+    """
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        count = write_stock_usage_xlsx(rows, path)
+        logger.info(f"재고 사용 내역 엑셀 생성: {count}건")
+        return path
     except Exception as e:
-        print(f"엑셀 파일 생성 중 오류 발생: {str(e)}")
-        return None 
\ No newline at end of file
+        logger.error(f"엑셀 파일 생성 중 오류 발생: {str(e)}")
+        os.remove(path)
+        return None
+
+def iter_file(path, chunk_size=64 * 1024, remove=True):
+    """파일을 chunk_size 바이트씩 읽어 반환하고 다 읽으면 삭제 (스트리밍 응답용)"""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if remove:
+            os.remove(path)
+
+def iter_stock_usage_csv(rows, chunk_rows=EXPORT_BATCH_SIZE):
+    """
+    재고 사용 내역을 CSV로 chunk_rows행씩 인코딩하여 반환 (스트리밍 응답용)
+
+    엑셀에서 한글이 깨지지 않도록 UTF-8 BOM으로 시작한다.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([title for title, _ in STOCK_USAGE_COLUMNS])
+    yield ('\ufeff' + buffer.getvalue()).encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    try:
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= chunk_rows:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if pending:
+            yield buffer.getvalue().encode('utf-8')
+    except Exception as e:
+        logger.error(f"CSV 내보내기 중 오류 발생: {str(e)}")
+        raise
+
+def export_filename(extension):
+    """내보내기 파일명 (재고사용내역_YYYYmmdd_HHMMSS.확장자)"""
+    return f'재고사용내역_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
@@ -1,9 +1,10 @@
 from datetime import date, timedelta
-from models import SalesRecord, MenuItem, Ingredient, StockTransaction
+from models import db, SalesRecord, MenuItem, Ingredient, StockTransaction
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
 import logging
+from utils.archiving import with_archive
 from typing import Optional, Dict, Any
 
 load_dotenv()
@@ -65,9 +66,10 @@ def analyze_sales_data(start_date, end_date):
             total_quantity += sale.quantity
         
         # 재고 데이터 조회
-        stock_alerts = StockTransaction.query.filter(
-            StockTransaction.transaction_type == 'usage',
-            StockTransaction.created_at.between(start_date, end_date)
+        source = with_archive(StockTransaction, start_date)
+        stock_alerts = db.session.query(source).filter(
+            source.transaction_type == 'usage',
+            source.created_at.between(start_date, end_date)
         ).all()
         
         # GPT 프롬프트 생성
@@ -5,9 +5,12 @@ import requests
 import json
 from models import (
     db, Inventory, Order, StockItem, StockTransaction, User, 
-    InventoryItem, InventoryBatch, StockUsageAlert, Notification
+    InventoryItem, InventoryBatch, StockUsageAlert, Notification, Ingredient
 )
 from utils.notification import send_notification
+from utils.usage_rollup import add_daily_usage, set_usage_user
+from utils.batch_consumption import consume_batches
+from utils.inventory_ledger import append_ledger_entries
 from config import Config
 from extensions import db
 
@@ -34,12 +37,13 @@ def sync_pos_inventory():
             if item:
                 # POS의 재고 수량과 현재 재고 수량 비교
                 if item.quantity != item_data['quantity']:
-                    # 차이만큼 재고 차감
+                    # 차이만큼 재고 차감 (기존 재고(Inventory) 모델은 배치가 없으므로 수량만 줄인다)
                     diff = item.quantity - item_data['quantity']
                     if diff > 0:
-                        consume_inventory(item.id, diff)
+                        item.update_quantity(diff, is_addition=False)
                         logger.info(f"POS 동기화: {item.name} {diff}{item.unit} 차감")
         
+        db.session.commit()
         return True, None
         
     except requests.exceptions.RequestException as e:
@@ -47,6 +51,7 @@ def sync_pos_inventory():
         logger.error(error_msg)
         return False, error_msg
     except Exception as e:
+        db.session.rollback()
         error_msg = f"재고 동기화 중 오류 발생: {str(e)}"
         logger.error(error_msg)
         return False, error_msg
@@ -76,7 +81,8 @@ def consume_stock(ingredient_id: int, quantity: float, user_id: int, notes: str
     stock.quantity -= quantity
     stock.updated_at = datetime.utcnow()
     
-    # 거래 내역 생성
+    # 거래 내역 생성 (일별 사용량은 user_id로 집계)
+    set_usage_user(db.session, user_id)
     transaction = StockTransaction(
         ingredient_id=ingredient_id,
         transaction_type='usage',
@@ -120,6 +126,104 @@ def consume_stock(ingredient_id: int, quantity: float, user_id: int, notes: str
     db.session.commit()
     return transaction
 
+def deduct_stock_bulk(lines, notes: str = None, user_id: int = None):
+    """
+    여러 재료의 재고를 한 번에 차감 (커밋은 호출한 쪽에서 한다)
+
+    요청한 재료의 재고 항목을 한 번의 IN 쿼리로 잠가(SELECT ... FOR UPDATE) 읽고,
+    모든 줄의 재고를 먼저 확인한 뒤 재고 갱신과 거래 내역을 각각 한 번의 executemany로 저장한다.
+    잠금을 지원하지 않는 DB에서도 갱신 조건(quantity >= 차감 수량)으로 동시 차감을 막는다.
+
+    Args:
+        lines: {'ingredient_id': int, 'quantity': float} 목록 (같은 재료는 합산)
+        notes (str, optional): 메모
+        user_id (int, optional): 차감한 사용자 ID (일별 사용량 집계용)
+
+    Returns:
+        int: 차감한 재료 수
+
+    Raises:
+        ValueError: 재고가 부족하거나 동시 차감으로 재고가 바뀐 경우
+    """
+    requested = {}
+    for line in lines:
+        ingredient_id = line.get('ingredient_id')
+        quantity = float(line.get('quantity', 0))
+        if not ingredient_id or quantity <= 0:
+            continue
+        requested[int(ingredient_id)] = requested.get(int(ingredient_id), 0) + quantity
+    if not requested:
+        return 0
+
+    rows = db.session.query(Ingredient, StockItem).join(
+        StockItem, StockItem.item_id == Ingredient.item_id
+    ).filter(Ingredient.id.in_(requested)).order_by(StockItem.id).with_for_update(of=StockItem).all()
+
+    stocks = {}
+    names = {}
+    for ingredient, stock in rows:
+        stocks.setdefault(ingredient.id, []).append(stock)
+        names[ingredient.id] = ingredient.name
+
+    # 모든 줄을 먼저 확인
+    shortages = [
+        names.get(ingredient_id, str(ingredient_id))
+        for ingredient_id, quantity in requested.items()
+        if sum(stock.quantity for stock in stocks.get(ingredient_id, [])) < quantity
+    ]
+    if shortages:
+        raise ValueError(f"{', '.join(shortages)}의 재고가 부족합니다.")
+
+    # 재고 항목 순서대로 차감량 배분 (같은 품목의 재고 항목은 재료끼리 공유)
+    deductions = {}
+    remaining = {stock.id: stock.quantity for stock_list in stocks.values() for stock in stock_list}
+    for ingredient_id, quantity in requested.items():
+        for stock in stocks[ingredient_id]:
+            if quantity <= 0:
+                break
+            amount = min(remaining[stock.id], quantity)
+            if amount <= 0:
+                continue
+            remaining[stock.id] -= amount
+            deductions[stock.id] = deductions.get(stock.id, 0) + amount
+            quantity -= amount
+        if quantity > 0:
+            raise ValueError(f"{names[ingredient_id]}의 재고가 부족합니다.")
+
+    now = datetime.utcnow()
+    table = StockItem.__table__
+    result = db.session.execute(
+        table.update()
+        .where(table.c.id == db.bindparam('stock_id'), table.c.quantity >= db.bindparam('amount'))
+        .values(quantity=table.c.quantity - db.bindparam('amount'), updated_at=now),
+        [{'stock_id': stock_id, 'amount': amount} for stock_id, amount in deductions.items()]
+    )
+    dialect = db.session.get_bind().dialect
+    if dialect.supports_sane_multi_rowcount and result.rowcount != len(deductions):
+        raise ValueError("다른 요청에서 재고가 변경되었습니다. 다시 시도해주세요.")
+
+    units = {stock.id: stock.unit for stock_list in stocks.values() for stock in stock_list}
+    db.session.execute(db.insert(StockTransaction), [
+        dict(stock_item_id=stock_id, transaction_type='usage', quantity=-amount,
+             unit=units[stock_id], notes=notes, created_at=now)
+        for stock_id, amount in deductions.items()
+    ])
+    # 일괄 삽입은 flush 이벤트를 거치지 않으므로 일별 사용량 집계와 재고 원장에 직접 반영
+    item_ids = {stock.id: stock.item_id for stock_list in stocks.values() for stock in stock_list}
+    add_daily_usage(db.session, [
+        (now, item_ids[stock_id], user_id, amount) for stock_id, amount in deductions.items()
+    ])
+    append_ledger_entries(db.session.connection(), [
+        dict(item_id=item_ids[stock_id], stock_item_id=stock_id, quantity=-amount,
+             source='usage', reference=notes[:200] if notes else None, created_at=now)
+        for stock_id, amount in deductions.items()
+    ])
+    # 일괄 갱신한 재고 항목을 세션에서 다시 읽도록 만료
+    for stock_list in stocks.values():
+        for stock in stock_list:
+            db.session.expire(stock)
+    return len(requested)
+
 def check_inventory_availability(item_name: str, quantity_needed: int) -> Tuple[bool, Optional[str]]:
     """
     재고 가용성 확인
@@ -144,37 +248,87 @@ def consume_inventory(inventory_id: int, quantity: float) -> bool:
     """
     재고를 소비합니다.
     
+    품목의 남은 배치 중 유통기한이 빠른 배치부터 used_quantity를 차감하고(FEFO)
+    품목의 현재 수량도 함께 줄입니다.
+    
+    차감은 세이브포인트 안에서 실행하고 커밋은 호출한 쪽에서 합니다. 실패하면 이 차감만
+    되돌리므로, 판매 한 건의 여러 품목을 차감하는 호출자의 다른 변경은 그대로 남습니다.
+    
     Args:
-        inventory_id (int): 재고 ID
+        inventory_id (int): 재고 품목(InventoryItem) ID
         quantity (float): 소비할 수량
         
     Returns:
         bool: 소비 성공 여부
     """
     try:
-        inventory = Inventory.query.get(inventory_id)
-        if not inventory:
+        item = InventoryItem.query.get(inventory_id)
+        if not item:
             logger.warning(f"재고 ID {inventory_id}를 찾을 수 없습니다.")
             return False
-            
-        if inventory.quantity < quantity:
+        name, unit = item.name, item.unit
+        
+        try:
+            with db.session.begin_nested():
+                allocations = consume_batches({item.id: quantity})[item.id]
+        except ValueError as e:
             send_notification(
                 title="재고 부족 알림",
-                message=f"{inventory.name}의 재고가 부족합니다.",
+                message=f"{name}의 재고가 부족합니다.",
                 level="warning"
             )
-            logger.warning(f"재고 부족: {inventory.name} (현재: {inventory.quantity}, 필요: {quantity})")
+            logger.warning(f"재고 부족: {name} (필요: {quantity}) - {str(e)}")
             return False
-            
-        inventory.update_quantity(quantity, is_addition=False)
-        logger.info(f"재고 소비: {inventory.name} ({quantity}{inventory.unit})")
+        
+        logger.info(f"재고 소비: {name} ({quantity}{unit}), 배치 {len(allocations)}개")
         return True
         
     except Exception as e:
         logger.error(f"재고 소비 중 오류 발생: {str(e)}")
-        db.session.rollback()
         return False
 
+def get_low_stock_ingredients():
+    """
+    최소 수량 이하인 재료와 현재 재고 수량 조회
+
+    재료마다 재고를 따로 조회하지 않고, 재고 항목을 한 번의 LEFT JOIN으로 합산한다.
+    재고 항목이 없는 재료는 COALESCE로 0개로 본다.
+
+    Returns:
+        list: {'ingredient': Ingredient, 'current_quantity': float} 목록 (재료 이름순)
+    """
+    current_quantity = db.func.coalesce(db.func.sum(StockItem.quantity), 0).label('current_quantity')
+    rows = db.session.query(Ingredient, current_quantity).outerjoin(
+        StockItem, StockItem.item_id == Ingredient.item_id
+    ).group_by(Ingredient.id).having(
+        current_quantity <= db.func.coalesce(Ingredient.min_quantity, 0)
+    ).order_by(Ingredient.name).all()
+    return [{'ingredient': ingredient, 'current_quantity': quantity} for ingredient, quantity in rows]
+
+def get_items_with_head_batch():
+    """
+    남은 수량이 있는 배치가 있는 품목과 품목별 유통기한이 가장 이른 배치 조회
+
+    ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY expiration_date)로 품목별 첫 배치를 골라
+    품목과 함께 한 번의 쿼리로 가져온다. (item_id, expiration_date) 부분 인덱스를 사용한다.
+
+    Returns:
+        list: (InventoryItem, InventoryBatch) 목록 (품목 ID순)
+    """
+    ranked = db.session.query(
+        InventoryBatch.id.label('batch_id'),
+        db.func.row_number().over(
+            partition_by=InventoryBatch.item_id,
+            order_by=(InventoryBatch.expiration_date, InventoryBatch.id)
+        ).label('position')
+    ).filter(InventoryBatch.available_quantity > 0).subquery()
+
+    return db.session.query(InventoryItem, InventoryBatch).join(
+        InventoryBatch, InventoryBatch.item_id == InventoryItem.id
+    ).join(
+        ranked, db.and_(ranked.c.batch_id == InventoryBatch.id, ranked.c.position == 1)
+    ).order_by(InventoryItem.id).all()
+
 def check_low_stock():
     """
     부족 재고를 확인하고 알림을 발송합니다.
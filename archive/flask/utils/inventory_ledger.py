@@ -0,0 +1,284 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import event, select, func, and_, or_, tuple_
+from sqlalchemy.orm import Session
+from extensions import db
+from models.inventory import (
+    InventoryItem, InventoryBatch, StockItem, StockTransaction, InventoryLedgerEntry, InventoryLedgerSnapshot
+)
+
+logger = logging.getLogger(__name__)
+
+# 품목 수량(InventoryItem.current_quantity) 계정의 stock_item_id
+ITEM_ACCOUNT = 0
+
+# 잔량 비교 허용 오차
+BALANCE_TOLERANCE = 1e-6
+
+# 수량을 양수로 기록하는 경우가 있는 출고성 거래 유형
+OUTBOUND_TRANSACTION_TYPES = ('usage', '출고')
+
+Account = Tuple[int, int]  # (item_id, stock_item_id)
+
+def append_ledger_entries(connection, entries: Iterable[dict]):
+    """
+    원장에 재고 변동 추가 (한 번의 INSERT, 호출한 쪽의 트랜잭션에서 실행)
+
+    Args:
+        connection: DB 연결 (세션의 connection())
+        entries: item_id, quantity, source와 선택 항목 stock_item_id, reference, created_at을 가진 dict 목록
+    """
+    now = datetime.utcnow()
+    rows = [
+        dict(
+            item_id=entry['item_id'],
+            stock_item_id=entry.get('stock_item_id') or ITEM_ACCOUNT,
+            quantity=entry['quantity'],
+            source=entry['source'],
+            reference=entry.get('reference'),
+            created_at=entry.get('created_at') or now
+        )
+        for entry in entries if entry.get('item_id') is not None and entry['quantity']
+    ]
+    if rows:
+        connection.execute(InventoryLedgerEntry.__table__.insert(), rows)
+
+@event.listens_for(InventoryLedgerEntry, 'before_update')
+@event.listens_for(InventoryLedgerEntry, 'before_delete')
+def _reject_ledger_change(mapper, connection, target):
+    raise ValueError("재고 원장은 추가만 할 수 있습니다.")
+
+@event.listens_for(Session, 'before_flush')
+def _collect_stock_movements(session, flush_context, instances):
+    """세션에 추가된 배치 입고와 재고 거래를 기록해 두었다가 flush 후 원장에 추가"""
+    pending = [obj for obj in session.new if isinstance(obj, (InventoryBatch, StockTransaction))]
+    if pending:
+        session.info.setdefault('pending_ledger_objects', []).extend(pending)
+
+@event.listens_for(Session, 'after_flush')
+def _append_stock_movements(session, flush_context):
+    pending = session.info.pop('pending_ledger_objects', None)
+    if not pending:
+        return
+    connection = session.connection()
+    stock_ids = {obj.stock_item_id for obj in pending if isinstance(obj, StockTransaction)}
+    item_ids = dict(connection.execute(
+        select(StockItem.id, StockItem.item_id).where(StockItem.id.in_(stock_ids))
+    ).all()) if stock_ids else {}
+
+    entries = []
+    for obj in pending:
+        if isinstance(obj, InventoryBatch):
+            entries.append(dict(item_id=obj.item_id, quantity=obj.quantity, source='receipt',
+                                reference=obj.batch_number, created_at=obj.created_at))
+        else:
+            quantity = obj.quantity or 0
+            if obj.transaction_type in OUTBOUND_TRANSACTION_TYPES:
+                quantity = -abs(quantity)
+            entries.append(dict(item_id=item_ids.get(obj.stock_item_id), stock_item_id=obj.stock_item_id,
+                                quantity=quantity, source=obj.transaction_type,
+                                reference=obj.reference, created_at=obj.created_at))
+    append_ledger_entries(connection, entries)
+
+def _account_filter(model, accounts: Optional[List[Account]], item_ids: Optional[List[int]]):
+    if accounts is not None:
+        return tuple_(model.item_id, model.stock_item_id).in_(accounts)
+    if item_ids is not None:
+        return model.item_id.in_(item_ids)
+    return None
+
+def get_balances(at: Optional[datetime] = None, item_ids: Optional[List[int]] = None,
+                 accounts: Optional[List[Account]] = None, upto_id: Optional[int] = None) -> Dict[Account, float]:
+    """
+    계정별 잔량 (at 시점 기준, 기본값은 현재)
+
+    at 이전의 가장 최근 스냅샷 잔량에 그 이후 원장 변동만 더하므로
+    조회 비용은 마지막 스냅샷 이후 변동 수에 비례한다.
+
+    Args:
+        at (datetime): 기준 시각
+        item_ids (list): 품목 ID 목록 (None이면 전체)
+        accounts (list): (item_id, stock_item_id) 목록 (지정 시 item_ids 대신 사용)
+        upto_id (int): 이 원장 ID까지만 반영
+    """
+    snapshot = InventoryLedgerSnapshot
+    latest = select(
+        snapshot.item_id, snapshot.stock_item_id, func.max(snapshot.ledger_id).label('ledger_id')
+    ).group_by(snapshot.item_id, snapshot.stock_item_id)
+    condition = _account_filter(snapshot, accounts, item_ids)
+    if condition is not None:
+        latest = latest.where(condition)
+    if at is not None:
+        latest = latest.where(snapshot.taken_at <= at)
+    if upto_id is not None:
+        latest = latest.where(snapshot.ledger_id <= upto_id)
+    latest = latest.subquery('latest')
+
+    snapshots = {
+        (item_id, stock_item_id): (ledger_id, quantity)
+        for item_id, stock_item_id, ledger_id, quantity in db.session.execute(
+            select(snapshot.item_id, snapshot.stock_item_id, snapshot.ledger_id, snapshot.quantity).join(
+                latest, and_(snapshot.item_id == latest.c.item_id,
+                             snapshot.stock_item_id == latest.c.stock_item_id,
+                             snapshot.ledger_id == latest.c.ledger_id)
+            )
+        )
+    }
+
+    entry = InventoryLedgerEntry
+    # 스냅샷 이후 변동만 합산 (스냅샷이 없는 계정은 처음부터)
+    replay = select(entry.item_id, entry.stock_item_id, func.sum(entry.quantity)).outerjoin(
+        latest, and_(entry.item_id == latest.c.item_id, entry.stock_item_id == latest.c.stock_item_id)
+    ).where(
+        or_(latest.c.ledger_id.is_(None), entry.id > latest.c.ledger_id)
+    ).group_by(entry.item_id, entry.stock_item_id)
+    condition = _account_filter(entry, accounts, item_ids)
+    if condition is not None:
+        replay = replay.where(condition)
+    if at is not None:
+        replay = replay.where(entry.created_at <= at)
+    if upto_id is not None:
+        replay = replay.where(entry.id <= upto_id)
+
+    balances = {account: quantity for account, (_, quantity) in snapshots.items()}
+    for item_id, stock_item_id, quantity in db.session.execute(replay):
+        balances[(item_id, stock_item_id)] = balances.get((item_id, stock_item_id), 0.0) + (quantity or 0.0)
+    return balances
+
+def stock_at(item_id: int, at: Optional[datetime] = None, stock_item_id: int = ITEM_ACCOUNT) -> float:
+    """품목(또는 재고 항목) 계정의 at 시점 잔량"""
+    return get_balances(at, accounts=[(item_id, stock_item_id)]).get((item_id, stock_item_id), 0.0)
+
+def initialize_ledger() -> int:
+    """
+    기초 잔량(opening)이 없는 계정에 현재 수량과 원장 잔량의 차이를 기초 잔량으로 추가
+
+    원장 도입 후 실행 전에 이미 기록된 변동이 있어도 기초 잔량 = 현재 수량 - 기존 원장 합계로
+    계산하므로 원장 잔량이 현재 수량과 맞춰진다. 기초 잔량이 있는 계정은 건너뛰어 다시 실행해도 안전하다.
+    (flask init-ledger로 실행)
+
+    Returns:
+        int: 추가한 기초 잔량 수
+    """
+    try:
+        opened = set(db.session.execute(
+            select(InventoryLedgerEntry.item_id, InventoryLedgerEntry.stock_item_id).distinct()
+            .where(InventoryLedgerEntry.source == 'opening')
+        ).all())
+        counters = {
+            (item_id, ITEM_ACCOUNT): quantity or 0
+            for item_id, quantity in db.session.execute(select(InventoryItem.id, InventoryItem.current_quantity))
+        }
+        counters.update(
+            ((item_id, stock_item_id), quantity or 0)
+            for stock_item_id, item_id, quantity in db.session.execute(
+                select(StockItem.id, StockItem.item_id, StockItem.quantity)
+            )
+        )
+        balances = get_balances()
+        entries = []
+        for (item_id, stock_item_id), quantity in counters.items():
+            if (item_id, stock_item_id) in opened:
+                continue
+            opening = quantity - balances.get((item_id, stock_item_id), 0.0)
+            if abs(opening) > BALANCE_TOLERANCE:
+                entries.append(dict(item_id=item_id, stock_item_id=stock_item_id, quantity=opening, source='opening'))
+        append_ledger_entries(db.session.connection(), entries)
+        db.session.commit()
+        logger.info(f"재고 원장 기초 잔량 추가: {len(entries)}건")
+        return len(entries)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"재고 원장 초기화 중 오류 발생: {str(e)}")
+        raise
+
+def _counter_values(accounts: List[Account]) -> Dict[Account, float]:
+    """계정별 현재 수량 필드 값 (품목 계정은 current_quantity, 재고 항목 계정은 quantity)"""
+    item_ids = [item_id for item_id, stock_item_id in accounts if stock_item_id == ITEM_ACCOUNT]
+    stock_ids = [stock_item_id for _, stock_item_id in accounts if stock_item_id != ITEM_ACCOUNT]
+    values = {}
+    if item_ids:
+        for item_id, quantity in db.session.execute(
+                select(InventoryItem.id, InventoryItem.current_quantity).where(InventoryItem.id.in_(item_ids))):
+            values[(item_id, ITEM_ACCOUNT)] = quantity or 0
+    if stock_ids:
+        for stock_item_id, item_id, quantity in db.session.execute(
+                select(StockItem.id, StockItem.item_id, StockItem.quantity).where(StockItem.id.in_(stock_ids))):
+            values[(item_id, stock_item_id)] = quantity or 0
+    return values
+
+def take_ledger_snapshots(grace_seconds: Optional[int] = None) -> Tuple[int, List[dict]]:
+    """
+    마지막 스냅샷 이후 변동이 있는 계정만 새 스냅샷을 저장하고 수량 필드와 대조
+
+    각 계정의 이전 스냅샷 이후 원장만 다시 합산하므로 전체 원장을 훑지 않는다.
+    원장 ID는 커밋 순서대로 부여되지 않으므로(예: PostgreSQL 시퀀스) 진행 중인 트랜잭션이
+    더 작은 ID로 나중에 커밋될 수 있다. 스냅샷은 grace_seconds초보다 오래된 원장까지만 포함한다.
+
+    Args:
+        grace_seconds (int): 스냅샷에서 제외할 최근 원장 구간(초, 기본값 LEDGER_SNAPSHOT_GRACE_SECONDS 설정 또는 600)
+
+    Returns:
+        tuple: (저장한 스냅샷 수, 원장 잔량과 수량 필드가 다른 계정 목록)
+    """
+    if grace_seconds is None:
+        grace_seconds = current_app.config.get('LEDGER_SNAPSHOT_GRACE_SECONDS', 600)
+    try:
+        settled_before = datetime.utcnow() - timedelta(seconds=grace_seconds)
+        last_id = db.session.execute(
+            select(func.max(InventoryLedgerEntry.id)).where(InventoryLedgerEntry.created_at < settled_before)
+        ).scalar()
+        if last_id is None:
+            return 0, []
+
+        # 마지막 스냅샷 이후 원장 변동이 있는 계정
+        covered = select(
+            InventoryLedgerSnapshot.item_id, InventoryLedgerSnapshot.stock_item_id,
+            func.max(InventoryLedgerSnapshot.ledger_id).label('ledger_id')
+        ).group_by(InventoryLedgerSnapshot.item_id, InventoryLedgerSnapshot.stock_item_id).subquery('covered')
+        entry = InventoryLedgerEntry
+        changed = [tuple(account) for account in db.session.execute(
+            select(entry.item_id, entry.stock_item_id).distinct().outerjoin(
+                covered, and_(entry.item_id == covered.c.item_id, entry.stock_item_id == covered.c.stock_item_id)
+            ).where(
+                entry.id <= last_id,
+                or_(covered.c.ledger_id.is_(None), entry.id > covered.c.ledger_id)
+            )
+        )]
+        if not changed:
+            return 0, []
+
+        balances = get_balances(accounts=changed, upto_id=last_id)
+        now = datetime.utcnow()
+        db.session.execute(InventoryLedgerSnapshot.__table__.insert(), [
+            dict(item_id=item_id, stock_item_id=stock_item_id, ledger_id=last_id,
+                 quantity=balances.get((item_id, stock_item_id), 0.0), taken_at=now)
+            for item_id, stock_item_id in changed
+        ])
+
+        # 변동이 있었던 계정만 수량 필드와 대조 (수량 필드는 최근 변동까지 반영하므로 현재 원장 잔량과 비교)
+        counters = _counter_values(changed)
+        current = get_balances(accounts=changed)
+        mismatches = [
+            {
+                'item_id': item_id,
+                'stock_item_id': stock_item_id,
+                'ledger_quantity': current.get((item_id, stock_item_id), 0.0),
+                'counter_quantity': counters.get((item_id, stock_item_id))
+            }
+            for item_id, stock_item_id in changed
+            if (item_id, stock_item_id) in counters
+            and abs(current.get((item_id, stock_item_id), 0.0) - counters[(item_id, stock_item_id)]) > BALANCE_TOLERANCE
+        ]
+        db.session.commit()
+
+        logger.info(f"재고 원장 스냅샷 저장: {len(changed)}개 계정 (원장 ID {last_id}까지)")
+        for mismatch in mismatches:
+            logger.warning(f"재고 원장 불일치: {mismatch}")
+        return len(changed), mismatches
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"재고 원장 스냅샷 저장 중 오류 발생: {str(e)}")
+        raise
@@ -1,72 +1,227 @@
+import logging
 from datetime import datetime, date, timedelta
-from models import Ingredient, OrderItem, StockTransaction
-from sqlalchemy import func, and_
+from models import db, Ingredient, InventoryItem, OrderItem, StockItem, StockTransaction, InventoryMonthlySnapshot
+from utils.archiving import with_archive
+from utils.inventory_ledger import OUTBOUND_TRANSACTION_TYPES
+from sqlalchemy import func, case, literal, select, union_all
+
+logger = logging.getLogger(__name__)
+
+def _month_range(year, month):
+    """해당 월의 시작일과 다음 달 시작일"""
+    start_date = date(year, month, 1)
+    next_start = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start_date, next_start
+
+def _is_closed_month(year, month):
+    """이미 지난 달인지 확인"""
+    _, next_start = _month_range(year, month)
+    return next_start <= date.today().replace(day=1)
+
+def _build_report_query(start_date, next_start):
+    """
+    품목별 발주/입고/사용량과 기초/기말 재고를 한 번에 조회하는 쿼리
+
+    재고와 거래는 품목(InventoryItem) 단위로만 기록되므로 리포트도 재료가 쓰는 품목별로 만든다.
+    여러 재료가 한 품목을 함께 쓰면 품목 한 행에 합산되고 나누지 않는다.
+
+    발주 품목과 재고 거래를 품목(item_id) 기준의 이동 내역으로 합친 뒤(UNION ALL)
+    조건부 집계(SUM(CASE ...))로 한 번에 묶는다. 출고성 거래는 양수로 기록된 경우도 있으므로
+    음수로 맞춘 뒤 합산한다. 기말 재고는 현재 재고에서 다음 달 이후 거래를,
+    기초 재고는 기말 재고에서 해당 월 거래를 되돌려 계산한다.
+    """
+    start = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(next_start, datetime.min.time())
+    transactions = with_archive(StockTransaction, start_date)
+    signed_quantity = case(
+        (transactions.transaction_type.in_(OUTBOUND_TRANSACTION_TYPES), -func.abs(transactions.quantity)),
+        else_=transactions.quantity
+    )
+
+    movements = union_all(
+        select(
+            OrderItem.item_id.label('item_id'),
+            literal('order').label('kind'),
+            OrderItem.quantity.label('quantity'),
+            OrderItem.total_price.label('cost'),
+            OrderItem.created_at.label('created_at')
+        ).where(OrderItem.created_at >= start, OrderItem.created_at < end),
+        select(
+            StockItem.item_id,
+            transactions.transaction_type,
+            signed_quantity,
+            literal(0.0),
+            transactions.created_at
+        ).join(StockItem, StockItem.id == transactions.stock_item_id)
+        .where(transactions.created_at >= start)
+    ).subquery('movements')
+
+    in_month = movements.c.created_at < end
+    is_transaction = movements.c.kind != 'order'
+
+    def total(condition, value=movements.c.quantity):
+        return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+    totals = select(
+        movements.c.item_id,
+        total(in_month & (movements.c.kind == 'order')).label('ordered_quantity'),
+        total(in_month & (movements.c.kind == 'order'), movements.c.cost).label('ordered_cost'),
+        total(in_month & (movements.c.kind == 'purchase')).label('received_quantity'),
+        total(in_month & (movements.c.kind == 'usage')).label('used_quantity'),
+        total(in_month & is_transaction).label('net_in_month'),
+        total(~in_month & is_transaction).label('net_after_month')
+    ).group_by(movements.c.item_id).subquery('totals')
+
+    stock = select(
+        StockItem.item_id,
+        func.sum(StockItem.quantity).label('quantity')
+    ).group_by(StockItem.item_id).subquery('stock')
+
+    return select(
+        InventoryItem.id,
+        InventoryItem.name,
+        InventoryItem.unit,
+        func.coalesce(InventoryItem.min_quantity, 0).label('min_stock'),
+        func.coalesce(InventoryItem.unit_price, 0).label('cost_per_unit'),
+        func.coalesce(stock.c.quantity, 0).label('current_stock'),
+        func.coalesce(totals.c.ordered_quantity, 0).label('ordered_quantity'),
+        func.coalesce(totals.c.ordered_cost, 0).label('ordered_cost'),
+        func.coalesce(totals.c.received_quantity, 0).label('received_quantity'),
+        func.coalesce(totals.c.used_quantity, 0).label('used_quantity'),
+        func.coalesce(totals.c.net_in_month, 0).label('net_in_month'),
+        func.coalesce(totals.c.net_after_month, 0).label('net_after_month')
+    ).outerjoin(
+        stock, stock.c.item_id == InventoryItem.id
+    ).outerjoin(
+        totals, totals.c.item_id == InventoryItem.id
+    ).where(
+        InventoryItem.id.in_(select(Ingredient.item_id))
+    ).order_by(InventoryItem.name)
+
+def _ingredient_names():
+    """품목별로 그 품목을 쓰는 재료 이름 (쉼표 구분)"""
+    names = {}
+    for item_id, name in db.session.execute(
+            select(Ingredient.item_id, Ingredient.name).order_by(Ingredient.name)):
+        names.setdefault(item_id, []).append(name)
+    return {item_id: ', '.join(item_names) for item_id, item_names in names.items()}
+
+def _compute_report(start_date, next_start):
+    """품목별 리포트 행 계산 (item_id와 재료 이름을 포함한 dict 목록)"""
+    ingredient_names = _ingredient_names()
+    rows = []
+    for row in db.session.execute(_build_report_query(start_date, next_start)):
+        closing_stock = float(row.current_stock) - float(row.net_after_month)
+        rows.append({
+            'item_id': row.id,
+            'name': row.name,
+            'ingredients': ingredient_names.get(row.id, ''),
+            'current_stock': float(row.current_stock),
+            'opening_stock': closing_stock - float(row.net_in_month),
+            'closing_stock': closing_stock,
+            'min_stock': float(row.min_stock),
+            'unit': row.unit,
+            'ordered_quantity': float(row.ordered_quantity),
+            'ordered_cost': float(row.ordered_cost),
+            'received_quantity': float(row.received_quantity),
+            'used_quantity': -float(row.used_quantity),
+            'cost_per_unit': float(row.cost_per_unit)
+        })
+    return rows
+
+def _report_from_snapshot(year, month):
+    """스냅샷에 저장된 월 리포트 (스냅샷이 없으면 None)"""
+    snapshots = InventoryMonthlySnapshot.query.filter_by(year=year, month=month)\
+        .order_by(InventoryMonthlySnapshot.item_name).all()
+    if not snapshots:
+        return None
+    return {
+        snapshot.item_name: {
+            'ingredients': snapshot.ingredient_names or '',
+            # 마감된 월은 월말 재고를 현재 재고로 표시
+            'current_stock': snapshot.closing_stock,
+            'opening_stock': snapshot.opening_stock,
+            'closing_stock': snapshot.closing_stock,
+            'min_stock': snapshot.min_stock,
+            'unit': snapshot.unit,
+            'ordered_quantity': snapshot.ordered_quantity,
+            'ordered_cost': snapshot.ordered_cost,
+            'received_quantity': snapshot.received_quantity,
+            'used_quantity': snapshot.used_quantity,
+            'cost_per_unit': snapshot.cost_per_unit
+        }
+        for snapshot in snapshots
+    }
 
 def get_monthly_inventory_report(year, month):
     """
     해당 연월의 재고 현황 리포트 생성
-    
+
+    마감된 월은 월말 스냅샷을, 그 밖의 월은 한 번의 집계 쿼리 결과를 사용한다.
+
     Returns:
         tuple: (report_data, start_date, end_date)
     """
-    # 날짜 범위 설정
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end_date = date(year, month + 1, 1) - timedelta(days=1)
-        
-    # 모든 식자재 조회
-    ingredients = Ingredient.query.all()
+    start_date, next_start = _month_range(year, month)
+    end_date = next_start - timedelta(days=1)
+
+    if _is_closed_month(year, month):
+        report_data = _report_from_snapshot(year, month)
+        if report_data is not None:
+            return report_data, start_date, end_date
+
     report_data = {}
-    
-    for ingredient in ingredients:
-        # 발주량 집계
-        ordered = OrderItem.query.filter(
-            and_(
-                OrderItem.ingredient_id == ingredient.id,
-                OrderItem.created_at >= start_date,
-                OrderItem.created_at <= end_date
-            )
-        ).with_entities(
-            func.sum(OrderItem.quantity).label('total_quantity'),
-            func.sum(OrderItem.total_cost).label('total_cost')
-        ).first()
-        
-        # 입고량 집계
-        received = StockTransaction.query.filter(
-            and_(
-                StockTransaction.ingredient_id == ingredient.id,
-                StockTransaction.transaction_type == 'purchase',
-                StockTransaction.created_at >= start_date,
-                StockTransaction.created_at <= end_date
-            )
-        ).with_entities(
-            func.sum(StockTransaction.quantity).label('total_quantity')
-        ).first()
-        
-        # 사용량 집계
-        used = StockTransaction.query.filter(
-            and_(
-                StockTransaction.ingredient_id == ingredient.id,
-                StockTransaction.transaction_type == 'usage',
-                StockTransaction.created_at >= start_date,
-                StockTransaction.created_at <= end_date
-            )
-        ).with_entities(
-            func.sum(StockTransaction.quantity).label('total_quantity')
-        ).first()
-        
-        # 리포트 데이터 구성
-        report_data[ingredient.name] = {
-            'current_stock': ingredient.current_stock,
-            'min_stock': ingredient.min_stock,
-            'unit': ingredient.unit,
-            'ordered_quantity': float(ordered.total_quantity or 0),
-            'ordered_cost': float(ordered.total_cost or 0),
-            'received_quantity': float(received.total_quantity or 0),
-            'used_quantity': abs(float(used.total_quantity or 0)),
-            'cost_per_unit': ingredient.cost_per_unit
-        }
-        
-    return report_data, start_date, end_date 
\ No newline at end of file
+    for row in _compute_report(start_date, next_start):
+        name = row.pop('name')
+        row.pop('item_id')
+        report_data[name] = row
+
+    return report_data, start_date, end_date
+
+def snapshot_monthly_inventory(year=None, month=None):
+    """
+    월말 재고 스냅샷 저장 (기본값: 지난달)
+
+    같은 월의 스냅샷이 있으면 다시 계산하여 바꾼다.
+
+    Returns:
+        int: 저장한 품목 수
+    """
+    if year is None or month is None:
+        last_month = date.today().replace(day=1) - timedelta(days=1)
+        year, month = last_month.year, last_month.month
+    if not _is_closed_month(year, month):
+        raise ValueError(f"{year}년 {month}월은 아직 마감되지 않았습니다.")
+
+    try:
+        start_date, next_start = _month_range(year, month)
+        rows = _compute_report(start_date, next_start)
+
+        InventoryMonthlySnapshot.query.filter_by(year=year, month=month).delete()
+        if rows:
+            db.session.execute(db.insert(InventoryMonthlySnapshot), [
+                dict(
+                    year=year,
+                    month=month,
+                    item_id=row['item_id'],
+                    item_name=row['name'],
+                    ingredient_names=row['ingredients'],
+                    unit=row['unit'],
+                    opening_stock=row['opening_stock'],
+                    closing_stock=row['closing_stock'],
+                    min_stock=row['min_stock'],
+                    ordered_quantity=row['ordered_quantity'],
+                    ordered_cost=row['ordered_cost'],
+                    received_quantity=row['received_quantity'],
+                    used_quantity=row['used_quantity'],
+                    cost_per_unit=row['cost_per_unit']
+                )
+                for row in rows
+            ])
+        db.session.commit()
+        logger.info(f"{year}년 {month}월 재고 스냅샷 저장: {len(rows)}건")
+        return len(rows)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"월말 재고 스냅샷 저장 중 오류 발생: {str(e)}")
+        raise
@@ -1,81 +1,106 @@
-from models import StockTransaction, Ingredient
+from models import db, InventoryItem, DailyUsageRollup
+from utils.usage_rollup import get_cached_stats, set_cached_stats
+from flask import current_app
 from sqlalchemy import func
-from datetime import datetime, timedelta
+from datetime import datetime, date
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _to_date(value):
+    """문자열(YYYY-MM-DD), datetime, date를 date로 변환"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value[:10], '%Y-%m-%d').date()
 
 def get_usage_statistics(start_date=None, end_date=None):
-    """재고 사용 통계 데이터 조회"""
+    """
+    재고 사용 통계 데이터 조회
+
+    사용 거래마다 갱신되는 일별 사용량 집계(daily_usage_rollups)를 합산하고,
+    같은 기간의 결과는 USAGE_STATS_CACHE_TTL초 동안 캐시한다.
+    """
     try:
-        # 기본 쿼리
-        query = StockTransaction.query.filter_by(transaction_type='usage')
-        
+        start_date = _to_date(start_date)
+        end_date = _to_date(end_date)
+        cache_key = (start_date, end_date)
+        ttl = current_app.config.get('USAGE_STATS_CACHE_TTL', 300)
+        cached = get_cached_stats(cache_key, ttl)
+        if cached is not None:
+            return cached
+
+        query = db.session.query(DailyUsageRollup)
+
         # 날짜 필터 적용
         if start_date:
-            query = query.filter(StockTransaction.created_at >= start_date)
+            query = query.filter(DailyUsageRollup.date >= start_date)
         if end_date:
-            query = query.filter(StockTransaction.created_at <= end_date)
-            
-        # 전체 사용량 통계
-        total_usage = query.with_entities(
-            func.sum(StockTransaction.quantity).label('total_quantity')
-        ).scalar() or 0
-        
+            query = query.filter(DailyUsageRollup.date <= end_date)
+
         # 식자재별 사용량
         ingredient_usage = query.with_entities(
-            StockTransaction.ingredient_id,
-            Ingredient.name,
-            Ingredient.unit,
-            func.sum(StockTransaction.quantity).label('total_quantity')
-        ).join(Ingredient).group_by(
-            StockTransaction.ingredient_id,
-            Ingredient.name,
-            Ingredient.unit
+            DailyUsageRollup.item_id,
+            InventoryItem.name,
+            InventoryItem.unit,
+            func.sum(DailyUsageRollup.quantity).label('total_quantity')
+        ).join(InventoryItem, InventoryItem.id == DailyUsageRollup.item_id).group_by(
+            DailyUsageRollup.item_id,
+            InventoryItem.name,
+            InventoryItem.unit
         ).all()
-        
+
         # 일별 사용량 추이
         daily_usage = query.with_entities(
-            func.date(StockTransaction.created_at).label('date'),
-            func.sum(StockTransaction.quantity).label('total_quantity')
+            DailyUsageRollup.date,
+            func.sum(DailyUsageRollup.quantity).label('total_quantity')
         ).group_by(
-            func.date(StockTransaction.created_at)
+            DailyUsageRollup.date
         ).order_by(
-            func.date(StockTransaction.created_at)
+            DailyUsageRollup.date
         ).all()
-        
-        # 사용자별 사용량
+
+        # 사용자별 사용량 (0: 사용자 미지정)
         user_usage = query.with_entities(
-            StockTransaction.created_by,
-            func.sum(StockTransaction.quantity).label('total_quantity')
+            DailyUsageRollup.user_id,
+            func.sum(DailyUsageRollup.quantity).label('total_quantity')
         ).group_by(
-            StockTransaction.created_by
+            DailyUsageRollup.user_id
         ).all()
-        
-        return {
-            'total_usage': abs(total_usage),
+
+        stats = {
+            # 전체 사용량은 일별 합계로 계산
+            'total_usage': sum(qty or 0 for _, qty in daily_usage),
             'ingredient_usage': [
                 {
-                    'ingredient_id': ing_id,
+                    'ingredient_id': item_id,
                     'name': name,
                     'unit': unit,
-                    'quantity': abs(qty)
+                    'quantity': qty
                 }
-                for ing_id, name, unit, qty in ingredient_usage
+                for item_id, name, unit, qty in ingredient_usage
             ],
             'daily_usage': [
                 {
-                    'date': date.strftime('%Y-%m-%d'),
-                    'quantity': abs(qty)
+                    'date': day.strftime('%Y-%m-%d'),
+                    'quantity': qty
                 }
-                for date, qty in daily_usage
+                for day, qty in daily_usage
             ],
             'user_usage': [
                 {
-                    'user_id': user_id,
-                    'quantity': abs(qty)
+                    'user_id': user_id or None,
+                    'quantity': qty
                 }
                 for user_id, qty in user_usage
             ]
         }
-        
+        set_cached_stats(cache_key, stats)
+        return stats
+
     except Exception as e:
-        print(f"통계 데이터 조회 중 오류 발생: {str(e)}")
-        return None 
\ No newline at end of file
+        logger.error(f"통계 데이터 조회 중 오류 발생: {str(e)}")
+        return None
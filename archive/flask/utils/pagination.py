@@ -0,0 +1,96 @@
+import json
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from flask import request
+from sqlalchemy import and_, or_
+
+# 페이지 크기 기본값과 최대값
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+@dataclass
+class KeysetPage:
+    """키셋 페이지 조회 결과"""
+    items: List[Any]
+    next_cursor: Optional[str]
+    limit: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_dict(self) -> dict:
+        return {'next_cursor': self.next_cursor, 'has_more': self.has_more, 'limit': self.limit}
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """(created_at, id)를 불투명한 커서 문자열로 변환 (created_at이 NULL인 행도 표현)"""
+    value = created_at.isoformat() if created_at is not None else None
+    raw = json.dumps([value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """커서 문자열을 (created_at, id)로 변환 (형식이 잘못되면 ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, int(row_id)
+    except Exception:
+        raise ValueError("유효하지 않은 페이지 커서입니다.")
+
+def get_page_args(default_limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Optional[str], int]:
+    """요청 파라미터(cursor, limit)에서 커서와 페이지 크기 조회"""
+    cursor = request.args.get('cursor') or None
+    limit = request.args.get('limit', default_limit, type=int)
+    return cursor, min(max(limit, 1), MAX_PAGE_SIZE)
+
+def keyset_paginate(query, created_column, id_column, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> KeysetPage:
+    """
+    (created_at, id) 내림차순 키셋 페이지네이션
+
+    OFFSET 대신 마지막 행의 (created_at, id) 이후부터 limit + 1행만 조회하므로
+    (created_at, id) 인덱스가 있으면 테이블 크기와 관계없이 조회 비용이 일정하다.
+    created_at이 NULL인 행은 가장 오래된 행으로 보고, 값이 있는 행을 모두 넘긴 뒤
+    id 내림차순으로 이어서 조회한다 (두 구간 모두 같은 인덱스로 범위 조회).
+
+    Args:
+        query: 필터가 적용된 조회 쿼리 (정렬은 이 함수에서 지정)
+        created_column: 정렬 기준 시각 컬럼
+        id_column: 동일 시각 정렬용 ID 컬럼
+        cursor (str): 이전 페이지의 next_cursor (첫 페이지는 None)
+        limit (int): 페이지 크기
+
+    Returns:
+        KeysetPage: 조회 결과와 다음 페이지 커서 (마지막 페이지면 None)
+    """
+    created_at, row_id = decode_cursor(cursor) if cursor else (None, None)
+
+    rows = []
+    if not cursor or created_at is not None:
+        # created_at이 있는 구간
+        dated = query.filter(created_column.isnot(None))
+        if cursor:
+            # created_column <= created_at 범위 조건을 먼저 두어 인덱스 범위 조회가 되도록 한다
+            dated = dated.filter(and_(
+                created_column <= created_at,
+                or_(created_column < created_at, id_column < row_id)
+            ))
+        rows = dated.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        # created_at이 NULL인 구간 (남은 자리 + 1행만 조회)
+        undated = query.filter(created_column.is_(None))
+        if cursor and created_at is None:
+            undated = undated.filter(id_column < row_id)
+        rows += undated.order_by(id_column.desc()).limit(limit + 1 - len(rows)).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+    return KeysetPage(items=items, next_cursor=next_cursor, limit=limit)
@@ -6,6 +6,7 @@ from extensions import db
 from models.pos import POSSaleLog, POSSaleItem, POSPerformanceLog
 from models.inventory import InventoryItem
 from utils.inventory import consume_inventory
+from utils.inventory_ledger import append_ledger_entries
 from utils.kakao import send_kakao_to_admin
 from config import Config
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -374,6 +375,10 @@ def sync_pos_sales():
                 inventory_item = InventoryItem.query.get(item.inventory_item_id)
                 if inventory_item:
                     inventory_item.current_quantity -= item.quantity
+                    append_ledger_entries(db.session.connection(), [
+                        dict(item_id=inventory_item.id, quantity=-item.quantity,
+                             source='pos_sale', reference=f'order:{order.id}')
+                    ])
             
             # 주문 상태 업데이트
             order.synced_at = datetime.utcnow()
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from datetime import datetime, date
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from models import StockItem, StockTransaction, DailyUsageRollup
+from utils.archiving import with_archive
+
+logger = logging.getLogger(__name__)
+
+# 기간별 사용 통계 캐시 ((시작일, 종료일) -> (저장 시각, 결과))
+_stats_cache = {}
+_cache_lock = threading.Lock()
+
+def get_cached_stats(key, ttl):
+    """캐시된 통계 조회 (ttl초가 지났으면 None)"""
+    with _cache_lock:
+        cached = _stats_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    return None
+
+def set_cached_stats(key, value):
+    with _cache_lock:
+        _stats_cache[key] = (time.monotonic(), value)
+
+def clear_stats_cache():
+    """사용량 집계가 바뀌면 캐시 전체 삭제"""
+    with _cache_lock:
+        _stats_cache.clear()
+
+def set_usage_user(session, user_id):
+    """
+    이후 세션에 추가되는 사용 거래를 집계할 사용자 지정 (세션이 끝날 때까지 유지)
+
+    재고 거래에는 사용자 컬럼이 없으므로, ORM으로 추가한 사용 거래는 이 값으로
+    일별 사용량을 사용자별로 집계한다.
+    """
+    session.info['usage_user_id'] = user_id
+
+def _aggregate(entries):
+    """(사용 시각, 품목 ID, 사용자 ID, 수량) 목록을 (날짜, 품목, 사용자)별로 합산"""
+    totals = {}
+    for used_at, item_id, user_id, quantity in entries:
+        if item_id is None:
+            continue
+        key = ((used_at or datetime.utcnow()).date(), item_id, user_id or 0)
+        row = totals.setdefault(key, [0.0, 0])
+        row[0] += abs(quantity or 0)
+        row[1] += 1
+    return totals
+
+def add_daily_usage(session, entries):
+    """
+    사용 거래를 일별 집계에 더함 (호출한 쪽의 트랜잭션에서 실행)
+
+    통계 캐시는 트랜잭션이 커밋된 뒤에 비운다. 커밋 전에 비우면 그 사이 다른 요청이
+    커밋 전 집계를 다시 캐시할 수 있다.
+
+    Args:
+        session: DB 세션
+        entries: (사용 시각, 품목 ID, 사용자 ID, 수량) 목록
+    """
+    totals = _aggregate(entries)
+    if not totals:
+        return
+    connection = session.connection()
+    table = DailyUsageRollup.__table__
+    now = datetime.utcnow()
+    params = [
+        dict(date=day, item_id=item_id, user_id=user_id, quantity=quantity,
+             transaction_count=count, updated_at=now)
+        for (day, item_id, user_id), (quantity, count) in totals.items()
+    ]
+
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['date', 'item_id', 'user_id'],
+            set_={
+                'quantity': table.c.quantity + stmt.excluded.quantity,
+                'transaction_count': table.c.transaction_count + stmt.excluded.transaction_count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        connection.execute(stmt, params)
+    else:
+        # 그 밖의 DB는 갱신 후 없으면 삽입
+        for values in params:
+            result = connection.execute(
+                update(table)
+                .where(table.c.date == values['date'], table.c.item_id == values['item_id'],
+                       table.c.user_id == values['user_id'])
+                .values(quantity=table.c.quantity + values['quantity'],
+                        transaction_count=table.c.transaction_count + values['transaction_count'],
+                        updated_at=now)
+            )
+            if not result.rowcount:
+                connection.execute(insert(table).values(**values))
+    session.info['usage_stats_stale'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _clear_stats_after_commit(session):
+    """일별 사용량 집계가 바뀐 트랜잭션이 커밋되면 통계 캐시 삭제"""
+    if session.info.pop('usage_stats_stale', False):
+        clear_stats_cache()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_usage_changes(session):
+    """롤백된 트랜잭션의 집계 대기 거래와 캐시 삭제 표시 제거"""
+    session.info.pop('usage_stats_stale', None)
+    session.info.pop('pending_usage_transactions', None)
+
+@event.listens_for(Session, 'before_flush')
+def _collect_usage_transactions(session, flush_context, instances):
+    """세션에 추가된 사용 거래를 (거래, 사용자 ID)로 기록해 두었다가 flush 후 일별 집계에 반영"""
+    user_id = session.info.get('usage_user_id')
+    pending = [
+        (obj, user_id) for obj in session.new
+        if isinstance(obj, StockTransaction) and obj.transaction_type == 'usage'
+    ]
+    if pending:
+        session.info.setdefault('pending_usage_transactions', []).extend(pending)
+
+@event.listens_for(Session, 'after_flush')
+def _apply_usage_transactions(session, flush_context):
+    pending = session.info.pop('pending_usage_transactions', None)
+    if not pending:
+        return
+    stock_ids = {obj.stock_item_id for obj, _ in pending}
+    item_ids = dict(session.connection().execute(
+        select(StockItem.id, StockItem.item_id).where(StockItem.id.in_(stock_ids))
+    ).all())
+    add_daily_usage(session, [
+        (obj.created_at, item_ids.get(obj.stock_item_id), user_id, obj.quantity)
+        for obj, user_id in pending
+    ])
+
+def rebuild_daily_usage(session, start_date: date, end_date: date) -> int:
+    """
+    기간(start_date ~ end_date)의 일별 사용량 집계를 재고 거래(보관 데이터 포함)로 다시 계산
+
+    초기 적재 및 불일치 복구용이며, 재고 거래에는 사용자 정보가 없어 사용자 ID 0으로 집계한다.
+
+    Returns:
+        int: 집계한 사용 거래 수
+    """
+    try:
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.max.time())
+        source = with_archive(StockTransaction, start_date)
+        rows = session.execute(
+            select(source.created_at, StockItem.item_id, source.quantity)
+            .join(StockItem, StockItem.id == source.stock_item_id)
+            .where(source.transaction_type == 'usage', source.created_at.between(start, end))
+        ).all()
+
+        table = DailyUsageRollup.__table__
+        session.connection().execute(table.delete().where(table.c.date.between(start_date, end_date)))
+        add_daily_usage(session, [(used_at, item_id, None, quantity) for used_at, item_id, quantity in rows])
+        # 집계 행이 모두 지워진 경우에도 캐시를 비운다
+        session.info['usage_stats_stale'] = True
+        session.commit()
+        logger.info(f"일별 사용량 집계 재계산 완료: {start_date} ~ {end_date}, {len(rows)}건")
+        return len(rows)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"일별 사용량 집계 재계산 중 오류 발생: {str(e)}")
+        raise
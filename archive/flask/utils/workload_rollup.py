@@ -0,0 +1,161 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Tuple
+from sqlalchemy import update, insert, select, literal, func
+from extensions import db
+from models.workload import WorkloadRollup
+
+logger = logging.getLogger(__name__)
+
+# 집계 값 컬럼 (증분 갱신 대상)
+ROLLUP_FIELDS = ('headcount', 'worked_minutes', 'feedback_count', 'rating_sum')
+
+def get_store_id(user_id) -> int:
+    """사용자의 매장 ID (매장 정보가 없으면 0)"""
+    from models import Employee
+    employee = Employee.query.filter_by(user_id=user_id).first()
+    return getattr(employee, 'store_id', None) or 0
+
+def split_by_hour(start: datetime, end: datetime) -> Dict[Tuple[date, int], int]:
+    """근무 구간을 (날짜, 시) 단위로 나눠 구간별 근무 시간(분) 계산 (자정을 넘는 근무 포함)"""
+    minutes = {}
+    current = start
+    while current < end:
+        next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        chunk_end = min(next_hour, end)
+        minutes[(current.date(), current.hour)] = int((chunk_end - current).total_seconds() // 60)
+        current = chunk_end
+    return minutes
+
+def _add_to_rollup(store_id: int, day: date, hour: int, **deltas):
+    """(매장, 날짜, 시) 행에 값을 더함 (행이 없으면 생성, 현재 세션 트랜잭션에서 실행)"""
+    table = WorkloadRollup.__table__
+    values = {name: deltas.get(name, 0) for name in ROLLUP_FIELDS}
+    key = dict(store_id=store_id, date=day, hour=hour)
+    now = datetime.utcnow()
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**key, **values, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['store_id', 'date', 'hour'],
+            set_={**{name: table.c[name] + stmt.excluded[name] for name in ROLLUP_FIELDS}, 'updated_at': now}
+        )
+        db.session.execute(stmt)
+        return
+
+    # 그 밖의 DB는 갱신 후 없으면 삽입
+    result = db.session.execute(
+        update(table)
+        .where(table.c.store_id == store_id, table.c.date == day, table.c.hour == hour)
+        .values(**{name: table.c[name] + values[name] for name in ROLLUP_FIELDS}, updated_at=now)
+    )
+    if not result.rowcount:
+        db.session.execute(insert(table).values(**key, **values, updated_at=now))
+
+def record_shift(start: datetime, end: datetime, store_id: int = 0):
+    """
+    퇴근 시 근무 구간을 집계에 반영
+
+    출근한 시의 headcount를 1 늘리고, 실제 근무한 각 시에 근무 시간(분)을 더한다.
+    호출한 쪽의 커밋에 함께 포함된다.
+    """
+    try:
+        if not start or not end or end <= start:
+            logger.warning(f"근무 구간이 올바르지 않아 집계하지 않습니다: {start} ~ {end}")
+            return
+        _add_to_rollup(store_id, start.date(), start.hour, headcount=1)
+        for (day, hour), minutes in split_by_hour(start, end).items():
+            _add_to_rollup(store_id, day, hour, worked_minutes=minutes)
+    except Exception as e:
+        logger.error(f"근무 집계 반영 중 오류 발생: {str(e)}")
+        raise
+
+def record_feedback(submitted_at: datetime, rating, store_id: int = 0):
+    """피드백 제출 시 제출 시각의 집계에 평점 반영 (평점이 없으면 건너뜀)"""
+    try:
+        if rating is None:
+            return
+        _add_to_rollup(store_id, submitted_at.date(), submitted_at.hour,
+                       feedback_count=1, rating_sum=float(rating))
+    except Exception as e:
+        logger.error(f"피드백 집계 반영 중 오류 발생: {str(e)}")
+        raise
+
+def collect_workload_records(start_date: date, end_date: date):
+    """
+    기간(start_date ~ end_date)의 집계 재계산에 필요한 원본 기록 조회
+
+    자정을 넘겨 기간에 걸치는 근무도 포함하도록 기간과 겹치는 출근 기록을 모두 읽는다.
+
+    Returns:
+        tuple: (shifts, feedbacks) - rebuild_workload_rollups의 인자 형식
+    """
+    from models import Attendance, Employee, Schedule, WorkFeedback
+    store_id = func.coalesce(Employee.store_id, 0) if hasattr(Employee, 'store_id') else literal(0)
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+    shifts = db.session.execute(
+        select(store_id, Attendance.check_in, Attendance.check_out)
+        .join(Employee, Attendance.employee_id == Employee.id)
+        .where(Attendance.check_in < range_end, Attendance.check_out > range_start)
+    ).all()
+    feedbacks = db.session.execute(
+        select(store_id, WorkFeedback.submitted_at, WorkFeedback.rating)
+        .join(Schedule, WorkFeedback.schedule_id == Schedule.id)
+        .join(Employee, Schedule.employee_id == Employee.id)
+        .where(WorkFeedback.submitted_at >= range_start, WorkFeedback.submitted_at < range_end)
+    ).all()
+    return shifts, feedbacks
+
+def rebuild_workload_rollups(start_date: date, end_date: date, shifts, feedbacks) -> int:
+    """
+    기간(start_date ~ end_date)의 집계를 원본 기록으로 다시 계산 (초기 적재 및 불일치 복구용)
+
+    Args:
+        shifts: (store_id, 출근 시각, 퇴근 시각) 목록
+        feedbacks: (store_id, 제출 시각, 평점) 목록
+
+    Returns:
+        int: 저장한 집계 행 수
+    """
+    try:
+        totals = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+        for store_id, start, end in shifts:
+            if not start or not end or end <= start:
+                continue
+            if start_date <= start.date() <= end_date:
+                totals[(store_id, start.date(), start.hour)]['headcount'] += 1
+            for (day, hour), minutes in split_by_hour(start, end).items():
+                if start_date <= day <= end_date:
+                    totals[(store_id, day, hour)]['worked_minutes'] += minutes
+        for store_id, submitted_at, rating in feedbacks:
+            if rating is None or not (start_date <= submitted_at.date() <= end_date):
+                continue
+            row = totals[(store_id, submitted_at.date(), submitted_at.hour)]
+            row['feedback_count'] += 1
+            row['rating_sum'] += float(rating)
+
+        table = WorkloadRollup.__table__
+        db.session.execute(
+            table.delete().where(table.c.date >= start_date, table.c.date <= end_date)
+        )
+        now = datetime.utcnow()
+        if totals:
+            db.session.execute(insert(table), [
+                dict(store_id=store_id, date=day, hour=hour, updated_at=now, **values)
+                for (store_id, day, hour), values in totals.items()
+            ])
+        db.session.commit()
+        logger.info(f"근무 집계 재계산 완료: {start_date} ~ {end_date}, {len(totals)}행")
+        return len(totals)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"근무 집계 재계산 중 오류 발생: {str(e)}")
+        raise
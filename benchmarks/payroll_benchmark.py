@@ -0,0 +1,54 @@
+"""
+급여 계산 벤치마크
+
+calculate_salary()를 근무 건별로 호출하는 방식과
+calculate_salary_batch()로 한 번에 계산하는 방식의 소요 시간을 비교한다.
+
+실행: python benchmarks/payroll_benchmark.py [근무 건수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from erp_system import PAY_TYPE_CODES, calculate_salary, calculate_salary_batch
+
+
+def make_shifts(count: int, seed: int = 42):
+    """임의의 근무 데이터 생성 (근무 시간, 급여제, 기준 금액)"""
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(120, 780, size=count)
+    pay_types = rng.choice(list(PAY_TYPE_CODES), size=count, p=[0.8, 0.1, 0.1])
+    base_pay = np.where(
+        pay_types == '시급제',
+        rng.integers(9860, 15000, size=count),
+        rng.integers(500000, 3500000, size=count)
+    ).astype(float)
+    return minutes, pay_types, base_pay
+
+
+def run(count: int = 500_000):
+    minutes, pay_types, base_pay = make_shifts(count)
+    rows = list(zip(minutes.tolist(), pay_types.tolist(), base_pay.tolist()))
+
+    start = time.perf_counter()
+    scalar = [calculate_salary(m, p, b) for m, p, b in rows]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_salary_batch(minutes, pay_types, base_pay)
+    batch_time = time.perf_counter() - start
+
+    assert batch.total_pay.tolist() == scalar, "일괄 계산 결과가 단건 계산 결과와 다릅니다."
+
+    print(f"근무 건수: {count:,}")
+    print(f"단건 계산: {scalar_time:.3f}초")
+    print(f"일괄 계산: {batch_time:.3f}초")
+    print(f"속도 향상: {scalar_time / batch_time:.1f}배")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,91 @@
+"""
+인덱스 제안용 쿼리 워크로드
+
+주요 조회 경로(직원별 스케줄, 공급업체별 주문 목록, 주문 상세 품목)를 실행하여
+index_advisor.py가 SQL을 수집할 수 있게 한다.
+
+실행: python index_advisor.py benchmarks.query_workload:run --database-url sqlite:///bench.db
+"""
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, insert, func
+from sqlalchemy.orm import Session
+
+from models import db, User, Supplier, Order, OrderItem, Schedule, refresh_order_totals
+
+
+def seed(engine, users: int = 50, suppliers: int = 20, orders: int = 5000, seed: int = 42):
+    """테이블 생성 및 데이터 적재 (이미 데이터가 있으면 건너뜀)"""
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.scalar(select(func.count(Order.id))):
+            return
+
+        rng = random.Random(seed)
+        start = datetime(2024, 1, 1)
+        session.execute(insert(User), [
+            dict(username=f'user{i}', email=f'user{i}@example.com') for i in range(users)
+        ])
+        session.execute(insert(Supplier), [dict(name=f'supplier{i}') for i in range(suppliers)])
+        session.execute(insert(Order), [
+            dict(
+                user_id=rng.randint(1, users),
+                supplier_id=rng.randint(1, suppliers),
+                order_date=start + timedelta(hours=i),
+                delivery_date=start + timedelta(hours=i + 24)
+            )
+            for i in range(orders)
+        ])
+        session.execute(insert(OrderItem), [
+            dict(order_id=i // 3 + 1, item_name=f'item{i % 40}', quantity=rng.randint(1, 10),
+                 unit_price=rng.randint(1000, 20000))
+            for i in range(orders * 3)
+        ])
+        # Core 일괄 INSERT는 ORM 이벤트를 거치지 않으므로 주문 합계를 직접 채운다
+        refresh_order_totals(session.connection(), range(1, orders + 1))
+        session.execute(insert(Schedule), [
+            dict(user_id=rng.randint(1, users), title='근무',
+                 start_time=start + timedelta(hours=i * 2),
+                 end_time=start + timedelta(hours=i * 2 + 8))
+            for i in range(orders * 2)
+        ])
+        session.commit()
+
+
+def run(engine, repeat: int = 20):
+    """주요 조회 경로 실행"""
+    seed(engine)
+    week = timedelta(days=7)
+    with Session(engine) as session:
+        for i in range(repeat):
+            since = datetime(2024, 1, 1) + timedelta(days=i * 7)
+
+            # 직원별 주간 스케줄
+            session.scalars(
+                select(Schedule)
+                .where(Schedule.user_id == i % 50 + 1,
+                       Schedule.start_time >= since, Schedule.start_time < since + week)
+                .order_by(Schedule.start_time)
+            ).all()
+
+            # 공급업체별 기간 주문 목록 (품목 수와 합계는 주문 행에서 함께 조회)
+            orders = session.execute(
+                select(Order.id, Order.order_date, Order.status, Order.item_count, Order.total_amount)
+                .where(Order.supplier_id == i % 20 + 1, Order.order_date >= since)
+                .order_by(Order.order_date.desc())
+                .limit(20)
+            ).all()
+
+            # 목록에서 선택한 주문의 상세 품목
+            if orders:
+                session.scalars(select(OrderItem).where(OrderItem.order_id == orders[0].id)).all()
+
+
+if __name__ == '__main__':
+    from sqlalchemy import create_engine
+    run(create_engine(sys.argv[1] if len(sys.argv) > 1 else 'sqlite:///bench.db'))
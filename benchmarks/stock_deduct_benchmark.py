@@ -0,0 +1,89 @@
+"""
+재고 일괄 차감 벤치마크
+
+재료마다 조회하고 거래 내역을 ORM 객체로 하나씩 추가하던 기존 batch_deduct_stock 방식과
+deduct_stock_bulk()의 IN 조회 + executemany 방식의 소요 시간을 비교한다.
+
+실행: python benchmarks/stock_deduct_benchmark.py [차감 줄 수]
+"""
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'archive', 'flask'))
+
+from flask import Flask
+
+from extensions import db
+from models import InventoryItem, Ingredient, StockItem, StockTransaction
+from utils.inventory import deduct_stock_bulk
+
+
+def create_app(path: str):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    return app
+
+
+def seed(count: int):
+    """재료 count개와 재료별 재고 항목 생성"""
+    db.create_all()
+    db.session.execute(db.insert(InventoryItem), [
+        dict(id=i, name=f'item{i}', unit='kg', min_quantity=1, current_quantity=0) for i in range(1, count + 1)
+    ])
+    db.session.execute(db.insert(Ingredient), [
+        dict(id=i, name=f'ingredient{i}', item_id=i, quantity=1, unit='kg') for i in range(1, count + 1)
+    ])
+    db.session.execute(db.insert(StockItem), [
+        dict(item_id=i, quantity=1_000_000, unit='kg') for i in range(1, count + 1)
+    ])
+    db.session.commit()
+
+
+def legacy_deduct(lines, notes: str = None):
+    """기존 방식 (재료별 조회 후 ORM 객체로 하나씩 갱신/추가)"""
+    for line in lines:
+        ingredient = db.session.get(Ingredient, line['ingredient_id'])
+        stock = StockItem.query.filter_by(item_id=ingredient.item_id).first()
+        if stock.quantity < line['quantity']:
+            raise ValueError(f'{ingredient.name}의 재고가 부족합니다.')
+        stock.quantity -= line['quantity']
+        db.session.add(StockTransaction(
+            stock_item_id=stock.id, transaction_type='usage', quantity=-line['quantity'], notes=notes
+        ))
+    db.session.commit()
+
+
+def run(count: int = 200, repeat: int = 20):
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(os.path.join(directory, 'bench.db'))
+        with app.app_context():
+            seed(count)
+            lines = [{'ingredient_id': i, 'quantity': 1.5} for i in range(1, count + 1)]
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                legacy_deduct(lines, '벤치마크')
+            legacy_time = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                deduct_stock_bulk(lines, '벤치마크')
+                db.session.commit()
+            bulk_time = (time.perf_counter() - start) / repeat
+
+            expected = 1_000_000 - 1.5 * repeat * 2
+            assert all(stock.quantity == expected for stock in StockItem.query.all()), \
+                "차감 결과가 기존 방식과 다릅니다."
+
+    print(f"차감 줄 수: {count}, 반복 {repeat}회")
+    print(f"기존 방식: {legacy_time * 1000:.1f}ms")
+    print(f"일괄 차감: {bulk_time * 1000:.1f}ms")
+    print(f"속도 향상: {legacy_time / bulk_time:.1f}배")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
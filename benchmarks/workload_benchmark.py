@@ -0,0 +1,105 @@
+"""
+시간대별 근무 분석 벤치마크
+
+기존 방식(출근/피드백 전체 로드 후 시간대마다 피드백 전체 재탐색)과
+summarize_workload()의 SQL 집계 방식의 소요 시간을 비교한다.
+
+실행: python benchmarks/workload_benchmark.py [행 수]
+"""
+import os
+import sys
+import time
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, Column, Integer, Float, Date, DateTime, Time
+from sqlalchemy.orm import Session, declarative_base
+
+from schedule_analysis import group_hour, summarize_workload
+
+Base = declarative_base()
+
+
+class Attendance(Base):
+    __tablename__ = 'attendances'
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False, index=True)
+    clock_in = Column(Time, nullable=False)
+
+
+class WorkFeedback(Base):
+    __tablename__ = 'work_feedbacks'
+    id = Column(Integer, primary_key=True)
+    rating = Column(Float)
+    submitted_at = Column(DateTime, nullable=False, index=True)
+
+
+def seed(engine, count: int, seed: int = 42):
+    """근무일 3년치에 걸친 출근/피드백 데이터 생성"""
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    start = date(2022, 1, 1)
+    with Session(engine) as session:
+        for offset in range(0, count, 100_000):
+            size = min(100_000, count - offset)
+            days = [start + timedelta(days=rng.randrange(1095)) for _ in range(size)]
+            session.execute(insert(Attendance), [
+                dict(user_id=rng.randrange(200), date=d,
+                     clock_in=datetime.min.replace(hour=rng.randrange(5, 23), minute=rng.randrange(60)).time())
+                for d in days
+            ])
+            session.execute(insert(WorkFeedback), [
+                dict(rating=rng.randint(1, 5),
+                     submitted_at=datetime.combine(d, datetime.min.time()) + timedelta(minutes=rng.randrange(300, 1380)))
+                for d in days
+            ])
+        session.commit()
+
+
+def legacy_analyze(session):
+    """기존 analyze_workload()와 같은 방식 (전체 로드 + 시간대별 피드백 재탐색)"""
+    attendances = session.execute(select(Attendance.user_id, Attendance.clock_in)).all()
+    feedbacks = session.execute(select(WorkFeedback.rating, WorkFeedback.submitted_at)).all()
+    data = defaultdict(list)
+    for a in attendances:
+        data[group_hour(a.clock_in)].append({'user_id': a.user_id})
+    result = {}
+    for hour_group, records in data.items():
+        fb_scores = [f.rating for f in feedbacks if group_hour(f.submitted_at.time()) == hour_group]
+        result[hour_group] = (len(records), round(sum(fb_scores) / len(fb_scores), 1) if fb_scores else None)
+    return result
+
+
+def run(count: int = 1_000_000):
+    engine = create_engine('sqlite://')
+    seed(engine, count)
+
+    with Session(engine) as session:
+        start = time.perf_counter()
+        legacy = legacy_analyze(session)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary = summarize_workload(session, Attendance, WorkFeedback)
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summarize_workload(session, Attendance, WorkFeedback, date(2024, 12, 1), date(2024, 12, 31))
+        month_time = time.perf_counter() - start
+
+    assert {r['시간대']: (r['근무 인원'], r['평균 평점']) for r in summary} == legacy, \
+        "SQL 집계 결과가 기존 방식 결과와 다릅니다."
+
+    print(f"행 수: 출근 {count:,}건, 피드백 {count:,}건")
+    print(f"기존 방식 (전체 기간): {legacy_time:.3f}초")
+    print(f"SQL 집계 (전체 기간): {full_time:.3f}초")
+    print(f"SQL 집계 (1개월): {month_time:.3f}초")
+    print(f"속도 향상 (전체 기간): {legacy_time / full_time:.1f}배")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
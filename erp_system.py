@@ -1,14 +1,20 @@
+import os
 import logging
 import unittest
+import zipfile
+import tempfile
+from io import BytesIO
 from datetime import datetime
-from typing import Union, Literal, List, Dict, Optional
+from typing import Union, Literal, List, Dict, Optional, Tuple, Callable, BinaryIO
 from functools import lru_cache
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 
 # 로깅 설정
 logging.basicConfig(
@@ -25,6 +31,10 @@ logger = logging.getLogger(__name__)
 PayType = Literal['시급제', '주급제', '월급제']
 WorkStatus = Literal['정상', '지각', '조퇴', '결근', '휴가']
 
+# 급여제 코드 (일괄 계산용)
+PAY_TYPE_CODES = {'시급제': 0, '주급제': 1, '월급제': 2}
+HOURLY_REGULAR_HOURS = 8
+
 # 예외 클래스
 class SalaryCalculationError(Exception):
     """급여 계산 관련 예외"""
@@ -54,8 +64,32 @@ class SalaryData:
     deductions: float
     net_salary: float
 
+# 근무 시간 일괄 계산 오류 플래그 (비트 조합)
+INVALID_CHECK_IN = 1
+INVALID_CHECK_OUT = 2
+CHECK_OUT_BEFORE_CHECK_IN = 4
+
+@dataclass
+class WorkDurationBatch:
+    minutes: np.ndarray      # 실 근무 시간(분), 오류 행은 0
+    error_flags: np.ndarray  # 행별 오류 플래그, 정상 행은 0
+
+    @property
+    def has_errors(self) -> np.ndarray:
+        return self.error_flags != 0
+
+def _parse_clock_seconds(value: str) -> int:
+    """'HH:MM:SS' 문자열을 자정 기준 초로 변환 (정형 문자열은 정수 슬라이싱으로 처리)"""
+    if (len(value) == 8 and value[2] == ':' and value[5] == ':'
+            and value[:2].isdigit() and value[3:5].isdigit() and value[6:].isdigit()):
+        hours, minutes, seconds = int(value[:2]), int(value[3:5]), int(value[6:])
+        if hours < 24 and minutes < 60 and seconds < 60:
+            return hours * 3600 + minutes * 60 + seconds
+    # '9:00:00'처럼 자릿수가 다른 입력은 strptime 규칙을 그대로 따른다
+    parsed = datetime.strptime(value, "%H:%M:%S")
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
 # [완료] 기능 1: 실근무 시간 계산
-@lru_cache(maxsize=128)
 def calculate_work_duration(check_in: str, check_out: str) -> int:
     """
     출근/퇴근 시간을 받아 실 근무 시간(분)을 계산한다.
@@ -65,20 +99,87 @@ def calculate_work_duration(check_in: str, check_out: str) -> int:
     :raises: WorkDurationError
     """
     try:
-        fmt = "%H:%M:%S"
-        start = datetime.strptime(check_in, fmt)
-        end = datetime.strptime(check_out, fmt)
-        
+        start = _parse_clock_seconds(check_in)
+        end = _parse_clock_seconds(check_out)
+
         if end < start:
             raise WorkDurationError("퇴근 시간이 출근 시간보다 빠를 수 없습니다.")
-            
-        duration = (end - start).total_seconds() / 60
-        logger.info(f"근무 시간 계산 완료: {duration}분")
-        return int(duration)
+
+        duration = (end - start) // 60
+        logger.debug(f"근무 시간 계산 완료: {duration}분")
+        return duration
     except Exception as e:
         logger.error(f"근무 시간 계산 실패: {str(e)}")
         raise WorkDurationError(f"근무 시간 계산 중 오류가 발생했습니다: {str(e)}")
 
+def _to_clock_chars(values) -> np.ndarray:
+    """시각 문자열 배열을 (행, 9) 문자 코드 배열로 변환 (문자열이 아니면 빈 값)"""
+    arr = np.asarray(values)
+    if arr.dtype.kind not in ('U', 'S'):
+        arr = np.array([v if isinstance(v, str) else '' for v in arr.ravel()], dtype=str)
+    if arr.dtype.kind == 'S':
+        return arr.astype('S9').view(np.uint8).reshape(-1, 9)
+    return arr.astype('U9').view(np.uint32).reshape(-1, 9)
+
+def _parse_clock_column(values):
+    """
+    'HH:MM:SS' 문자열 배열을 초 단위 배열로 변환한다.
+    :return: (seconds, invalid) 튜플, 형식 오류 행은 invalid가 True
+    """
+    chars = _to_clock_chars(values)
+    digits = chars[:, [0, 1, 3, 4, 6, 7]].astype(np.int64) - ord('0')
+
+    valid = (
+        (chars[:, 2] == ord(':')) & (chars[:, 5] == ord(':')) & (chars[:, 8] == 0)
+        & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    )
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    seconds = digits[:, 4] * 10 + digits[:, 5]
+    valid &= (hours < 24) & (minutes < 60) & (seconds < 60)
+    total = np.where(valid, hours * 3600 + minutes * 60 + seconds, 0)
+
+    # 정형이 아닌 행만 단건 파서로 다시 확인 ('9:00:00' 등)
+    irregular = np.flatnonzero(~valid)
+    source = np.asarray(values, dtype=object).ravel() if irregular.size else None
+    for i in irregular:
+        value = source[i]
+        if not isinstance(value, str):
+            continue
+        try:
+            total[i] = _parse_clock_seconds(value)
+            valid[i] = True
+        except ValueError:
+            pass
+    return total, ~valid
+
+# 기능 1-1: 실근무 시간 일괄 계산
+def calculate_work_durations(check_ins, check_outs) -> WorkDurationBatch:
+    """
+    출근/퇴근 시간 열 전체를 한 번에 파싱하여 실 근무 시간(분)을 계산한다.
+    잘못된 행이 있어도 예외를 발생시키지 않고 행별 오류 플래그로 반환한다.
+    :param check_ins: array-like of str ('HH:MM:SS')
+    :param check_outs: array-like of str ('HH:MM:SS')
+    :return: WorkDurationBatch, 근무 시간(분)과 오류 플래그
+        (INVALID_CHECK_IN | INVALID_CHECK_OUT | CHECK_OUT_BEFORE_CHECK_IN)
+    """
+    if len(check_ins) != len(check_outs):
+        raise WorkDurationError("출근/퇴근 시간 목록의 길이가 다릅니다.")
+
+    start, bad_start = _parse_clock_column(check_ins)
+    end, bad_end = _parse_clock_column(check_outs)
+
+    flags = np.zeros(start.shape[0], dtype=np.uint8)
+    flags[bad_start] |= INVALID_CHECK_IN
+    flags[bad_end] |= INVALID_CHECK_OUT
+    flags[~bad_start & ~bad_end & (end < start)] |= CHECK_OUT_BEFORE_CHECK_IN
+
+    minutes = np.where(flags == 0, (end - start) // 60, 0)
+    error_count = int(np.count_nonzero(flags))
+    if error_count:
+        logger.warning(f"근무 시간 일괄 계산: {flags.size}건 중 {error_count}건 오류")
+    return WorkDurationBatch(minutes=minutes, error_flags=flags)
+
 # [완료] 기능 2: 급여 계산 함수
 def calculate_salary(
     work_minutes: int,
@@ -112,89 +213,283 @@ def calculate_salary(
         logger.error(f"급여 계산 실패: {str(e)}")
         raise SalaryCalculationError(f"급여 계산 중 오류가 발생했습니다: {str(e)}")
 
-# [완료] 기능 3: 급여 PDF 자동 생성
-def generate_payroll_pdf(employee_data: Dict, salary_data: SalaryData) -> str:
+@dataclass
+class BatchSalaryResult:
+    regular_pay: np.ndarray
+    overtime_pay: np.ndarray
+    total_pay: np.ndarray
+
+def _encode_pay_types(pay_types, size: int) -> np.ndarray:
+    """급여제 배열을 정수 코드 배열로 변환"""
+    values = np.asarray(pay_types)
+    if values.ndim == 0:
+        values = np.full(size, values.item())
+    if np.issubdtype(values.dtype, np.integer):
+        codes = values.astype(np.int64)
+        invalid = ~np.isin(codes, list(PAY_TYPE_CODES.values()))
+    else:
+        values = values.astype(str)
+        codes = np.full(values.shape, -1, dtype=np.int64)
+        for name, code in PAY_TYPE_CODES.items():
+            codes[values == name] = code
+        invalid = codes < 0
+    if invalid.any():
+        rows = np.flatnonzero(invalid)[:10].tolist()
+        raise SalaryCalculationError(f"지원되지 않는 급여제 유형입니다. (행: {rows})")
+    return codes
+
+def _round_half_exact(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
     """
-    급여 명세서 PDF를 생성한다.
-    :param employee_data: Dict, 직원 정보
-    :param salary_data: SalaryData, 급여 정보
-    :return: str, 생성된 PDF 파일 경로
+    파이썬 round()와 동일한 결과를 내는 벡터 반올림.
+    np.round는 곱셈 결과 x * 10^n을 반올림하므로, 곱셈 오차로 정확히 .5가 된 원소는
+    Dekker 분할로 구한 곱셈 오차의 부호로 올림/내림을 결정한다.
+    """
+    factor = 10.0 ** ndigits
+    scaled = values * factor
+    result = np.rint(scaled)
+
+    ties = np.abs(scaled - np.trunc(scaled)) == 0.5
+    if ties.any():
+        split = 134217729.0 * values  # 2^27 + 1
+        high = split - (split - values)
+        low = values - high
+        error = (high * factor - scaled) + low * factor
+        result = np.where(ties & (error > 0), np.ceil(scaled), result)
+        result = np.where(ties & (error < 0), np.floor(scaled), result)
+    return result / factor
+
+# 기능 2-1: 급여 일괄 계산
+def calculate_salary_batch(
+    work_minutes,
+    pay_types,
+    base_pay,
+    overtime_rate: float = 1.5
+) -> BatchSalaryResult:
+    """
+    여러 직원/근무의 급여를 NumPy로 한 번에 계산한다.
+    total_pay는 같은 입력에 대한 calculate_salary()의 결과와 동일하다.
+    :param work_minutes: array-like, 근무 시간 (분)
+    :param pay_types: array-like 또는 str, '시급제', '월급제', '주급제' (또는 PAY_TYPE_CODES 값)
+    :param base_pay: array-like 또는 float, 기준 금액 (시급, 월급, 주급)
+    :param overtime_rate: float, 야근 수당 비율 (기본값: 1.5)
+    :return: BatchSalaryResult, 기본급/야근수당/총 급여 배열
+    :raises: SalaryCalculationError
     """
     try:
-        filename = f"payroll_{employee_data['id']}_{salary_data.year}_{salary_data.month}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
+        minutes = np.asarray(work_minutes, dtype=np.float64)
+        base = np.broadcast_to(np.asarray(base_pay, dtype=np.float64), minutes.shape)
+        codes = _encode_pay_types(pay_types, minutes.size)
+
+        hourly = codes == PAY_TYPE_CODES['시급제']
+        hours = minutes / 60
+        regular_hourly = np.minimum(HOURLY_REGULAR_HOURS, hours) * base
+        overtime_hourly = np.maximum(0, hours - HOURLY_REGULAR_HOURS) * base * overtime_rate
+
+        regular_pay = np.where(hourly, regular_hourly, base)
+        overtime_pay = np.where(hourly, overtime_hourly, 0.0)
+        total_pay = np.where(hourly, _round_half_exact(regular_hourly + overtime_hourly), base)
 
-        # 제목
-        title_style = ParagraphStyle(
+        logger.debug(f"급여 일괄 계산 완료: {minutes.size}건")
+        return BatchSalaryResult(
+            regular_pay=np.round(regular_pay, 2),
+            overtime_pay=np.round(overtime_pay, 2),
+            total_pay=total_pay
+        )
+    except SalaryCalculationError:
+        raise
+    except Exception as e:
+        logger.error(f"급여 일괄 계산 실패: {str(e)}")
+        raise SalaryCalculationError(f"급여 일괄 계산 중 오류가 발생했습니다: {str(e)}")
+
+# 급여 명세서 표 스타일 (명세서마다 동일하므로 한 번만 생성)
+PAYROLL_TABLE_COMMANDS = [
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 12),
+]
+
+@lru_cache(maxsize=1)
+def _payroll_styles() -> Dict:
+    """급여 명세서 스타일 생성 (프로세스당 한 번)"""
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontSize=24,
             spaceAfter=30
-        )
-        story.append(Paragraph(f"{salary_data.year}년 {salary_data.month}월 급여 명세서", title_style))
-        story.append(Spacer(1, 20))
-
-        # 직원 정보
-        employee_info = [
-            ["직원명", employee_data['name']],
-            ["직위", employee_data['position']],
-            ["부서", employee_data['department']]
-        ]
-        t = Table(employee_info, colWidths=[100, 300])
-        t.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ),
+        # 직원 정보: 첫 열이 머리글
+        'employee_table': TableStyle([
             ('BACKGROUND', (0, 0), (0, -1), colors.grey),
             ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(t)
-        story.append(Spacer(1, 20))
-
-        # 급여 정보
-        salary_info = [
-            ["구분", "금액"],
-            ["기본급", f"{salary_data.base_salary:,}원"],
-            ["야근수당", f"{salary_data.overtime_pay:,}원"],
-            ["상여금", f"{salary_data.bonus:,}원"],
-            ["공제액", f"{salary_data.deductions:,}원"],
-            ["실수령액", f"{salary_data.net_salary:,}원"]
-        ]
-        t = Table(salary_info, colWidths=[200, 200])
-        t.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ] + PAYROLL_TABLE_COMMANDS),
+        # 급여 정보: 첫 행이 머리글
+        'salary_table': TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(t)
-
-        doc.build(story)
-        logger.info(f"급여 명세서 PDF 생성 완료: {filename}")
-        return filename
+        ] + PAYROLL_TABLE_COMMANDS),
+    }
+
+def _payroll_filename(employee_data: Dict, salary_data: SalaryData) -> str:
+    return f"payroll_{employee_data['id']}_{salary_data.year}_{salary_data.month}.pdf"
+
+def _build_payroll_story(employee_data: Dict, salary_data: SalaryData) -> List:
+    """급여 명세서 한 장의 내용 구성"""
+    styles = _payroll_styles()
+    story = []
+
+    # 제목
+    story.append(Paragraph(f"{salary_data.year}년 {salary_data.month}월 급여 명세서", styles['title']))
+    story.append(Spacer(1, 20))
+
+    # 직원 정보
+    employee_info = [
+        ["직원명", employee_data['name']],
+        ["직위", employee_data['position']],
+        ["부서", employee_data['department']]
+    ]
+    t = Table(employee_info, colWidths=[100, 300])
+    t.setStyle(styles['employee_table'])
+    story.append(t)
+    story.append(Spacer(1, 20))
+
+    # 급여 정보
+    salary_info = [
+        ["구분", "금액"],
+        ["기본급", f"{salary_data.base_salary:,}원"],
+        ["야근수당", f"{salary_data.overtime_pay:,}원"],
+        ["상여금", f"{salary_data.bonus:,}원"],
+        ["공제액", f"{salary_data.deductions:,}원"],
+        ["실수령액", f"{salary_data.net_salary:,}원"]
+    ]
+    t = Table(salary_info, colWidths=[200, 200])
+    t.setStyle(styles['salary_table'])
+    story.append(t)
+    return story
+
+# [완료] 기능 3: 급여 PDF 자동 생성
+def generate_payroll_pdf(employee_data: Dict, salary_data: SalaryData, output_dir: str = '.') -> str:
+    """
+    급여 명세서 PDF를 생성한다.
+    :param employee_data: Dict, 직원 정보
+    :param salary_data: SalaryData, 급여 정보
+    :param output_dir: str, 저장 디렉토리 (기본값: 현재 디렉토리)
+    :return: str, 생성된 PDF 파일 경로
+    """
+    try:
+        filename = os.path.join(output_dir, _payroll_filename(employee_data, salary_data))
+        doc = SimpleDocTemplate(filename, pagesize=letter)
+        doc.build(_build_payroll_story(employee_data, salary_data))
+        logger.debug(f"급여 명세서 PDF 생성 완료: {filename}")
+        return os.path.normpath(filename)
     except Exception as e:
         logger.error(f"PDF 생성 실패: {str(e)}")
         raise
 
+def _render_payroll_pdfs(payslips: List[Tuple[Dict, SalaryData]]) -> bytes:
+    """여러 급여 명세서를 한 PDF(명세서당 한 쪽)로 렌더링하여 바이트로 반환"""
+    buffer = BytesIO()
+    story = []
+    for employee_data, salary_data in payslips:
+        if story:
+            story.append(PageBreak())
+        story.extend(_build_payroll_story(employee_data, salary_data))
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+def _render_payroll_entry(employee_data: Dict, salary_data: SalaryData) -> Tuple[str, bytes]:
+    return _payroll_filename(employee_data, salary_data), _render_payroll_pdfs([(employee_data, salary_data)])
+
+# 기능 3-1: 급여 명세서 일괄 생성
+def generate_payroll_pdfs(
+    payslips: List[Tuple[Dict, SalaryData]],
+    output: Literal['files', 'zip', 'merged'] = 'files',
+    output_dir: str = '.',
+    output_path: Union[str, BinaryIO, None] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Union[List[str], str, BinaryIO]:
+    """
+    여러 직원의 급여 명세서를 프로세스 풀에서 병렬로 생성한다.
+    스타일은 작업 프로세스마다 한 번만 생성되어 모든 명세서에 재사용된다.
+    :param payslips: List[Tuple[Dict, SalaryData]], (직원 정보, 급여 정보) 목록
+    :param output: str, 'files'(명세서별 파일), 'zip'(ZIP 하나), 'merged'(여러 쪽 PDF 하나)
+    :param output_dir: str, 'files' 저장 디렉토리
+    :param output_path: str 또는 바이너리 스트림, 'zip'/'merged' 출력 대상
+        (스트림을 넘기면 완료되는 명세서부터 바로 기록한다)
+    :param max_workers: int, 작업 프로세스 수 (기본값: CPU 수)
+    :param progress_callback: (완료 건수, 전체 건수)를 받는 진행률 콜백
+    :return: 'files'는 생성된 파일 경로 목록, 그 외에는 output_path
+    """
+    total = len(payslips)
+    done = 0
+
+    def report(count: int):
+        nonlocal done
+        done += count
+        if progress_callback:
+            progress_callback(done, total)
+
+    try:
+        if output == 'files':
+            os.makedirs(output_dir, exist_ok=True)
+            paths = [None] * total
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(generate_payroll_pdf, employee_data, salary_data, output_dir): i
+                    for i, (employee_data, salary_data) in enumerate(payslips)
+                }
+                for future in as_completed(futures):
+                    paths[futures[future]] = future.result()
+                    report(1)
+            result = paths
+
+        elif output == 'zip':
+            output_path = output_path or os.path.join(output_dir, 'payrolls.zip')
+            with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+                    zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                futures = [
+                    executor.submit(_render_payroll_entry, employee_data, salary_data)
+                    for employee_data, salary_data in payslips
+                ]
+                for future in as_completed(futures):
+                    filename, data = future.result()
+                    archive.writestr(filename, data)
+                    report(1)
+            result = output_path
+
+        elif output == 'merged':
+            from pypdf import PdfReader, PdfWriter
+
+            output_path = output_path or os.path.join(output_dir, 'payrolls.pdf')
+            # 연속 구간 단위로 나누어 렌더링한 뒤 순서대로 병합
+            workers = max_workers or os.cpu_count() or 1
+            size = max(1, -(-total // (workers * 4)))
+            chunks = [payslips[i:i + size] for i in range(0, total, size)]
+            writer = PdfWriter()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for chunk, data in zip(chunks, executor.map(_render_payroll_pdfs, chunks)):
+                    writer.append(PdfReader(BytesIO(data)))
+                    report(len(chunk))
+            writer.write(output_path)
+            result = output_path
+
+        else:
+            raise ValueError(f"지원되지 않는 출력 형식입니다: {output}")
+
+        logger.info(f"급여 명세서 일괄 생성 완료: {total}건 ({output})")
+        return result
+    except Exception as e:
+        logger.error(f"급여 명세서 일괄 생성 실패: {str(e)}")
+        raise
+
 # [완료] 기능 4: 급여일 알림 발송
 def send_salary_notification(employee_data: Dict, salary_data: SalaryData):
     """
@@ -233,6 +528,23 @@ class TestSalarySystem(unittest.TestCase):
         with self.assertRaises(WorkDurationError):
             calculate_work_duration("18:00:00", "09:00:00")
 
+    def test_calculate_work_durations(self):
+        result = calculate_work_durations(
+            ["09:00:00", "09:00:00", "9:30:00", "25:00:00", None, "18:00:00"],
+            ["18:00:00", "18:00:59", "18:00:00", "18:00:00", "18:00:00", "09:00:00"]
+        )
+        self.assertEqual(result.minutes.tolist(), [540, 540, 510, 0, 0, 0])
+        self.assertEqual(
+            result.error_flags.tolist(),
+            [0, 0, 0, INVALID_CHECK_IN, INVALID_CHECK_IN, CHECK_OUT_BEFORE_CHECK_IN]
+        )
+        self.assertEqual(
+            result.minutes[~result.has_errors].tolist(),
+            [calculate_work_duration("09:00:00", "18:00:00"),
+             calculate_work_duration("09:00:00", "18:00:59"),
+             calculate_work_duration("9:30:00", "18:00:00")]
+        )
+
     def test_calculate_salary(self):
         # 시급제
         self.assertEqual(calculate_salary(540, "시급제", 10000), 90000)
@@ -244,5 +556,53 @@ class TestSalarySystem(unittest.TestCase):
         with self.assertRaises(SalaryCalculationError):
             calculate_salary(540, "일급제", 10000)
 
+    def test_calculate_salary_batch(self):
+        rng = np.random.default_rng(0)
+        minutes = rng.integers(0, 900, size=2000)
+        pay_types = rng.choice(list(PAY_TYPE_CODES), size=2000)
+        base_pay = rng.integers(9000, 20000, size=2000).astype(float) + rng.random(2000)
+        result = calculate_salary_batch(minutes, pay_types, base_pay)
+        expected = [
+            calculate_salary(int(m), str(p), float(b))
+            for m, p, b in zip(minutes, pay_types, base_pay)
+        ]
+        self.assertEqual(result.total_pay.tolist(), expected)
+        # 야근 포함
+        result = calculate_salary_batch([540, 600], "시급제", 10000)
+        self.assertEqual(result.total_pay.tolist(), [95000, 110000])
+        self.assertEqual(result.overtime_pay.tolist(), [15000, 30000])
+        # 예외 케이스
+        with self.assertRaises(SalaryCalculationError):
+            calculate_salary_batch([540, 540], ["시급제", "일급제"], 10000)
+
+    def test_generate_payroll_pdfs(self):
+        payslips = [
+            ({'id': f'E{i}', 'name': f'직원{i}', 'position': '사원', 'department': '주방'},
+             SalaryData(f'E{i}', 2024, 3, 2000000, 100000, 0, 50000, 2050000))
+            for i in range(2)
+        ]
+        filenames = {'payroll_E0_2024_3.pdf', 'payroll_E1_2024_3.pdf'}
+        progress = []
+        with tempfile.TemporaryDirectory() as output_dir:
+            # 명세서별 파일 (입력 순서대로 경로 반환)
+            paths = generate_payroll_pdfs(payslips, 'files', output_dir, max_workers=2,
+                                          progress_callback=lambda done, total: progress.append((done, total)))
+            self.assertEqual([os.path.basename(path) for path in paths], sorted(filenames))
+            self.assertEqual(set(os.listdir(output_dir)), filenames)
+            self.assertEqual(progress[-1], (2, 2))
+
+            # ZIP 하나
+            zip_path = generate_payroll_pdfs(payslips, 'zip', output_dir, max_workers=2)
+            with zipfile.ZipFile(zip_path) as archive:
+                self.assertEqual(set(archive.namelist()), filenames)
+
+            # 여러 쪽 PDF 하나 (명세서당 한 쪽)
+            from pypdf import PdfReader
+            merged_path = generate_payroll_pdfs(payslips, 'merged', output_dir, max_workers=2)
+            self.assertEqual(len(PdfReader(merged_path).pages), 2)
+
+        with self.assertRaises(ValueError):
+            generate_payroll_pdfs(payslips, 'html')
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,357 @@
+import os
+import re
+import sys
+import time
+import logging
+import importlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 실행 계획을 확인할 SQL 구문
+EXPLAINABLE_VERBS = ('SELECT', 'UPDATE', 'DELETE')
+
+_PLAN_RE = re.compile(r'^(SCAN|SEARCH)\s+(?:TABLE\s+)?(\w+)(?:\s+AS\s+(\w+))?(.*)$')
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|UPDATE)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?', re.IGNORECASE)
+_EQUALITY_RE = re.compile(r'"?(\w+)"?\."?(\w+)"?\s*(?:=|==|\bIN\b|\bIS\b(?!\s+NOT))', re.IGNORECASE)
+_JOIN_RHS_RE = re.compile(r'=\s*"?(\w+)"?\."?(\w+)"?')
+_RANGE_RE = re.compile(r'"?(\w+)"?\."?(\w+)"?\s*(?:>=|<=|>|<|\bBETWEEN\b|\bLIKE\b)', re.IGNORECASE)
+_ORDER_BY_RE = re.compile(r'\bORDER BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|$)', re.IGNORECASE)
+_COLUMN_RE = re.compile(r'"?(\w+)"?\."?(\w+)"?')
+_SQL_KEYWORDS = {'AS', 'ON', 'WHERE', 'JOIN', 'LEFT', 'INNER', 'OUTER', 'GROUP', 'ORDER', 'LIMIT', 'SET'}
+
+@dataclass
+class CapturedQuery:
+    """수집된 SQL 구문 (같은 구문은 실행 횟수와 누적 시간만 더한다)"""
+    statement: str
+    parameters: object
+    count: int = 0
+    total_ms: float = 0.0
+
+@dataclass
+class IndexSuggestion:
+    """인덱스 제안"""
+    table: str
+    columns: Tuple[str, ...]
+    reason: str
+    query_count: int = 0
+    total_ms: float = 0.0
+    sample_sql: str = ''
+
+    @property
+    def name(self) -> str:
+        return f"ix_{self.table}_{'_'.join(self.columns)}"
+
+@dataclass
+class ScanReport:
+    """전체 스캔이 발생한 쿼리"""
+    table: str
+    plan: List[str]
+    statement: str
+    query_count: int
+    total_ms: float
+    suggestion: Optional[IndexSuggestion] = None
+    filters: Dict[str, List[str]] = field(default_factory=dict)
+
+class QueryCapture:
+    """
+    SQL 수집기
+
+    엔진(지정하지 않으면 모든 엔진)의 커서 이벤트를 구독하여 실행된 SELECT/UPDATE/DELETE 구문과
+    첫 실행의 파라미터, 실행 횟수, 누적 실행 시간을 기록한다.
+    """
+
+    def __init__(self, engine=None):
+        self.target = engine if engine is not None else Engine
+        self.queries: Dict[str, CapturedQuery] = {}
+        self._started = {}
+
+    def __enter__(self):
+        event.listen(self.target, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(self.target, 'after_cursor_execute', self._after_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.target, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(self.target, 'after_cursor_execute', self._after_cursor_execute)
+        return False
+
+    @staticmethod
+    def _is_explainable(statement):
+        words = statement.lstrip().split(None, 1)
+        return bool(words) and words[0].upper() in EXPLAINABLE_VERBS
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._is_explainable(statement):
+            self._started[id(cursor)] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = self._started.pop(id(cursor), None)
+        if started is None:
+            return
+        query = self.queries.get(statement)
+        if query is None:
+            if executemany and parameters:
+                parameters = parameters[0]
+            query = self.queries[statement] = CapturedQuery(statement, parameters)
+        query.count += 1
+        query.total_ms += (time.perf_counter() - started) * 1000
+
+def _table_aliases(statement: str) -> Dict[str, str]:
+    """별칭 -> 테이블 이름 (테이블 이름 자신도 포함)"""
+    aliases = {}
+    for table, alias in _TABLE_RE.findall(statement):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+def extract_filters(statement: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    SQL 구문에서 테이블별 조건 컬럼 추출
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: 테이블(또는 별칭)별 equality, range, order 컬럼 목록
+    """
+    statement = ' '.join(statement.split())
+    filters: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(kind, alias, column):
+        columns = filters.setdefault(alias, {'equality': [], 'range': [], 'order': []})[kind]
+        if column not in columns:
+            columns.append(column)
+
+    order_match = _ORDER_BY_RE.search(statement)
+    predicates = statement[:order_match.start()] if order_match else statement
+    for alias, column in _EQUALITY_RE.findall(predicates):
+        add('equality', alias, column)
+    for alias, column in _JOIN_RHS_RE.findall(predicates):
+        add('equality', alias, column)
+    for alias, column in _RANGE_RE.findall(predicates):
+        add('range', alias, column)
+    if order_match:
+        for alias, column in _COLUMN_RE.findall(order_match.group(1)):
+            add('order', alias, column)
+    return filters
+
+def suggest_columns(table_filters: Dict[str, List[str]]) -> Tuple[str, ...]:
+    """
+    복합 인덱스 컬럼 순서 제안
+
+    동등 조건 컬럼을 먼저, 범위 조건 컬럼은 하나만 그 뒤에 둔다.
+    범위 조건이 없으면 정렬 컬럼을 붙여 정렬 단계를 인덱스로 대신한다.
+    """
+    columns = list(table_filters['equality'])
+    ranges = [c for c in table_filters['range'] if c not in columns]
+    if ranges:
+        columns.append(ranges[0])
+    else:
+        columns.extend(c for c in table_filters['order'] if c not in columns)
+    return tuple(columns)
+
+class IndexAdvisor:
+    """
+    인덱스 제안기 (SQLite)
+
+    수집한 쿼리마다 EXPLAIN QUERY PLAN을 실행하여 전체 테이블 스캔과 임시 정렬을 찾고,
+    조건 컬럼으로 복합 인덱스를 제안한다. 기존 인덱스의 앞부분과 겹치는 제안은 제외한다.
+    """
+
+    def __init__(self, engine):
+        if engine.dialect.name != 'sqlite':
+            raise ValueError("인덱스 제안은 SQLite 데이터베이스에서만 지원합니다.")
+        self.engine = engine
+        self._indexes = None
+
+    def existing_indexes(self) -> Dict[str, List[Tuple[str, ...]]]:
+        """테이블별 기존 인덱스 컬럼 목록 (기본 키 포함)"""
+        if self._indexes is None:
+            inspector = inspect(self.engine)
+            self._indexes = {}
+            for table in inspector.get_table_names():
+                indexes = [tuple(inspector.get_pk_constraint(table)['constrained_columns'])]
+                indexes += [tuple(ix['column_names']) for ix in inspector.get_indexes(table)]
+                indexes += [tuple(uq['column_names']) for uq in inspector.get_unique_constraints(table)]
+                self._indexes[table] = [ix for ix in indexes if ix]
+        return self._indexes
+
+    def _is_covered(self, table: str, columns: Tuple[str, ...]) -> bool:
+        """기존 인덱스가 제안 컬럼을 앞부분에 이미 포함하는지"""
+        return any(ix[:len(columns)] == columns for ix in self.existing_indexes().get(table, []))
+
+    def explain(self, statement: str, parameters=None) -> List[str]:
+        """EXPLAIN QUERY PLAN 결과 (detail 열)"""
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+        return [row[-1] for row in rows]
+
+    def analyze(self, queries: List[CapturedQuery]) -> Tuple[List[ScanReport], List[IndexSuggestion]]:
+        """
+        수집한 쿼리 분석
+
+        Returns:
+            Tuple[List[ScanReport], List[IndexSuggestion]]: 전체 스캔 보고 목록과
+                누적 실행 시간 순 인덱스 제안 목록
+        """
+        reports = []
+        suggestions: Dict[Tuple[str, Tuple[str, ...]], IndexSuggestion] = {}
+
+        for query in queries:
+            try:
+                plan = self.explain(query.statement, query.parameters)
+            except Exception as e:
+                logger.error(f"실행 계획 조회 중 오류 발생: {str(e)}")
+                continue
+
+            aliases = _table_aliases(query.statement)
+            filters = extract_filters(query.statement)
+            temp_sort = any('TEMP B-TREE FOR ORDER BY' in detail for detail in plan)
+
+            for detail in plan:
+                match = _PLAN_RE.match(detail)
+                if not match or match.group(1) != 'SCAN' or 'USING' in match.group(4):
+                    continue
+                alias = match.group(3) or match.group(2)
+                table = aliases.get(alias, match.group(2))
+                table_filters = filters.get(alias) or filters.get(table)
+
+                report = ScanReport(
+                    table=table, plan=plan, statement=query.statement,
+                    query_count=query.count, total_ms=query.total_ms,
+                    filters=table_filters or {}
+                )
+                reports.append(report)
+                if not table_filters:
+                    continue
+
+                if not temp_sort:
+                    table_filters = dict(table_filters, order=[])
+                columns = suggest_columns(table_filters)
+                if not columns or self._is_covered(table, columns):
+                    continue
+
+                key = (table, columns)
+                suggestion = suggestions.get(key)
+                if suggestion is None:
+                    suggestion = suggestions[key] = IndexSuggestion(
+                        table=table, columns=columns, reason=detail,
+                        sample_sql=' '.join(query.statement.split())
+                    )
+                suggestion.query_count += query.count
+                suggestion.total_ms += query.total_ms
+                report.suggestion = suggestion
+
+        # 한 제안의 컬럼이 다른 제안의 앞부분이면 긴 쪽만 남긴다
+        merged = []
+        for suggestion in sorted(suggestions.values(), key=lambda s: -len(s.columns)):
+            wider = next((m for m in merged if m.table == suggestion.table
+                          and m.columns[:len(suggestion.columns)] == suggestion.columns), None)
+            if wider:
+                wider.query_count += suggestion.query_count
+                wider.total_ms += suggestion.total_ms
+            else:
+                merged.append(suggestion)
+        merged.sort(key=lambda s: -s.total_ms)
+        return reports, merged
+
+def format_report(reports: List[ScanReport], suggestions: List[IndexSuggestion]) -> str:
+    """분석 결과를 읽기 쉬운 문자열로 변환"""
+    lines = [f"전체 스캔 쿼리 {len(reports)}건, 인덱스 제안 {len(suggestions)}건", ""]
+    for report in sorted(reports, key=lambda r: -r.total_ms):
+        lines.append(f"[SCAN] {report.table} ({report.query_count}회, {report.total_ms:.1f}ms)")
+        lines.append(f"  SQL: {' '.join(report.statement.split())[:200]}")
+        lines.append(f"  계획: {' / '.join(report.plan)}")
+        if report.suggestion:
+            lines.append(f"  제안: {report.suggestion.name} ({', '.join(report.suggestion.columns)})")
+        elif not report.filters:
+            lines.append("  제안: 없음 (조건 없는 전체 조회)")
+    lines.append("")
+    for suggestion in suggestions:
+        lines.append(
+            f"CREATE INDEX {suggestion.name} ON {suggestion.table} ({', '.join(suggestion.columns)});"
+            f"  -- {suggestion.query_count}회, {suggestion.total_ms:.1f}ms"
+        )
+    return "\n".join(lines)
+
+def render_migration_ops(suggestions: List[IndexSuggestion]) -> Tuple[str, str]:
+    """Alembic upgrade/downgrade 본문 생성"""
+    upgrade = [
+        f"op.create_index({s.name!r}, {s.table!r}, {list(s.columns)!r}, unique=False)"
+        for s in suggestions
+    ]
+    downgrade = [
+        f"op.drop_index({s.name!r}, table_name={s.table!r})"
+        for s in reversed(suggestions)
+    ]
+    return "\n    ".join(upgrade) or "pass", "\n    ".join(downgrade) or "pass"
+
+def write_migration(suggestions: List[IndexSuggestion], message: str = 'add suggested indexes',
+                    alembic_ini: str = 'alembic.ini') -> Optional[str]:
+    """
+    채택된 인덱스 제안으로 Alembic 마이그레이션 파일 생성
+
+    Returns:
+        Optional[str]: 생성된 마이그레이션 파일 경로 (제안이 없으면 None)
+    """
+    if not suggestions:
+        logger.info("생성할 인덱스가 없습니다.")
+        return None
+
+    cfg = Config(alembic_ini)
+    versions_dir = os.path.join(cfg.get_main_option('script_location'), 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+
+    script = command.revision(cfg, message=message)
+    upgrade, downgrade = render_migration_ops(suggestions)
+    with open(script.path, encoding='utf-8') as f:
+        source = f.read()
+    source = source.replace("def upgrade():\n    pass", f"def upgrade():\n    {upgrade}", 1)
+    source = source.replace("def downgrade():\n    pass", f"def downgrade():\n    {downgrade}", 1)
+    with open(script.path, 'w', encoding='utf-8') as f:
+        f.write(source)
+
+    logger.info(f"인덱스 마이그레이션 생성 완료: {script.path}")
+    return script.path
+
+def _load_workload(target: str):
+    """'모듈:함수' 형식의 벤치마크 함수 로드"""
+    module_name, _, func_name = target.partition(':')
+    return getattr(importlib.import_module(module_name), func_name or 'main')
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='쿼리 로그 기반 인덱스 제안')
+    parser.add_argument('workload', help="실행할 벤치마크 함수 ('모듈:함수', 함수는 engine을 인자로 받는다)")
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///restaurant.db'))
+    parser.add_argument('--accept', action='append', default=[],
+                        help="채택할 인덱스 이름 (여러 번 지정 가능, 'all'이면 전체)")
+    parser.add_argument('--message', default='add suggested indexes', help='마이그레이션 메시지')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    engine = create_engine(args.database_url)
+    workload = _load_workload(args.workload)
+
+    with QueryCapture(engine) as capture:
+        workload(engine)
+
+    reports, suggestions = IndexAdvisor(engine).analyze(list(capture.queries.values()))
+    print(format_report(reports, suggestions))
+
+    if args.accept:
+        accepted = suggestions if 'all' in args.accept else [
+            s for s in suggestions if s.name in args.accept
+        ]
+        write_migration(accepted, args.message)
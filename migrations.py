@@ -1,11 +1,22 @@
 import os
+import re
+import sys
+import time
+import shutil
+import sqlite3
 import logging
+import tempfile
 from datetime import datetime
+from typing import Dict, List, Optional
 from alembic import command
 from alembic.config import Config
 from alembic.script import ScriptDirectory
 from alembic.runtime.migration import MigrationContext
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    create_engine, text, event, inspect, MetaData, Table, Column,
+    Integer, String, Float, Boolean, DateTime, Text
+)
+from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -15,13 +26,179 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 마이그레이션 실행 이력 테이블
+history_metadata = MetaData()
+migration_history = Table(
+    'migration_history', history_metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('revision', String(64), nullable=False),
+    Column('direction', String(10), nullable=False),  # upgrade, downgrade
+    Column('started_at', DateTime, nullable=False),
+    Column('duration_ms', Float, nullable=False),
+    Column('rows_touched', Integer, default=0),
+    Column('lock_ms', Float, default=0.0),
+    Column('estimated_ms', Float),  # 드라이런 시 운영 DB 기준 예상 소요 시간
+    Column('dry_run', Boolean, default=False),
+    Column('status', String(20), nullable=False),  # success, failed
+    Column('error', Text)
+)
+
+# 테이블 잠금을 유발하는 SQL 구문
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'ALTER', 'DROP')
+
+# 쓰기 구문이 대상으로 하는 테이블 이름
+WRITE_TARGET = re.compile(
+    r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM'
+    r'|ALTER\s+TABLE|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?'
+    r'|CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?\S+\s+ON)\s+["`\[]?(\w+)',
+    re.IGNORECASE
+)
+
+# SQLite 배치 모드(테이블 재생성)에서 Alembic이 사용하는 임시 테이블 접두사
+BATCH_TABLE_PREFIX = '_alembic_tmp_'
+
+class MigrationTimer:
+    """
+    마이그레이션 한 단계의 실행 통계 수집기
+
+    실행 중인 모든 엔진의 커서 이벤트를 구독하여 소요 시간, 변경된 행 수,
+    잠금 시간(첫 쓰기 구문부터 단계 종료까지)과 쓰기 대상 테이블을 측정한다.
+    """
+
+    def __init__(self):
+        self.rows_touched = 0
+        self.tables = set()
+        self.duration_ms = 0.0
+        self.lock_ms = 0.0
+        self._started = None
+        self._first_write = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        finished = time.perf_counter()
+        self.duration_ms = (finished - self._started) * 1000
+        if self._first_write is not None:
+            self.lock_ms = (finished - self._first_write) * 1000
+        return False
+
+    @staticmethod
+    def _is_write(statement):
+        words = statement.split(None, 1)
+        if not words or 'alembic_version' in statement:
+            return False
+        return words[0].upper() in WRITE_VERBS
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not self._is_write(statement):
+            return
+        if self._first_write is None:
+            self._first_write = time.perf_counter()
+        match = WRITE_TARGET.match(statement)
+        if match:
+            table = match.group(1)
+            if table.startswith(BATCH_TABLE_PREFIX):
+                table = table[len(BATCH_TABLE_PREFIX):]
+            self.tables.add(table)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._is_write(statement) and cursor.rowcount and cursor.rowcount > 0:
+            self.rows_touched += cursor.rowcount
+
 class MigrationManager:
     def __init__(self):
         self.db_url = os.getenv('DATABASE_URL', 'sqlite:///restaurant.db')
         self.engine = create_engine(self.db_url)
         self.alembic_cfg = Config('alembic.ini')
         self.alembic_cfg.set_main_option('sqlalchemy.url', self.db_url)
-        
+
+    def _ensure_history_table(self):
+        """마이그레이션 이력 테이블 생성"""
+        history_metadata.create_all(self.engine, tables=[migration_history])
+
+    def _record_history(self, records: List[Dict]):
+        """마이그레이션 실행 이력 저장 (이력 테이블에 없는 키는 제외)"""
+        if not records:
+            return
+        self._ensure_history_table()
+        with self.engine.begin() as conn:
+            conn.execute(migration_history.insert(), [
+                {key: value for key, value in record.items() if key in migration_history.c}
+                for record in records
+            ])
+
+    def _pending_revisions(self, alembic_cfg, engine, revision):
+        """현재 버전부터 목표 버전까지 적용할 리비전 목록 (적용 순서)"""
+        script = ScriptDirectory.from_config(alembic_cfg)
+        with engine.connect() as conn:
+            current_rev = MigrationContext.configure(conn).get_current_revision()
+        revisions = list(script.iterate_revisions(revision, current_rev or 'base'))
+        return [rev.revision for rev in reversed(revisions)]
+
+    def _downgrade_steps(self, alembic_cfg, engine, revision):
+        """
+        현재 버전부터 목표 버전까지 되돌릴 단계 목록 (실행 순서)
+
+        Returns:
+            List[tuple]: (되돌릴 리비전, 그 단계의 downgrade 목표) 목록
+        """
+        script = ScriptDirectory.from_config(alembic_cfg)
+        with engine.connect() as conn:
+            current_rev = MigrationContext.configure(conn).get_current_revision()
+        if current_rev is None:
+            return []
+        steps = []
+        for rev in script.iterate_revisions(current_rev, revision):
+            if rev.revision == revision:
+                continue
+            if rev.down_revision is None:
+                target = 'base'
+            elif isinstance(rev.down_revision, tuple):
+                # 병합 리비전은 상대 지정으로 한 단계만 되돌린다
+                target = f'{rev.revision}-1'
+            else:
+                target = rev.down_revision
+            steps.append((rev.revision, target))
+        return steps
+
+    def _run_step(self, func, alembic_cfg, revision, direction, records, dry_run=False, target=None):
+        """마이그레이션 한 단계를 실행하고 실행 통계를 records에 추가 (실패 시에도 기록)"""
+        record = {
+            'revision': revision,
+            'direction': direction,
+            'started_at': datetime.utcnow(),
+            'dry_run': dry_run,
+            'status': 'success',
+            'error': None
+        }
+        timer = MigrationTimer()
+        try:
+            with timer:
+                func(alembic_cfg, target or revision)
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+            raise
+        finally:
+            record.update(
+                duration_ms=round(timer.duration_ms, 3),
+                rows_touched=timer.rows_touched,
+                lock_ms=round(timer.lock_ms, 3),
+                tables=sorted(timer.tables)
+            )
+            records.append(record)
+            logger.info(
+                f"마이그레이션 {revision} {direction}: {record['duration_ms']}ms, "
+                f"{timer.rows_touched}행, 잠금 {record['lock_ms']}ms"
+            )
+        return record
+
     def init_migrations(self):
         """마이그레이션 초기화"""
         try:
@@ -44,22 +221,32 @@ class MigrationManager:
             raise
             
     def upgrade(self, revision='head'):
-        """마이그레이션 적용"""
+        """마이그레이션 적용 (리비전별 소요 시간, 변경 행 수, 잠금 시간 기록)"""
+        records = []
         try:
-            command.upgrade(self.alembic_cfg, revision)
+            for step in self._pending_revisions(self.alembic_cfg, self.engine, revision):
+                self._run_step(command.upgrade, self.alembic_cfg, step, 'upgrade', records)
             logger.info(f"마이그레이션이 {revision}까지 적용되었습니다.")
+            return records
         except Exception as e:
             logger.error(f"마이그레이션 적용 중 오류 발생: {str(e)}")
             raise
-            
+        finally:
+            self._record_history(records)
+
     def downgrade(self, revision):
-        """마이그레이션 롤백"""
+        """마이그레이션 롤백 (리비전별로 한 단계씩 되돌리며 기록)"""
+        records = []
         try:
-            command.downgrade(self.alembic_cfg, revision)
+            for step, target in self._downgrade_steps(self.alembic_cfg, self.engine, revision):
+                self._run_step(command.downgrade, self.alembic_cfg, step, 'downgrade', records, target=target)
             logger.info(f"마이그레이션이 {revision}으로 롤백되었습니다.")
+            return records
         except Exception as e:
             logger.error(f"마이그레이션 롤백 중 오류 발생: {str(e)}")
             raise
+        finally:
+            self._record_history(records)
             
     def current_revision(self):
         """현재 마이그레이션 버전 확인"""
@@ -104,7 +291,7 @@ class MigrationManager:
             
             with self.engine.connect() as conn:
                 with open(backup_file, 'w') as f:
-                    for table in self.engine.table_names():
+                    for table in inspect(self.engine).get_table_names():
                         result = conn.execute(text(f'SELECT * FROM {table}'))
                         f.write(f'-- Table: {table}\n')
                         for row in result:
@@ -116,6 +303,145 @@ class MigrationManager:
             logger.error(f"데이터베이스 백업 중 오류 발생: {str(e)}")
             raise
 
+    def _create_sample_db(self, sample_path: str, sample_rows: int) -> Dict[str, Dict[str, int]]:
+        """
+        운영 SQLite DB의 스키마와 테이블별 일부 행만 복사한 샘플 DB 생성
+
+        Returns:
+            Dict[str, Dict[str, int]]: 테이블별 전체 행 수와 샘플 행 수
+        """
+        source_path = self.engine.url.database
+        source = sqlite3.connect(source_path)
+        try:
+            schema = source.execute(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"
+            ).fetchall()
+            tables = [name for obj_type, name, _ in schema if obj_type == 'table']
+
+            sample = sqlite3.connect(sample_path)
+            try:
+                for obj_type, _, sql in schema:
+                    if obj_type == 'table':
+                        sample.execute(sql)
+                sample.commit()
+            finally:
+                sample.close()
+
+            # 인덱스/트리거는 행 복사 후 생성하여 복사 비용을 줄인다
+            counts = {}
+            source.execute("ATTACH DATABASE ? AS sample", (sample_path,))
+            for table in tables:
+                total = source.execute(f'SELECT COUNT(*) FROM main."{table}"').fetchone()[0]
+                source.execute(
+                    f'INSERT INTO sample."{table}" SELECT * FROM main."{table}" LIMIT ?',
+                    (sample_rows,)
+                )
+                counts[table] = {'total': total, 'sampled': min(total, sample_rows)}
+            source.commit()
+            source.execute("DETACH DATABASE sample")
+        finally:
+            source.close()
+
+        sample = sqlite3.connect(sample_path)
+        try:
+            for obj_type, _, sql in schema:
+                if obj_type in ('index', 'trigger', 'view'):
+                    sample.execute(sql)
+            sample.commit()
+        finally:
+            sample.close()
+        return counts
+
+    def dry_run(self, revision='head', sample_rows: int = 1000) -> Dict:
+        """
+        샘플 DB에서 마이그레이션을 실행하여 운영 DB 기준 소요 시간 추정
+
+        테이블별로 최대 sample_rows 행을 복사한 임시 DB에 마이그레이션을 적용하고,
+        각 리비전이 쓰기를 실행한 테이블들의 전체 행 수 / 샘플 행 수 비율로
+        그 리비전의 잠금 구간(데이터 처리 시간)을 선형 외삽한다.
+        스크립트 로드, 연결 등 잠금 이전의 고정 비용은 그대로 더한다.
+        마이그레이션은 샘플 DB 연결로만 실행되며 운영 DB는 변경하지 않는다.
+
+        Args:
+            revision (str): 목표 리비전 (기본값: 'head')
+            sample_rows (int): 테이블별 샘플 행 수
+
+        Returns:
+            Dict: 리비전별 측정/예상 시간과 테이블별 행 수
+        """
+        if self.engine.url.get_backend_name() != 'sqlite':
+            raise ValueError("드라이런은 SQLite 데이터베이스에서만 지원됩니다.")
+
+        sample_dir = tempfile.mkdtemp(prefix='migration_dry_run_')
+        records = []
+        try:
+            sample_path = os.path.join(sample_dir, 'sample.db')
+            counts = self._create_sample_db(sample_path, sample_rows)
+
+            sample_url = f'sqlite:///{sample_path}'
+            sample_cfg = Config(self.alembic_cfg.config_file_name)
+            for key, value in self.alembic_cfg.get_section(self.alembic_cfg.config_ini_section, {}).items():
+                sample_cfg.set_main_option(key, value.replace('%', '%%'))
+            sample_cfg.set_main_option('sqlalchemy.url', sample_url)
+            sample_engine = create_engine(sample_url)
+
+            def upgrade_sample(cfg, step):
+                # env.py가 샘플 DB 연결로 실행하도록 연결을 넘긴다
+                with sample_engine.begin() as connection:
+                    cfg.attributes['connection'] = connection
+                    try:
+                        command.upgrade(cfg, step)
+                    finally:
+                        cfg.attributes.pop('connection', None)
+
+            try:
+                steps = self._pending_revisions(sample_cfg, sample_engine, revision)
+                for step in steps:
+                    self._run_step(upgrade_sample, sample_cfg, step, 'upgrade', records, dry_run=True)
+            finally:
+                sample_engine.dispose()
+
+            for record in records:
+                touched = [counts[table] for table in record['tables'] if table in counts]
+                sampled = sum(c['sampled'] for c in touched)
+                record['scale'] = sum(c['total'] for c in touched) / sampled if sampled else 1.0
+                fixed_ms = record['duration_ms'] - record['lock_ms']
+                record['estimated_lock_ms'] = round(record['lock_ms'] * record['scale'], 3)
+                record['estimated_ms'] = round(fixed_ms + record['estimated_lock_ms'], 3)
+
+            logger.info(
+                f"드라이런 완료: {len(records)}개 리비전, "
+                f"예상 소요 시간 {sum(r['estimated_ms'] for r in records):.1f}ms"
+            )
+            return {
+                'revisions': records,
+                'tables': counts,
+                'estimated_total_ms': round(sum(r['estimated_ms'] for r in records), 3),
+                'estimated_lock_ms': round(sum(r['estimated_lock_ms'] for r in records), 3)
+            }
+        except Exception as e:
+            logger.error(f"마이그레이션 드라이런 중 오류 발생: {str(e)}")
+            raise
+        finally:
+            self._record_history(records)
+            shutil.rmtree(sample_dir, ignore_errors=True)
+
+    def run_history(self, limit: int = 50) -> List[Dict]:
+        """마이그레이션 실행 이력 조회 (최신순)"""
+        try:
+            self._ensure_history_table()
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    migration_history.select()
+                    .order_by(migration_history.c.id.desc())
+                    .limit(limit)
+                ).mappings().all()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"마이그레이션 실행 이력 조회 중 오류 발생: {str(e)}")
+            raise
+
 # 마이그레이션 관리자 인스턴스 생성
 migration_manager = MigrationManager()
 
@@ -124,7 +450,10 @@ if __name__ == '__main__':
     migration_manager.init_migrations()
     
     # 보류 중인 마이그레이션이 있는지 확인
-    if migration_manager.check_pending():
+    if '--dry-run' in sys.argv:
+        estimate = migration_manager.dry_run()
+        logger.info(f"예상 소요 시간: {estimate['estimated_total_ms']}ms, 예상 잠금 시간: {estimate['estimated_lock_ms']}ms")
+    elif migration_manager.check_pending():
         # 데이터베이스 백업
         backup_file = migration_manager.backup_before_migration()
         logger.info(f"마이그레이션 전 백업이 생성되었습니다: {backup_file}")
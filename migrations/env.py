@@ -3,9 +3,10 @@ from __future__ import with_statement
 import logging
 from logging.config import fileConfig
 
-from flask import current_app
+from flask import current_app, has_app_context
 
 from alembic import context
+from sqlalchemy import engine_from_config, pool
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -20,11 +21,24 @@ logger = logging.getLogger('alembic.env')
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-config.set_main_option(
-    'sqlalchemy.url',
-    str(current_app.extensions['migrate'].db.get_engine().url).replace(
-        '%', '%%'))
-target_metadata = current_app.extensions['migrate'].db.metadata
+# 앱 컨텍스트 밖(MigrationManager, 드라이런 등)에서는 Flask-Migrate 확장 없이 실행된다
+migrate = current_app.extensions['migrate'] if has_app_context() else None
+
+# 호출한 쪽이 연결이나 URL을 지정하지 않은 경우에만 앱 엔진을 사용
+use_app_engine = (
+    migrate is not None
+    and 'connection' not in config.attributes
+    and not config.get_main_option('sqlalchemy.url')
+)
+if use_app_engine:
+    config.set_main_option(
+        'sqlalchemy.url',
+        str(migrate.db.get_engine().url).replace('%', '%%'))
+target_metadata = migrate.db.metadata if migrate is not None else None
+
+# MigrationManager가 관리하는 실행 이력 테이블은 autogenerate 대상에서 제외
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == 'table' and name == 'migration_history')
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -46,7 +60,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True
+        url=url, target_metadata=target_metadata, literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -71,19 +86,35 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
-    connectable = current_app.extensions['migrate'].db.get_engine()
-
-    with connectable.connect() as connection:
+    def run_with(connection):
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
             process_revision_directives=process_revision_directives,
-            **current_app.extensions['migrate'].configure_args
+            include_object=include_object,
+            **(migrate.configure_args if migrate is not None else {})
         )
 
         with context.begin_transaction():
             context.run_migrations()
 
+    # 호출한 쪽이 넘긴 연결 (트랜잭션과 커밋은 호출한 쪽이 관리)
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        run_with(connection)
+        return
+
+    if use_app_engine:
+        connectable = migrate.db.get_engine()
+    else:
+        connectable = engine_from_config(
+            config.get_section(config.config_ini_section, {}),
+            prefix='sqlalchemy.',
+            poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        run_with(connection)
+
 
 if context.is_offline_mode():
     run_migrations_offline()
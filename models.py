@@ -1,6 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
+from sqlalchemy import event, select, update, func, bindparam, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 db = SQLAlchemy()
 
@@ -42,6 +45,9 @@ class Order(db.Model):
     order_date = db.Column(db.DateTime, nullable=False)
     delivery_date = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(20), default='pending')
+    # 품목 수와 합계 (OrderItem 변경 시 자동 갱신, 목록 조회에서 품목을 다시 조회하지 않기 위함)
+    item_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_amount = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -54,7 +60,7 @@ class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     item_name = db.Column(db.String(100), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     unit_price = db.Column(db.Float, nullable=False)
@@ -77,4 +83,87 @@ class Schedule(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계 정의
-    user = db.relationship('User', back_populates='schedules') 
\ No newline at end of file
+    user = db.relationship('User', back_populates='schedules') 
+
+def order_totals_query(order_ids=None):
+    """주문별 품목 수와 합계 집계 쿼리 (order_ids를 지정하면 해당 주문만)"""
+    query = select(
+        OrderItem.order_id,
+        func.count(OrderItem.id),
+        func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0.0)
+    ).group_by(OrderItem.order_id)
+    if order_ids is not None:
+        query = query.where(OrderItem.order_id.in_(order_ids))
+    return query
+
+def refresh_order_totals(connection, order_ids, session=None):
+    """
+    주문의 item_count, total_amount를 order_items 기준으로 다시 계산하여 저장
+
+    집계 1회와 UPDATE 1회(executemany)로 처리한다. session을 지정하면
+    세션에 로드된 주문 객체의 값도 함께 맞춘다.
+
+    Returns:
+        Dict[int, tuple]: 주문 ID별 (품목 수, 합계)
+    """
+    order_ids = list(order_ids)
+    if not order_ids:
+        return {}
+    totals = {order_id: (0, 0.0) for order_id in order_ids}
+    for order_id, count, total in connection.execute(order_totals_query(order_ids)):
+        totals[order_id] = (count, float(total))
+
+    orders = Order.__table__
+    connection.execute(
+        update(orders)
+        .where(orders.c.id == bindparam('b_id'))
+        .values(item_count=bindparam('b_count'), total_amount=bindparam('b_total')),
+        [dict(b_id=order_id, b_count=count, b_total=total) for order_id, (count, total) in totals.items()]
+    )
+
+    if session is not None:
+        for order_id, (count, total) in totals.items():
+            order = session.identity_map.get(session.identity_key(Order, order_id))
+            if order is not None:
+                set_committed_value(order, 'item_count', count)
+                set_committed_value(order, 'total_amount', total)
+    return totals
+
+def _changed_order_ids(session):
+    """이번 flush에서 품목이 추가/수정/삭제된 주문 ID"""
+    order_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, OrderItem):
+            continue
+        if obj in session.dirty and not any(
+            inspect(obj).attrs[name].history.has_changes()
+            for name in ('order_id', 'order', 'quantity', 'unit_price')
+        ):
+            continue
+        if obj.order_id is not None:
+            order_ids.add(obj.order_id)
+    return order_ids
+
+@event.listens_for(Session, 'before_flush')
+def _collect_moved_order_items(session, flush_context, instances):
+    """다른 주문으로 옮겨지는 품목의 이전 주문 ID를 flush 전에 조회"""
+    moved_ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, OrderItem) and obj.id is not None and (
+            inspect(obj).attrs.order_id.history.has_changes()
+            or inspect(obj).attrs.order.history.has_changes()
+        )
+    ]
+    if moved_ids:
+        with session.no_autoflush:
+            previous = session.execute(
+                select(OrderItem.order_id).where(OrderItem.id.in_(moved_ids))
+            ).scalars().all()
+        session.info.setdefault('previous_order_ids', set()).update(previous)
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_order_totals(session, flush_context):
+    """OrderItem 변경 시 해당 주문의 품목 수와 합계 갱신"""
+    order_ids = _changed_order_ids(session) | session.info.pop('previous_order_ids', set())
+    if order_ids:
+        refresh_order_totals(session.connection(), order_ids, session)
@@ -0,0 +1,114 @@
+import os
+import sys
+import logging
+from typing import Dict, List
+from sqlalchemy import create_engine, select
+from dotenv import load_dotenv
+from models import Order, order_totals_query, refresh_order_totals
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 합계 비교 허용 오차 (부동소수점 합산 순서 차이)
+AMOUNT_TOLERANCE = 0.005
+
+def _order_id_batches(connection, batch_size: int):
+    """주문 ID를 batch_size개씩 나눠 반환 (키셋 방식)"""
+    last_id = 0
+    while True:
+        ids = connection.execute(
+            select(Order.id).where(Order.id > last_id).order_by(Order.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+def backfill_order_totals(engine, batch_size: int = 1000) -> int:
+    """
+    모든 주문의 item_count, total_amount를 order_items 기준으로 채움
+
+    batch_size개 주문마다 트랜잭션을 나눠 긴 잠금을 피한다.
+
+    Returns:
+        int: 갱신한 주문 수
+    """
+    try:
+        updated = 0
+        with engine.connect() as reader:
+            for ids in _order_id_batches(reader, batch_size):
+                with engine.begin() as conn:
+                    refresh_order_totals(conn, ids)
+                updated += len(ids)
+                logger.info(f"주문 합계 갱신 중: {updated}건")
+        logger.info(f"주문 합계 백필 완료: {updated}건")
+        return updated
+    except Exception as e:
+        logger.error(f"주문 합계 백필 중 오류 발생: {str(e)}")
+        raise
+
+def check_order_totals(engine, fix: bool = False, batch_size: int = 1000) -> List[Dict]:
+    """
+    저장된 주문 합계와 order_items 집계 비교
+
+    Args:
+        fix (bool): True면 불일치 주문을 다시 계산하여 저장
+
+    Returns:
+        List[Dict]: 불일치 주문 목록 (저장값과 실제값)
+    """
+    try:
+        mismatches = []
+        with engine.connect() as conn:
+            for ids in _order_id_batches(conn, batch_size):
+                stored = conn.execute(
+                    select(Order.id, Order.item_count, Order.total_amount).where(Order.id.in_(ids))
+                ).all()
+                actual = {order_id: (count, float(total))
+                          for order_id, count, total in conn.execute(order_totals_query(ids))}
+                for order_id, item_count, total_amount in stored:
+                    count, total = actual.get(order_id, (0, 0.0))
+                    if item_count != count or abs((total_amount or 0.0) - total) > AMOUNT_TOLERANCE:
+                        mismatches.append({
+                            'order_id': order_id,
+                            'stored_item_count': item_count,
+                            'stored_total_amount': total_amount,
+                            'item_count': count,
+                            'total_amount': total
+                        })
+
+        if mismatches:
+            logger.warning(f"주문 합계 불일치: {len(mismatches)}건")
+            if fix:
+                with engine.begin() as conn:
+                    refresh_order_totals(conn, [m['order_id'] for m in mismatches])
+                logger.info(f"주문 합계 불일치 {len(mismatches)}건을 수정했습니다.")
+        else:
+            logger.info("주문 합계가 모두 일치합니다.")
+        return mismatches
+    except Exception as e:
+        logger.error(f"주문 합계 확인 중 오류 발생: {str(e)}")
+        raise
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='주문 합계(item_count, total_amount) 관리')
+    parser.add_argument('command', choices=['backfill', 'check'])
+    parser.add_argument('--fix', action='store_true', help='check 시 불일치 주문 수정')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///restaurant.db'))
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.command == 'backfill':
+        backfill_order_totals(engine, args.batch_size)
+    else:
+        mismatches = check_order_totals(engine, fix=args.fix, batch_size=args.batch_size)
+        for mismatch in mismatches[:20]:
+            logger.warning(str(mismatch))
+        sys.exit(1 if mismatches and not args.fix else 0)
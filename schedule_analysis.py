@@ -1,50 +1,182 @@
-from models import Attendance, WorkFeedback
-from collections import defaultdict
-from datetime import time
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import case, extract, func, select
+
+# 시간대 구간 (4시간 단위, 시작 시각 이상 종료 시각 미만)
+HOUR_BUCKETS = [
+    (6, 10, "06:00-10:00"),
+    (10, 14, "10:00-14:00"),
+    (14, 18, "14:00-18:00"),
+    (18, 22, "18:00-22:00"),
+]
+OTHER_BUCKET = "기타"
 
 def group_hour(t):
     # 시간대 구간화 (4시간 단위)
-    if time(6, 0) <= t < time(10, 0):
-        return "06:00-10:00"
-    elif time(10, 0) <= t < time(14, 0):
-        return "10:00-14:00"
-    elif time(14, 0) <= t < time(18, 0):
-        return "14:00-18:00"
-    elif time(18, 0) <= t < time(22, 0):
-        return "18:00-22:00"
-    else:
-        return "기타"
-
-def analyze_workload():
-    from datetime import timedelta
+    for start, end, label in HOUR_BUCKETS:
+        if time(start, 0) <= t < time(end, 0):
+            return label
+    return OTHER_BUCKET
+
+def hour_bucket(column):
+    """시각 컬럼을 시간대 구간 이름으로 바꾸는 SQL 식 (group_hour와 같은 구간)"""
+    hour = extract('hour', column)
+    return case(
+        *[((hour >= start) & (hour < end), label) for start, end, label in HOUR_BUCKETS],
+        else_=OTHER_BUCKET
+    )
+
+def _suggestion(count, avg_score):
+    suggestion = "적절"
+    if avg_score and avg_score <= 2.5:
+        suggestion = "인원 추가 권장"
+    elif avg_score and avg_score >= 4.5 and count > 3:
+        suggestion = "인원 감축 가능"
+    return suggestion
+
+def summarize_workload(session, attendance_model, feedback_model,
+                       start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict]:
+    """
+    시간대별 근무 인원과 평균 평점 집계
+
+    출근 기록과 피드백을 각각 SQL에서 시간대별로 묶어 집계하므로 조회 기간 안의 행 수에만
+    비례하여 실행되고, 파이썬 메모리에는 시간대 수만큼의 결과만 올라온다.
+
+    Args:
+        session: DB 세션
+        attendance_model: clock_in(시각), date(근무일) 컬럼을 가진 출근 모델
+        feedback_model: rating, submitted_at 컬럼을 가진 피드백 모델
+        start_date (date): 조회 시작일 (포함)
+        end_date (date): 조회 종료일 (포함)
+    """
+    attendance_bucket = hour_bucket(attendance_model.clock_in).label('hour_group')
+    attendance_query = select(attendance_bucket, func.count()).group_by(attendance_bucket)
+
+    feedback_bucket = hour_bucket(feedback_model.submitted_at).label('hour_group')
+    feedback_query = select(feedback_bucket, func.avg(feedback_model.rating)).where(
+        feedback_model.rating.isnot(None)
+    ).group_by(feedback_bucket)
+
+    if start_date:
+        attendance_query = attendance_query.where(attendance_model.date >= start_date)
+        feedback_query = feedback_query.where(
+            feedback_model.submitted_at >= datetime.combine(start_date, time.min)
+        )
+    if end_date:
+        attendance_query = attendance_query.where(attendance_model.date <= end_date)
+        feedback_query = feedback_query.where(
+            feedback_model.submitted_at < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+
+    counts = dict(session.execute(attendance_query).all())
+    scores = dict(session.execute(feedback_query).all())
+
+    result = []
+    for hour_group, count in counts.items():
+        avg_score = round(float(scores[hour_group]), 1) if scores.get(hour_group) is not None else None
+        result.append({
+            '시간대': hour_group,
+            '근무 인원': count,
+            '평균 평점': avg_score,
+            '의견': _suggestion(count, avg_score)
+        })
+    return result
+
+WEEKDAYS = ["일", "월", "화", "수", "목", "금", "토"]  # extract('dow') 순서 (일요일 0)
+
+def rollup_bucket(hour: int, bucket_hours: Optional[int] = None):
+    """
+    시(0~23)를 시간대 구간으로 변환
+
+    bucket_hours가 없으면 HOUR_BUCKETS 구간을, 있으면 0시부터 bucket_hours시간 단위 구간을 쓴다.
+
+    Returns:
+        tuple: (정렬용 시작 시, 구간 이름)
+    """
+    if not bucket_hours:
+        for start, end, label in HOUR_BUCKETS:
+            if start <= hour < end:
+                return start, label
+        return 24, OTHER_BUCKET
+    start = hour - hour % bucket_hours
+    end = min(start + bucket_hours, 24)
+    return start, f"{start:02d}:00-{end:02d}:00"
+
+def summarize_rollups(session, rollup_model, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      bucket_hours: Optional[int] = None, store_id: Optional[int] = None,
+                      by_weekday: bool = False) -> List[Dict]:
+    """
+    시간대별 근무 집계 테이블(매장, 날짜, 시)에서 근무 인원과 평균 평점 집계
+
+    SQL에서는 시(와 요일) 단위로만 합산하므로 결과는 최대 24 x 7행이고,
+    구간 나누기는 파이썬에서 하여 구간 폭을 요청마다 바꿀 수 있다.
+
+    Args:
+        session: DB 세션
+        rollup_model: store_id, date, hour, headcount, worked_minutes, feedback_count, rating_sum 컬럼을 가진 집계 모델
+        start_date (date): 조회 시작일 (포함)
+        end_date (date): 조회 종료일 (포함)
+        bucket_hours (int): 구간 폭(시간), None이면 HOUR_BUCKETS
+        store_id (int): 매장 ID (None이면 전체 매장)
+        by_weekday (bool): 요일별로 나눠 집계
+    """
+    columns = [rollup_model.hour]
+    if by_weekday:
+        columns.append(extract('dow', rollup_model.date).label('weekday'))
+    query = select(
+        *columns,
+        func.sum(rollup_model.headcount),
+        func.sum(rollup_model.worked_minutes),
+        func.sum(rollup_model.feedback_count),
+        func.sum(rollup_model.rating_sum)
+    ).group_by(*columns)
+
+    if start_date:
+        query = query.where(rollup_model.date >= start_date)
+    if end_date:
+        query = query.where(rollup_model.date <= end_date)
+    if store_id is not None:
+        query = query.where(rollup_model.store_id == store_id)
+
+    totals = {}
+    for row in session.execute(query).all():
+        weekday = int(row[1]) if by_weekday else None
+        headcount, worked_minutes, feedback_count, rating_sum = row[-4:]
+        key = (weekday, *rollup_bucket(row[0], bucket_hours))
+        bucket = totals.setdefault(key, [0, 0, 0, 0.0])
+        bucket[0] += headcount or 0
+        bucket[1] += worked_minutes or 0
+        bucket[2] += feedback_count or 0
+        bucket[3] += rating_sum or 0.0
+
+    result = []
+    for (weekday, _, label), (headcount, worked_minutes, feedback_count, rating_sum) in sorted(
+            totals.items(), key=lambda item: (item[0][0] or 0, item[0][1])):
+        avg_score = round(rating_sum / feedback_count, 1) if feedback_count else None
+        entry = {'시간대': label}
+        if by_weekday:
+            entry['요일'] = WEEKDAYS[weekday]
+        entry.update({
+            '근무 인원': headcount,
+            '근무 시간(분)': worked_minutes,
+            '피드백 수': feedback_count,
+            '평균 평점': avg_score,
+            '의견': _suggestion(headcount, avg_score)
+        })
+        result.append(entry)
+    return result
+
+def analyze_workload(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                     bucket_hours: Optional[int] = None, store_id: Optional[int] = None,
+                     by_weekday: bool = False):
+    """
+    시간대별 근무 인원과 평균 평점, 인원 조정 의견 (start_date ~ end_date)
+
+    퇴근/피드백 제출 시 증분 갱신되는 workload_rollups 테이블에서 조회한다.
+    """
     from flask import current_app
+    from models import db, WorkloadRollup
 
     with current_app.app_context():
-        attendances = Attendance.query.all()
-        feedbacks = WorkFeedback.query.all()
-
-        data = defaultdict(list)
-
-        for a in attendances:
-            hour_group = group_hour(a.clock_in)
-            data[hour_group].append({'user_id': a.user_id})
-
-        result = []
-        for hour_group, records in data.items():
-            count = len(records)
-            fb_scores = [f.rating for f in feedbacks if group_hour(f.submitted_at.time()) == hour_group]
-            avg_score = round(sum(fb_scores) / len(fb_scores), 1) if fb_scores else None
-
-            suggestion = "적절"
-            if avg_score and avg_score <= 2.5:
-                suggestion = "인원 추가 권장"
-            elif avg_score and avg_score >= 4.5 and count > 3:
-                suggestion = "인원 감축 가능"
-
-            result.append({
-                '시간대': hour_group,
-                '근무 인원': count,
-                '평균 평점': avg_score,
-                '의견': suggestion
-            })
-        return result
+        return summarize_rollups(db.session, WorkloadRollup, start_date, end_date,
+                                 bucket_hours, store_id, by_weekday)
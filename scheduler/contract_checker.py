@@ -1,126 +1,163 @@
 from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from models import Contract, Employee, User, db, Notification
 from utils.alerts import send_admin_alert, send_kakao_alert
+from utils.alert_queue import queue_alert
 import logging
 
 logger = logging.getLogger(__name__)
 
-def check_contract_expiration():
-    """계약 만료 체크 및 알림"""
+# 만료 예정 알림 기준일
+NOTICE_DAYS = 7
+
+def _load_expiring_contracts(today, signed_only=True, store_id=None):
+    """
+    만료 예정(7일 후), 오늘 만료, 최근 만료(7일 이내) 계약을 한 번의 쿼리로 조회
+    직원 정보를 함께 즉시 로딩한다.
+    signed_only이면 서명 기록(SignatureLog)이 있는 계약만 조회한다.
+    store_id를 지정하면 해당 매장 직원의 계약만 조회한다.
+    """
+    query = Contract.query.options(joinedload(Contract.employee)).filter(
+        or_(
+            Contract.end_date == today + timedelta(days=NOTICE_DAYS),
+            Contract.end_date.between(today - timedelta(days=NOTICE_DAYS), today)
+        )
+    )
+    if signed_only:
+        query = query.filter(Contract.signatures.any())
+    if store_id is not None:
+        if hasattr(Employee, 'store_id'):
+            query = query.filter(Contract.employee.has(Employee.store_id == store_id))
+        else:
+            logger.warning(f"직원 모델에 매장 정보(store_id)가 없어 매장 {store_id} 필터를 적용하지 않습니다.")
+    return query.all()
+
+def _bucket_contracts(contracts, today):
+    """계약을 만료 예정/오늘 만료/만료됨으로 분류"""
+    buckets = {'upcoming': [], 'today': [], 'expired': []}
+    upcoming_date = today + timedelta(days=NOTICE_DAYS)
+    for contract in contracts:
+        if contract.end_date == upcoming_date:
+            buckets['upcoming'].append(contract)
+        elif contract.end_date == today:
+            buckets['today'].append(contract)
+        elif contract.end_date < today:
+            buckets['expired'].append(contract)
+    return buckets
+
+def _contract_period(contract):
+    return f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}"
+
+def check_contract_expiration(store_id=None):
+    """계약 만료 체크 및 알림 (store_id를 지정하면 해당 매장만)"""
     try:
         today = datetime.now().date()
-        
-        # 7일 후 만료되는 계약 조회
-        upcoming_expiry = Contract.query.filter(
-            Contract.end_date == today + timedelta(days=7),
-            Contract.signed == True
-        ).all()
-        
-        # 오늘 만료되는 계약 조회
-        expiring_today = Contract.query.filter(
-            Contract.end_date == today,
-            Contract.signed == True
-        ).all()
-        
-        # 만료된 계약 조회 (7일 이내)
-        expired_contracts = Contract.query.filter(
-            Contract.end_date < today,
-            Contract.end_date >= today - timedelta(days=7),
-            Contract.signed == True
-        ).all()
-        
-        # 알림 전송
-        for contract in upcoming_expiry:
-            employee = Employee.query.get(contract.employee_id)
-            if employee and employee.user:
+        buckets = _bucket_contracts(_load_expiring_contracts(today, store_id=store_id), today)
+
+        # 알림 전송 (비동기 발송 큐에 적재)
+        for contract in buckets['upcoming']:
+            employee = contract.employee
+            if employee:
                 # 관리자에게 알림
-                send_admin_alert(
-                    f"[계약 만료 예정] {employee.user.name}님의 계약이 7일 후 만료됩니다.\n"
-                    f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}"
+                queue_alert(
+                    send_admin_alert,
+                    f"[계약 만료 예정] {employee.name}님의 계약이 7일 후 만료됩니다.\n"
+                    f"{_contract_period(contract)}"
                 )
-                
+
                 # 직원에게 카카오톡 알림
-                if employee.user.phone:
-                    try:
-                        send_kakao_alert(
-                            employee.user.phone,
-                            f"[계약 만료 예정] 귀하의 계약이 7일 후 만료됩니다.\n"
-                            f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}\n"
-                            f"갱신이 필요합니다."
-                        )
-                    except Exception as e:
-                        logger.error(f"카카오톡 알림 전송 실패: {str(e)}")
-        
-        for contract in expiring_today:
-            employee = Employee.query.get(contract.employee_id)
-            if employee and employee.user:
+                if employee.phone:
+                    queue_alert(
+                        send_kakao_alert,
+                        employee.phone,
+                        f"[계약 만료 예정] 귀하의 계약이 7일 후 만료됩니다.\n"
+                        f"{_contract_period(contract)}\n"
+                        f"갱신이 필요합니다."
+                    )
+
+        for contract in buckets['today']:
+            employee = contract.employee
+            if employee:
                 # 관리자에게 알림
-                send_admin_alert(
-                    f"[계약 만료] {employee.user.name}님의 계약이 오늘 만료됩니다.\n"
-                    f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}"
+                queue_alert(
+                    send_admin_alert,
+                    f"[계약 만료] {employee.name}님의 계약이 오늘 만료됩니다.\n"
+                    f"{_contract_period(contract)}"
                 )
-                
+
                 # 직원에게 카카오톡 알림
-                if employee.user.phone:
-                    try:
-                        send_kakao_alert(
-                            employee.user.phone,
-                            f"[계약 만료] 귀하의 계약이 오늘 만료됩니다.\n"
-                            f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}\n"
-                            f"갱신이 필요합니다."
-                        )
-                    except Exception as e:
-                        logger.error(f"카카오톡 알림 전송 실패: {str(e)}")
-        
-        for contract in expired_contracts:
-            employee = Employee.query.get(contract.employee_id)
-            if employee and employee.user:
+                if employee.phone:
+                    queue_alert(
+                        send_kakao_alert,
+                        employee.phone,
+                        f"[계약 만료] 귀하의 계약이 오늘 만료됩니다.\n"
+                        f"{_contract_period(contract)}\n"
+                        f"갱신이 필요합니다."
+                    )
+
+        for contract in buckets['expired']:
+            employee = contract.employee
+            if employee:
                 # 관리자에게 알림
-                send_admin_alert(
-                    f"[계약 만료] {employee.user.name}님의 계약이 만료되었습니다.\n"
-                    f"계약 기간: {contract.start_date.strftime('%Y-%m-%d')} ~ {contract.end_date.strftime('%Y-%m-%d')}"
+                queue_alert(
+                    send_admin_alert,
+                    f"[계약 만료] {employee.name}님의 계약이 만료되었습니다.\n"
+                    f"{_contract_period(contract)}"
                 )
-        
-        logger.info(f"계약 만료 체크 완료: {len(upcoming_expiry)}건 만료 예정, {len(expiring_today)}건 오늘 만료, {len(expired_contracts)}건 만료됨")
-        
+
+        logger.info(
+            f"계약 만료 체크 완료{f'(매장 {store_id})' if store_id is not None else ''}: {len(buckets['upcoming'])}건 만료 예정, "
+            f"{len(buckets['today'])}건 오늘 만료, {len(buckets['expired'])}건 만료됨"
+        )
+        return buckets
+
     except Exception as e:
         logger.error(f"계약 만료 체크 중 오류 발생: {str(e)}")
-        raise 
+        raise
 
 def notify_contract_renewal():
     """계약 만료 알림 전송"""
     try:
         today = datetime.now().date()
-        contracts = Contract.query.filter(
-            Contract.end_date == today + timedelta(days=7)
-        ).all()
-        
+        contracts = _bucket_contracts(
+            _load_expiring_contracts(today, signed_only=False),
+            today
+        )['upcoming']
+
+        # 매장 정보가 없으므로 활성 관리자 전원에게 알림
+        admin_ids = [
+            user_id for (user_id,) in
+            db.session.query(User.id).filter(User.role == 'admin', User.is_active == True).all()
+        ]
+
+        rows = []
         for contract in contracts:
-            employee = Employee.query.get(contract.employee_id)
+            employee = contract.employee
             if employee:
                 # 관리자에게 알림
-                admin_notification = Notification(
-                    recipient_id=employee.store.admin_id,
-                    title="계약 만료 알림",
-                    content=f"{employee.user.name}님의 계약이 7일 후 만료됩니다. 갱신을 진행해 주세요.",
-                    notification_type="contract"
-                )
-                
+                for admin_id in admin_ids:
+                    rows.append(dict(
+                        user_id=admin_id,
+                        title="계약 만료 알림",
+                        message=f"{employee.name}님의 계약이 7일 후 만료됩니다. 갱신을 진행해 주세요.",
+                        type="contract"
+                    ))
+
                 # 직원에게 알림
-                employee_notification = Notification(
-                    recipient_id=employee.user_id,
+                rows.append(dict(
+                    user_id=employee.user_id,
                     title="계약 만료 알림",
-                    content="귀하의 계약이 7일 후 만료됩니다. 갱신 절차를 진행해 주세요.",
-                    notification_type="contract"
-                )
-                
-                db.session.add(admin_notification)
-                db.session.add(employee_notification)
-                
+                    message="귀하의 계약이 7일 후 만료됩니다. 갱신 절차를 진행해 주세요.",
+                    type="contract"
+                ))
+
+        if rows:
+            db.session.execute(db.insert(Notification), rows)
         db.session.commit()
         return True
-        
+
     except Exception as e:
         db.session.rollback()
         print(f"계약 만료 알림 전송 중 오류 발생: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
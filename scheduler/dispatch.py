@@ -0,0 +1,167 @@
+import os
+import zlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Iterable, List, Optional
+from apscheduler.triggers.cron import CronTrigger
+
+logger = logging.getLogger(__name__)
+
+# 작업 분류별 동시 실행 한도
+JOB_CLASS_LIMITS = {
+    'notification': 4,   # 알림 발송 작업 (DB 조회 + 알림 제공자 호출)
+    'report': 2,         # 집계/리포트 작업
+    'maintenance': 1,    # 정리/보관 작업
+}
+
+# 실행 슬롯 대기 시간(초). 대기 중에는 APScheduler 실행 스레드를 점유하므로 짧게 둔다.
+SLOT_TIMEOUT = 30
+# 슬롯을 얻지 못한 작업을 다시 시도하는 간격(초)과 최대 횟수
+SLOT_RETRY_DELAY = 60
+SLOT_MAX_RETRIES = 3
+
+class SlotTimeoutError(TimeoutError):
+    """작업 분류의 실행 슬롯을 제한 시간 안에 얻지 못함"""
+
+def stagger_offset(key, window: int, salt: str = '') -> int:
+    """
+    key(매장 ID 등)별 고정 지연 시간(초) 계산
+
+    같은 key는 재시작 후에도 항상 같은 지연 시간을 갖고, 여러 key는 window 안에 고르게 분산된다.
+    """
+    if window <= 0:
+        return 0
+    return zlib.crc32(f'{salt}:{key}'.encode('utf-8')) % window
+
+def get_store_ids() -> List[str]:
+    """환경 변수 SCHEDULER_STORE_IDS(쉼표 구분)에서 매장별 분산 실행 대상 매장 목록 조회"""
+    value = os.getenv('SCHEDULER_STORE_IDS', '')
+    return [store_id.strip() for store_id in value.split(',') if store_id.strip()]
+
+class JobClassLimiter:
+    """작업 분류별 동시 실행 수 제한 (분류별 세마포어)"""
+
+    def __init__(self, limits: Optional[dict] = None):
+        self.limits = dict(JOB_CLASS_LIMITS if limits is None else limits)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, job_class: str):
+        with self._lock:
+            if job_class not in self._semaphores:
+                self._semaphores[job_class] = threading.BoundedSemaphore(self.limits.get(job_class, 1))
+            return self._semaphores[job_class]
+
+    def configure(self, job_class: str, limit: int):
+        """분류별 동시 실행 한도 변경 (이미 실행 중인 작업에는 영향 없음)"""
+        with self._lock:
+            self.limits[job_class] = limit
+            self._semaphores.pop(job_class, None)
+
+    @contextmanager
+    def slot(self, job_class: str, timeout: Optional[float] = None):
+        """
+        실행 슬롯 획득 (한도에 도달하면 다른 작업이 끝날 때까지 최대 timeout초 대기)
+
+        Raises:
+            SlotTimeoutError: timeout초 안에 슬롯을 얻지 못한 경우
+        """
+        semaphore = self._semaphore(job_class)
+        if not semaphore.acquire(timeout=timeout):
+            raise SlotTimeoutError(f"{job_class} 작업 실행 슬롯을 얻지 못했습니다.")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+# 전역 작업 분류별 실행 제한
+job_limiter = JobClassLimiter()
+
+def limited(job_class: str, func, limiter: Optional[JobClassLimiter] = None,
+            timeout: float = SLOT_TIMEOUT, retry_delay: float = SLOT_RETRY_DELAY,
+            max_retries: int = SLOT_MAX_RETRIES):
+    """
+    작업 분류의 동시 실행 한도 안에서만 실행되도록 작업 함수를 감싼다
+
+    timeout초 안에 슬롯을 얻지 못하면 실행 스레드를 반환하고 retry_delay초 후
+    다시 시도하며, max_retries번 모두 실패하면 이번 실행은 건너뛴다.
+    """
+    limiter = limiter or job_limiter
+    job_name = getattr(func, 'job_name', func.__name__)
+
+    def run(attempt, args, kwargs):
+        try:
+            with limiter.slot(job_class, timeout=timeout):
+                return func(*args, **kwargs)
+        except SlotTimeoutError:
+            if attempt >= max_retries:
+                logger.warning(f"{job_class} 실행 슬롯을 얻지 못해 작업을 건너뜁니다: {job_name}")
+                return None
+            logger.warning(
+                f"{job_class} 실행 슬롯을 얻지 못해 {retry_delay}초 후 다시 시도합니다 "
+                f"({attempt + 1}/{max_retries}): {job_name}"
+            )
+            retry = threading.Timer(retry_delay, run, args=(attempt + 1, args, kwargs))
+            retry.daemon = True
+            retry.start()
+            return None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run(0, args, kwargs)
+    return wrapper
+
+def _shift(hour: int, minute: int, offset: int):
+    """기준 시각(hour:minute)에서 offset초 뒤의 시, 분, 초 (자정을 넘으면 다음 날로 순환)"""
+    shifted = datetime(2000, 1, 1, hour, minute) + timedelta(seconds=offset)
+    return shifted.hour, shifted.minute, shifted.second
+
+def add_dispatched_job(scheduler, func, job_id: str, hour: int, minute: int = 0,
+                       keys: Optional[Iterable] = None, window: int = 0, jitter: int = 0,
+                       job_class: Optional[str] = None, name: Optional[str] = None,
+                       limiter: Optional[JobClassLimiter] = None, **trigger_args) -> List[str]:
+    """
+    분산 실행 작업 등록
+
+    Args:
+        scheduler: APScheduler 스케줄러
+        func: 작업 함수 (keys가 있으면 key를 인자로 받는다)
+        job_id (str): 작업 ID (매장별 작업은 '{job_id}:{key}')
+        hour (int), minute (int): 기준 실행 시각
+        keys (Iterable): 매장 ID 목록. 지정하면 매장별로 작업을 나눠 등록한다.
+        window (int): 분산 구간(초). 매장별로 기준 시각 + [0, window) 사이의 고정 시각에 실행한다.
+        jitter (int): 실행마다 더해지는 무작위 지연(초)
+        job_class (str): 동시 실행 한도를 적용할 작업 분류 (JOB_CLASS_LIMITS)
+        name (str): 작업 표시 이름
+        **trigger_args: CronTrigger 추가 인자 (day_of_week 등)
+
+    Returns:
+        List[str]: 등록된 작업 ID 목록
+    """
+    if job_class:
+        func = limited(job_class, func, limiter)
+
+    targets = [(job_id, None)] if keys is None else [(f'{job_id}:{key}', key) for key in keys]
+    job_ids = []
+    for target_id, key in targets:
+        offset = stagger_offset(key, window, salt=job_id) if key is not None else 0
+        run_hour, run_minute, run_second = _shift(hour, minute, offset)
+        scheduler.add_job(
+            func,
+            CronTrigger(hour=run_hour, minute=run_minute, second=run_second,
+                        jitter=jitter or None, **trigger_args),
+            args=[key] if key is not None else None,
+            id=target_id,
+            name=f'{name or job_id} ({key})' if key is not None else (name or job_id),
+            replace_existing=True
+        )
+        job_ids.append(target_id)
+
+    logger.info(
+        f"분산 실행 작업 등록: {job_id} {len(job_ids)}건 "
+        f"(기준 {hour:02d}:{minute:02d}, 분산 {window}초, 지터 {jitter}초, 분류 {job_class or '-'})"
+    )
+    return job_ids
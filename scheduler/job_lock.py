@@ -0,0 +1,326 @@
+import os
+import time
+import uuid
+import socket
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Optional
+from sqlalchemy import (
+    create_engine, select, MetaData, Table, Column, String, DateTime, and_, or_
+)
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# 스케줄러 리스 테이블 (DB 백엔드용)
+lease_metadata = MetaData()
+scheduler_leases = Table(
+    'scheduler_leases', lease_metadata,
+    Column('name', String(100), primary_key=True),
+    Column('owner', String(200), nullable=False),
+    Column('expires_at', DateTime, nullable=False)
+)
+
+def make_owner_id() -> str:
+    """리스 소유자 ID (호스트:PID:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class LocalLeaseBackend:
+    """프로세스 내부 리스 (단일 프로세스 개발 환경 및 테스트용)"""
+
+    def __init__(self):
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """리스 획득 또는 연장 (이미 소유 중이면 만료 시각만 연장)"""
+        now = time.monotonic()
+        with self._lock:
+            current = self._leases.get(name)
+            if current and current[0] != owner and current[1] > now:
+                return False
+            self._leases[name] = (owner, now + ttl)
+            return True
+
+    def release(self, name: str, owner: str) -> bool:
+        with self._lock:
+            current = self._leases.get(name)
+            if current and current[0] == owner:
+                del self._leases[name]
+                return True
+            return False
+
+    def current_owner(self, name: str) -> Optional[str]:
+        """유효한 리스의 소유자 (없으면 None)"""
+        with self._lock:
+            current = self._leases.get(name)
+        if current and current[1] > time.monotonic():
+            return current[0]
+        return None
+
+class RedisLeaseBackend:
+    """Redis 리스 (SET NX PX로 획득, 소유자 확인 후 연장/해제)"""
+
+    RENEW_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis_client, prefix: str = 'scheduler:lease:'):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self._renew = redis_client.register_script(self.RENEW_SCRIPT)
+        self._release = redis_client.register_script(self.RELEASE_SCRIPT)
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        key = self.prefix + name
+        ttl_ms = int(ttl * 1000)
+        if self.redis_client.set(key, owner, nx=True, px=ttl_ms):
+            return True
+        return bool(self._renew(keys=[key], args=[owner, ttl_ms]))
+
+    def release(self, name: str, owner: str) -> bool:
+        return bool(self._release(keys=[self.prefix + name], args=[owner]))
+
+    def current_owner(self, name: str) -> Optional[str]:
+        return self.redis_client.get(self.prefix + name)
+
+class DatabaseLeaseBackend:
+    """
+    DB 리스 (scheduler_leases 행 단위 조건부 UPDATE)
+
+    만료되었거나 자신이 소유한 행만 갱신하므로, 동시에 여러 노드가 시도해도
+    행 잠금에 의해 하나의 노드만 성공한다. 만료 판정은 각 노드의 UTC 시각을 사용한다.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        lease_metadata.create_all(engine, tables=[scheduler_leases])
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                scheduler_leases.update()
+                .where(and_(
+                    scheduler_leases.c.name == name,
+                    or_(scheduler_leases.c.owner == owner, scheduler_leases.c.expires_at < now)
+                ))
+                .values(owner=owner, expires_at=expires_at)
+            )
+            if result.rowcount:
+                return True
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    scheduler_leases.insert().values(name=name, owner=owner, expires_at=expires_at)
+                )
+            return True
+        except IntegrityError:
+            return False
+
+    def release(self, name: str, owner: str) -> bool:
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                scheduler_leases.delete().where(and_(
+                    scheduler_leases.c.name == name,
+                    scheduler_leases.c.owner == owner
+                ))
+            )
+            return bool(result.rowcount)
+
+    def current_owner(self, name: str) -> Optional[str]:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(scheduler_leases.c.owner).where(and_(
+                    scheduler_leases.c.name == name,
+                    scheduler_leases.c.expires_at >= datetime.utcnow()
+                ))
+            ).scalar()
+
+def create_lease_backend(kind: Optional[str] = None):
+    """
+    환경 변수 SCHEDULER_LOCK_BACKEND(redis, db, local)에 따라 리스 백엔드 생성
+    (기본값: db, 모든 워커/노드가 같은 DATABASE_URL을 사용해야 한다)
+    """
+    kind = (kind or os.getenv('SCHEDULER_LOCK_BACKEND', 'db')).lower()
+    if kind == 'redis':
+        import redis
+        return RedisLeaseBackend(redis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=0,
+            decode_responses=True
+        ))
+    if kind == 'db':
+        return DatabaseLeaseBackend(create_engine(os.getenv('DATABASE_URL', 'sqlite:///restaurant.db')))
+    if kind == 'local':
+        logger.warning(
+            "스케줄러 잠금 백엔드가 local입니다. 프로세스 내부 잠금이므로 여러 워커/노드에서 실행하면 "
+            "모든 프로세스가 리더가 되어 작업이 중복 실행됩니다. 운영 환경에서는 db 또는 redis를 사용하세요."
+        )
+        return LocalLeaseBackend()
+    raise ValueError(f"지원되지 않는 스케줄러 잠금 백엔드입니다: {kind}")
+
+class LeaderElector:
+    """
+    리스 기반 스케줄러 리더 선출
+
+    모든 프로세스가 백그라운드 스레드에서 renew_interval마다 리스 획득/연장을 시도하고,
+    리스를 가진 프로세스만 리더가 된다. 리더가 종료되면 ttl 후 리스가 만료되어
+    다른 프로세스가 리더를 이어받는다.
+
+    리더가 없는 동안(장애 전환 구간) 실행 시각이 된 작업은 각 프로세스가 기억해 두고,
+    misfire_grace초 안에 리더가 된 프로세스가 이어서 한 번 실행한다.
+    다른 프로세스가 리더가 되면 기억해 둔 작업은 그 리더에게 맡기고 버린다.
+    """
+
+    def __init__(self, backend, name: str = 'scheduler-leader', ttl: float = 30.0,
+                 renew_interval: Optional[float] = None, owner: Optional[str] = None,
+                 misfire_grace: float = 300.0):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.renew_interval = renew_interval or ttl / 3
+        self.owner = owner or make_owner_id()
+        self.misfire_grace = misfire_grace
+        self._leader_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._missed = {}
+        self._missed_lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        """마지막 리스 연장이 아직 유효한지 (연장 실패가 이어지면 스스로 리더를 내려놓는다)"""
+        return time.monotonic() < self._leader_until
+
+    def try_acquire(self) -> bool:
+        """리스 획득/연장을 한 번 시도"""
+        was_leader = self.is_leader
+        started = time.monotonic()
+        try:
+            acquired = self.backend.acquire(self.name, self.owner, self.ttl)
+        except Exception as e:
+            logger.error(f"스케줄러 리스 갱신 중 오류 발생: {str(e)}")
+            acquired = False
+
+        if acquired:
+            # 요청 시작 시각 기준으로 계산하여 실제 만료보다 먼저 리더를 내려놓는다
+            self._leader_until = started + self.ttl - self.renew_interval / 2
+            if not was_leader:
+                logger.info(f"스케줄러 리더가 되었습니다: {self.owner}")
+                self._start_catch_up()
+        else:
+            if was_leader and not self.is_leader:
+                logger.warning(f"스케줄러 리더 자격을 잃었습니다: {self.owner}")
+            if self.leader_present():
+                # 다른 프로세스가 리더가 되었으므로 건너뛴 작업은 그 리더가 이어서 실행한다
+                with self._missed_lock:
+                    self._missed.clear()
+        return acquired
+
+    def leader_present(self) -> bool:
+        """이 프로세스를 포함해 유효한 리스를 가진 리더가 있는지"""
+        if self.is_leader:
+            return True
+        try:
+            return self.backend.current_owner(self.name) is not None
+        except Exception as e:
+            logger.error(f"스케줄러 리스 조회 중 오류 발생: {str(e)}")
+            return False
+
+    def record_missed(self, job_name: str, func, args, kwargs):
+        """리더가 없어 실행하지 못한 작업 기억 (작업별 마지막 실행 시각만 유지)"""
+        with self._missed_lock:
+            self._missed[job_name] = (time.monotonic(), func, args, kwargs)
+        logger.warning(f"리더가 없어 작업을 실행하지 못했습니다. 리더 선출 후 이어서 실행합니다: {job_name}")
+
+    def run_missed(self) -> int:
+        """
+        리더가 없는 동안 건너뛴 작업 중 misfire_grace초가 지나지 않은 작업 실행
+
+        Returns:
+            int: 실행한 작업 수
+        """
+        with self._missed_lock:
+            missed, self._missed = self._missed, {}
+        now = time.monotonic()
+        executed = 0
+        for job_name, (missed_at, func, args, kwargs) in missed.items():
+            if now - missed_at > self.misfire_grace:
+                logger.warning(f"허용 지연 시간이 지나 건너뛴 작업을 실행하지 않습니다: {job_name}")
+                continue
+            try:
+                logger.info(f"리더가 없는 동안 건너뛴 작업을 실행합니다: {job_name}")
+                func(*args, **kwargs)
+                executed += 1
+            except Exception as e:
+                logger.error(f"건너뛴 작업 {job_name} 실행 중 오류 발생: {str(e)}")
+        return executed
+
+    def _start_catch_up(self):
+        """리스 연장이 막히지 않도록 건너뛴 작업은 별도 스레드에서 실행"""
+        with self._missed_lock:
+            if not self._missed:
+                return
+        threading.Thread(target=self.run_missed, name='scheduler-catch-up', daemon=True).start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.try_acquire()
+            self._stop.wait(self.renew_interval)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.try_acquire()
+        self._thread = threading.Thread(target=self._run, name='scheduler-leader', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """선출 중지 및 리스 반납 (다른 프로세스가 즉시 리더를 이어받을 수 있도록)"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.renew_interval)
+        if self._leader_until:
+            try:
+                self.backend.release(self.name, self.owner)
+            except Exception as e:
+                logger.error(f"스케줄러 리스 반납 중 오류 발생: {str(e)}")
+        self._leader_until = 0.0
+
+def leader_only(elector: LeaderElector, func, job_name: Optional[str] = None):
+    """
+    리더 프로세스에서만 실행되도록 작업 함수를 감싼다
+
+    리더가 아무도 없을 때 실행 시각이 되면 건너뛴 작업으로 기억해 두었다가
+    리더가 된 뒤 이어서 실행한다 (LeaderElector.misfire_grace 참고).
+    """
+    job_name = job_name or getattr(func, 'job_name', func.__name__)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not elector.is_leader:
+            if elector.leader_present():
+                logger.debug(f"리더가 아니므로 작업을 건너뜁니다: {job_name}")
+            else:
+                # 매장별 작업은 인자(매장 ID)별로 따로 기억한다
+                elector.record_missed(f"{job_name}:{args[0]}" if args else job_name, func, args, kwargs)
+            return None
+        return func(*args, **kwargs)
+    return wrapper
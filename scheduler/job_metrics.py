@@ -0,0 +1,138 @@
+import time
+import logging
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Dict, List, Optional
+from extensions import db
+from models.scheduler import SchedulerJobRun
+from utils.alerts import send_admin_alert
+from utils.alert_queue import queue_alert
+
+logger = logging.getLogger(__name__)
+
+# 작업별 실행 시간 예산 (초), 초과 시 관리자 알림
+JOB_BUDGETS = {
+    'inventory_levels': 60,
+    'low_stock_notifier': 60,
+    'expiring_batches': 60,
+    'expiring_items': 60,
+    'pending_orders': 30,
+    'archive_old_records': 900,
+    'inventory_month_snapshot': 300,
+    'inventory_ledger_snapshot': 300,
+}
+DEFAULT_BUDGET = 120
+
+class JobRunStats:
+    """실행 중인 작업이 기록하는 통계 (조회 행 수, 생성 알림 수, 오류)"""
+
+    def __init__(self):
+        self.rows_scanned = 0
+        self.notifications_created = 0
+        self.error = None
+
+# 현재 실행 중인 작업의 통계
+_current_stats: ContextVar[Optional[JobRunStats]] = ContextVar('scheduler_job_stats', default=None)
+
+def job_stats() -> JobRunStats:
+    """현재 작업의 통계 객체 (추적 중이 아니면 기록되지 않는 임시 객체)"""
+    return _current_stats.get() or JobRunStats()
+
+def _save_run(run: SchedulerJobRun):
+    try:
+        db.session.add(run)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"작업 실행 이력 저장 중 오류 발생: {str(e)}")
+
+def tracked_job(job_name: str, func, budget: Optional[float] = None):
+    """
+    작업 실행 시간, 조회 행 수, 생성 알림 수, 실패 여부를 scheduler_job_runs에 기록하도록
+    작업 함수를 감싼다. 실행 시간이 예산을 넘으면 관리자에게 알린다.
+    """
+    budget = budget or JOB_BUDGETS.get(job_name, DEFAULT_BUDGET)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = JobRunStats()
+        token = _current_stats.set(stats)
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            stats.error = str(e)
+            raise
+        finally:
+            _current_stats.reset(token)
+            duration = time.perf_counter() - started
+            over_budget = duration > budget
+            _save_run(SchedulerJobRun(
+                job_name=job_name,
+                started_at=started_at,
+                finished_at=datetime.utcnow(),
+                duration_ms=round(duration * 1000, 3),
+                rows_scanned=stats.rows_scanned,
+                notifications_created=stats.notifications_created,
+                status='failed' if stats.error else 'success',
+                error=stats.error,
+                over_budget=over_budget
+            ))
+            if over_budget:
+                message = (
+                    f"[스케줄러 지연] {job_name} 작업이 {duration:.1f}초 걸렸습니다. "
+                    f"(예산 {budget}초)"
+                )
+                logger.warning(message)
+                queue_alert(send_admin_alert, message)
+    wrapper.job_name = job_name
+    return wrapper
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+def get_job_metrics(days: int = 7) -> Dict[str, Dict]:
+    """
+    작업별 실행 통계 조회
+
+    Args:
+        days (int): 집계 기간 (일)
+
+    Returns:
+        Dict[str, Dict]: 작업별 실행 횟수, 실패 횟수, p50/p95 실행 시간(ms),
+            마지막 실행 정보와 마지막 오류
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    runs = (
+        SchedulerJobRun.query
+        .filter(SchedulerJobRun.started_at >= since)
+        .order_by(SchedulerJobRun.started_at.desc())
+        .all()
+    )
+
+    grouped = {}
+    for run in runs:
+        grouped.setdefault(run.job_name, []).append(run)
+
+    metrics = {}
+    for job_name, job_runs in grouped.items():
+        durations = sorted(r.duration_ms for r in job_runs if r.duration_ms is not None)
+        last_failure = next((r for r in job_runs if r.status == 'failed'), None)
+        metrics[job_name] = {
+            'runs': len(job_runs),
+            'failures': sum(1 for r in job_runs if r.status == 'failed'),
+            'over_budget': sum(1 for r in job_runs if r.over_budget),
+            'budget_ms': JOB_BUDGETS.get(job_name, DEFAULT_BUDGET) * 1000,
+            'p50_ms': _percentile(durations, 50),
+            'p95_ms': _percentile(durations, 95),
+            'last_run': job_runs[0].to_dict(),
+            'last_error': last_failure.error if last_failure else None,
+            'last_error_at': last_failure.started_at.isoformat() if last_failure else None,
+        }
+    return metrics
@@ -1,44 +1,113 @@
-from flask import current_app
-from models import db, Ingredient, Notification, NotificationLog, User
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert, update
+from models import db, Notification, NotificationLog, User
+from utils.inventory import get_low_stock_ingredients
+from utils.kakao import send_kakao_alert
+from utils.alert_queue import queue_alert
+
+def build_low_stock_message(items):
+    """재고 부족 알림 내용 생성"""
+    return "다음 품목의 재고가 부족합니다:\n" + "\n".join(
+        f"- {item['ingredient'].name}: {item['current_quantity']}{item['ingredient'].unit or ''} "
+        f"(최소 {item['ingredient'].min_quantity}{item['ingredient'].unit or ''})"
+        for item in items
+    )
+
+def _deliver_kakao(app, log_id, admin_id, content):
+    """카카오톡 알림을 발송하고 알림 로그의 발송 상태를 갱신 (발송 큐 스레드에서 실행)"""
+    status, error = 'sent', None
+    try:
+        if send_kakao_alert(admin_id, content) is False:
+            status = 'failed'
+    except Exception as e:
+        status, error = 'failed', str(e)
+
+    with app.app_context():
+        try:
+            db.session.execute(
+                update(NotificationLog)
+                .where(NotificationLog.id == log_id)
+                .values(delivery_status=status, delivery_time=datetime.utcnow(), error_message=error)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"알림 로그 상태 갱신 중 오류 발생: {str(e)}")
+    return status == 'sent'
+
+def notify_low_stock(async_dispatch=False):
+    """
+    재고 부족 알림 전송
+
+    알림 내용은 한 번만 만들고, 관리자별 알림과 알림 로그는 각각 한 번의 INSERT로 저장한다.
+    알림 로그는 앱 알림만 보내면 바로 sent로, 카카오톡 알림을 발송 큐로 보내면
+    queued로 기록한 뒤 실제 발송 결과(sent, failed)로 갱신한다.
+
+    Args:
+        async_dispatch (bool): True면 관리자 카카오톡 알림을 비동기 발송 큐로 전달
 
-def notify_low_stock():
-    """재고 부족 알림 전송"""
+    Returns:
+        int: 알림을 받은 관리자 수
+    """
     try:
         # 재고 부족 품목 조회
-        low_stock_items = Ingredient.query.filter(
-            Ingredient.current_stock <= Ingredient.min_stock
-        ).all()
+        low_stock_items = get_low_stock_ingredients()
 
         if not low_stock_items:
-            return
-
-        # 관리자에게 알림 전송
-        admin_users = db.session.query(User).filter_by(is_admin=True).all()
-        
-        for admin in admin_users:
-            # 알림 생성
-            notification = Notification(
-                recipient_id=admin.id,
-                title="재고 부족 알림",
-                content=f"다음 품목의 재고가 부족합니다:\n" + 
-                       "\n".join([f"- {item.name}: {item.current_stock}{item.unit} (최소 {item.min_stock}{item.unit})" 
-                                for item in low_stock_items]),
-                notification_type="system"
-            )
-            db.session.add(notification)
-
-            # 알림 로그 기록
-            log = NotificationLog(
-                notification_type="low_stock",
-                content=f"재고 부족 알림 전송: {len(low_stock_items)}개 품목",
-                recipient_id=admin.id,
-                status="sent"
-            )
-            db.session.add(log)
+            return 0
+
+        # 관리자 ID만 조회
+        admin_ids = [
+            admin_id for admin_id, in
+            db.session.query(User.id).filter(User.role == 'admin').all()
+        ]
+        if not admin_ids:
+            return 0
+
+        content = build_low_stock_message(low_stock_items)
+        now = datetime.utcnow()
+
+        # 알림 생성 (생성된 ID를 입력 순서대로 받아 로그에 연결)
+        notification_ids = db.session.scalars(
+            insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+            [
+                dict(
+                    user_id=admin_id,
+                    title="재고 부족 알림",
+                    message=content,
+                    type="재고부족",
+                    created_at=now
+                )
+                for admin_id in admin_ids
+            ]
+        ).all()
+
+        # 알림 로그 기록
+        log_ids = db.session.scalars(
+            insert(NotificationLog).returning(NotificationLog.id, sort_by_parameter_order=True),
+            [
+                dict(
+                    notification_id=notification_id,
+                    delivery_status="queued" if async_dispatch else "sent",
+                    delivery_time=None if async_dispatch else now,
+                    created_at=now
+                )
+                for notification_id in notification_ids
+            ]
+        ).all()
 
         db.session.commit()
 
+        # 관리자에게 카카오톡 알림 (스케줄러 작업은 발송을 기다리지 않는다)
+        if async_dispatch:
+            app = current_app._get_current_object()
+            for admin_id, log_id in zip(admin_ids, log_ids):
+                queue_alert(_deliver_kakao, app, log_id, admin_id, content)
+
+        return len(admin_ids)
+
     except Exception as e:
         current_app.logger.error(f"재고 부족 알림 전송 중 오류 발생: {str(e)}")
-        db.session.rollback() 
\ No newline at end of file
+        db.session.rollback()
+        return 0
@@ -1,41 +1,61 @@
+from calendar import monthrange
 from datetime import date, timedelta
+from sqlalchemy.orm import joinedload
 from models import db, Contract, Employee
 from utils.kakao import send_kakao_to_admin, send_kakao_to_employee
-
-def notify_upcoming_paydays():
-    """급여일 7일 전 알림을 보내는 함수"""
+from utils.alert_queue import queue_alert
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 급여일 알림 기준일
+NOTICE_DAYS = 7
+
+def _payday_filter(target):
+    """
+    target 날짜가 급여일인 계약 조건 (pay_day 인덱스 사용)
+    급여일이 그 달의 말일보다 크면 말일에 지급한다.
+    """
+    last_day = monthrange(target.year, target.month)[1]
+    if target.day == last_day:
+        # 말일에는 pay_day가 말일 이상인 계약(예: 2월의 30, 31일)도 포함
+        return Contract.pay_day >= target.day
+    return Contract.pay_day == target.day
+
+def notify_upcoming_paydays(store_id=None):
+    """급여일 7일 전 알림을 보내는 함수 (store_id를 지정하면 해당 매장만)"""
     today = date.today()
-    contracts = Contract.query.all()
+    payday = today + timedelta(days=NOTICE_DAYS)
+
+    # 급여일이 정확히 7일 후인 계약만 조회
+    query = (
+        Contract.query
+        .options(joinedload(Contract.employee))
+        .filter(_payday_filter(payday))
+    )
+    if store_id is not None:
+        if hasattr(Employee, 'store_id'):
+            query = query.filter(Contract.employee.has(Employee.store_id == store_id))
+        else:
+            logger.warning(f"직원 모델에 매장 정보(store_id)가 없어 매장 {store_id} 필터를 적용하지 않습니다.")
+    contracts = query.all()
 
     for contract in contracts:
-        if not contract.pay_day:
+        employee = contract.employee
+        if not employee:
             continue
 
-        # 이번 달 급여일
-        payday = date(today.year, today.month, contract.pay_day)
-
-        # 이번 달 급여일이 지났으면 다음 달로 계산
-        if payday < today:
-            if today.month == 12:
-                payday = date(today.year + 1, 1, contract.pay_day)
-            else:
-                payday = date(today.year, today.month + 1, contract.pay_day)
-
-        # 오늘이 급여일 7일 전인가?
-        if (payday - today).days == 7:
-            employee = Employee.query.get(contract.employee_id)
-            if not employee:
-                continue
-
-            # 알림 내용 구성
-            message = (
-                f"[급여일 알림]\n"
-                f"{employee.name}님의 급여일({contract.pay_day}일)이 7일 남았습니다.\n"
-                f"급여 지급을 준비해 주세요."
-            )
-
-            # 관리자에게 알림
-            send_kakao_to_admin(employee.store_id, message)
-
-            # 직원에게 알림
-            send_kakao_to_employee(employee.id, message) 
\ No newline at end of file
+        # 알림 내용 구성
+        message = (
+            f"[급여일 알림]\n"
+            f"{employee.name}님의 급여일({payday.day}일)이 7일 남았습니다.\n"
+            f"급여 지급을 준비해 주세요."
+        )
+
+        # 관리자에게 알림
+        queue_alert(send_kakao_to_admin, getattr(employee, 'store_id', store_id), message)
+
+        # 직원에게 알림
+        queue_alert(send_kakao_to_employee, employee.id, message)
+
+    return len(contracts)
@@ -1,6 +1,10 @@
 from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
 from contract_checker import check_contract_expiration
+from payday_notifier import notify_upcoming_paydays
+from job_lock import LeaderElector, create_lease_backend, leader_only
+from dispatch import add_dispatched_job, get_store_ids
+from models import Employee
+import os
 import logging
 
 # 로깅 설정
@@ -13,16 +17,42 @@ logger = logging.getLogger(__name__)
 def main():
     """스케줄러 실행"""
     try:
+        # 리더 선출 시작 (여러 노드에서 실행해도 작업은 리더에서 한 번만 실행)
+        elector = LeaderElector(create_lease_backend())
+        elector.start()
+
         # 스케줄러 생성
         scheduler = BlockingScheduler()
         
-        # 매일 오전 9시에 계약 만료 체크 실행
-        scheduler.add_job(
-            check_contract_expiration,
-            CronTrigger(hour=9, minute=0),
-            id='contract_check',
-            name='계약 만료 체크',
-            replace_existing=True
+        # 매장별 작업은 분산 구간 안에서 매장마다 다른 시각에 실행하고,
+        # 알림 작업은 동시에 JOB_CLASS_LIMITS['notification']개까지만 실행한다
+        store_ids = get_store_ids() or None
+        if store_ids and not hasattr(Employee, 'store_id'):
+            # 매장별로 나눌 수 없으면 매장 수만큼 전체 작업이 중복 실행되므로 분산 실행을 끈다
+            logger.warning(
+                "SCHEDULER_STORE_IDS가 설정되었지만 직원 모델에 매장 정보(store_id)가 없어 "
+                "매장별 분산 실행을 사용하지 않습니다."
+            )
+            store_ids = None
+        window = int(os.getenv('SCHEDULER_STAGGER_WINDOW', 1800))
+        jitter = int(os.getenv('SCHEDULER_JITTER', 60))
+
+        # 매일 오전 9시부터 계약 만료 체크 실행
+        add_dispatched_job(
+            scheduler,
+            leader_only(elector, check_contract_expiration),
+            'contract_check', hour=9, minute=0,
+            keys=store_ids, window=window, jitter=jitter,
+            job_class='notification', name='계약 만료 체크'
+        )
+
+        # 매일 오전 10시부터 급여일 알림 실행
+        add_dispatched_job(
+            scheduler,
+            leader_only(elector, notify_upcoming_paydays),
+            'payday_notice', hour=10, minute=0,
+            keys=store_ids, window=window, jitter=jitter,
+            job_class='notification', name='급여일 알림'
         )
         
         logger.info("스케줄러가 시작되었습니다.")
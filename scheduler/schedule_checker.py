@@ -1,46 +1,105 @@
-from models import db, Schedule, User
+from models import db, Schedule, Employee, User, ScheduleDigestState
 from datetime import datetime, timedelta
 from utils.alerts import send_admin_alert
 import logging
 
 logger = logging.getLogger(__name__)
 
-def check_unconfirmed_schedules():
-    """미확인 스케줄 체크 및 관리자 알림"""
+def _load_unconfirmed(one_day_ago):
+    """미승인 스케줄과 직원 이름을 한 번의 쿼리로 조회"""
+    return (
+        db.session.query(Schedule, Employee.name)
+        .join(Employee, Employee.id == Schedule.employee_id)
+        .filter(
+            Schedule.is_approved == False,
+            Schedule.date <= one_day_ago
+        )
+        .order_by(Schedule.date, Schedule.start_time)
+        .all()
+    )
+
+def _schedule_line(schedule, employee_name):
+    return (
+        f"- {employee_name} {schedule.date.strftime('%Y-%m-%d')} "
+        f"{schedule.start_time.strftime('%H:%M')} ~ {schedule.end_time.strftime('%H:%M')}"
+    )
+
+def build_digest_message(rows, new_count=None, max_lines=20):
+    """미확인 스케줄 요약 메시지 생성 (max_lines건 초과분은 건수만 표시)"""
+    lines = [
+        "[스케줄 미확인 알림]",
+        f"미확인 스케줄 {len(rows)}건 (1일 이상 경과)"
+        + (f", 신규 {new_count}건" if new_count is not None else "")
+    ]
+    lines.extend(_schedule_line(schedule, name) for schedule, name in rows[:max_lines])
+    if len(rows) > max_lines:
+        lines.append(f"외 {len(rows) - max_lines}건")
+    return "\n".join(lines)
+
+def check_unconfirmed_schedules(digest=True, coalesce_window=timedelta(hours=1), max_lines=20):
+    """
+    미확인 스케줄 체크 및 관리자 알림
+
+    Args:
+        digest (bool): True면 관리자별로 요약 알림 1건만 발송, False면 스케줄별 발송
+        coalesce_window (timedelta): 요약 알림 병합 간격. 이 간격 안에서는
+            새로 추가된 미확인 스케줄이 없으면 같은 관리자에게 다시 발송하지 않는다.
+        max_lines (int): 요약 알림에 나열할 최대 스케줄 수
+    """
     try:
         now = datetime.utcnow()
         one_day_ago = now - timedelta(days=1)
-        
+
         # 미확인 스케줄 조회
-        unconfirmed = Schedule.query.filter(
-            Schedule.confirmed == False,
-            Schedule.date <= one_day_ago
-        ).all()
-        
+        unconfirmed = _load_unconfirmed(one_day_ago)
+
         if not unconfirmed:
             logger.info("미확인 스케줄이 없습니다.")
             return
-            
+
         # 관리자 목록 조회
-        admins = User.query.filter_by(is_admin=True).all()
-        
-        for schedule in unconfirmed:
-            employee = User.query.get(schedule.user_id)
-            if not employee:
-                continue
-                
-            # 관리자에게 알림 전송
-            message = (
-                f"[스케줄 미확인 알림]\n"
-                f"직원: {employee.name}\n"
-                f"날짜: {schedule.date.strftime('%Y-%m-%d')}\n"
-                f"시간: {schedule.start_time.strftime('%H:%M')} ~ {schedule.end_time.strftime('%H:%M')}\n"
-                f"미확인 기간: 1일 이상"
-            )
-            
-            for admin in admins:
-                send_admin_alert(message)
-                logger.info(f"미확인 스케줄 알림 전송: admin_id={admin.id}, schedule_id={schedule.id}")
-                
+        admins = User.query.filter(User.role == 'admin').all()
+
+        if not digest:
+            for schedule, employee_name in unconfirmed:
+                # 관리자에게 알림 전송
+                message = (
+                    f"[스케줄 미확인 알림]\n"
+                    f"직원: {employee_name}\n"
+                    f"날짜: {schedule.date.strftime('%Y-%m-%d')}\n"
+                    f"시간: {schedule.start_time.strftime('%H:%M')} ~ {schedule.end_time.strftime('%H:%M')}\n"
+                    f"미확인 기간: 1일 이상"
+                )
+
+                for admin in admins:
+                    send_admin_alert(message)
+                    logger.info(f"미확인 스케줄 알림 전송: admin_id={admin.id}, schedule_id={schedule.id}")
+            return
+
+        # 관리자별 마지막 요약 알림 (DB에 저장하여 재시작이나 리더 변경 후에도 유지)
+        schedule_ids = frozenset(schedule.id for schedule, _ in unconfirmed)
+        states = {
+            state.user_id: state for state in
+            ScheduleDigestState.query.filter(ScheduleDigestState.user_id.in_([admin.id for admin in admins]))
+        }
+        for admin in admins:
+            state = states.get(admin.id)
+            new_count = None
+            if state and coalesce_window and now - state.last_sent_at < coalesce_window:
+                new_count = len(schedule_ids - set(state.schedule_ids or []))
+                if not new_count:
+                    continue
+
+            send_admin_alert(build_digest_message(unconfirmed, new_count, max_lines))
+            if state is None:
+                state = ScheduleDigestState(user_id=admin.id)
+                db.session.add(state)
+            state.last_sent_at = now
+            state.schedule_ids = sorted(schedule_ids)
+            # 발송한 관리자마다 바로 저장하여 중간에 실패해도 중복 발송하지 않도록 한다
+            db.session.commit()
+            logger.info(f"미확인 스케줄 요약 알림 전송: admin_id={admin.id}, {len(unconfirmed)}건")
+
     except Exception as e:
-        logger.error(f"미확인 스케줄 체크 중 오류 발생: {str(e)}") 
\ No newline at end of file
+        db.session.rollback()
+        logger.error(f"미확인 스케줄 체크 중 오류 발생: {str(e)}")
@@ -11,14 +11,25 @@ from utils.pos_service import sync_pos_sales
 from utils.inventory import check_inventory_status
 import pytz
 from models.order import Order
+from scheduler.job_lock import LeaderElector, create_lease_backend, leader_only
+from scheduler.job_metrics import tracked_job, job_stats
+from scheduler.dispatch import add_dispatched_job
+from utils.archiving import archive_cold_rows
+from utils.inventory_report import snapshot_monthly_inventory
+from utils.inventory_ledger import take_ledger_snapshots
+from scheduler.low_stock_notifier import notify_low_stock
 
 logger = logging.getLogger(__name__)
 
 # 전역 스케줄러 인스턴스
 scheduler = None
 
+# 전역 리더 선출기 (여러 워커/노드 중 리더만 작업 실행)
+elector = None
+
 def check_expiring_items():
     """유통기한이 임박한 재고 확인"""
+    stats = job_stats()
     try:
         with current_app.app_context():
             today = datetime.now().date()
@@ -41,14 +52,20 @@ def check_expiring_items():
                 db.session.add(notification)
             
             db.session.commit()
+            stats.rows_scanned = len(expiring_batches)
+            stats.notifications_created = len(expiring_batches)
             logger.info(f"유통기한 임박 재고 확인 완료: {len(expiring_batches)}개 항목 발견")
     except Exception as e:
+        stats.error = str(e)
         logger.error(f"유통기한 임박 재고 확인 중 오류 발생: {str(e)}")
         db.session.rollback()
 
 def init_scheduler():
     """스케줄러 초기화"""
-    global scheduler
+    global scheduler, elector
+    if elector is None:
+        elector = LeaderElector(create_lease_backend())
+        elector.start()
     if scheduler is None:
         scheduler = BackgroundScheduler()
         scheduler.start()
@@ -59,12 +76,17 @@ def get_scheduler_status():
     global scheduler
     if scheduler is None:
         return '스케줄러가 초기화되지 않았습니다.'
-    return '스케줄러가 실행 중입니다.' if scheduler.running else '스케줄러가 중지되었습니다.'
+    if not scheduler.running:
+        return '스케줄러가 중지되었습니다.'
+    role = '리더' if elector and elector.is_leader else '대기'
+    return f'스케줄러가 실행 중입니다. ({role})'
 
 def check_inventory_levels():
     """재고 수준 확인"""
+    stats = job_stats()
     try:
         items = InventoryItem.query.all()
+        stats.rows_scanned = len(items)
         for item in items:
             if item.current_quantity <= item.minimum_quantity:
                 notification = Notification(
@@ -74,13 +96,16 @@ def check_inventory_levels():
                     status='unread'
                 )
                 db.session.add(notification)
+                stats.notifications_created += 1
         db.session.commit()
         logger.info('재고 수준 확인이 완료되었습니다.')
     except Exception as e:
+        stats.error = str(e)
         logger.error(f'재고 수준 확인 중 오류 발생: {str(e)}')
 
 def check_expiring_batches():
     """유통기한 임박 재고 확인"""
+    stats = job_stats()
     try:
         today = datetime.utcnow().date()
         expiring_soon = today + timedelta(days=7)
@@ -88,6 +113,7 @@ def check_expiring_batches():
             InventoryBatch.expiry_date <= expiring_soon,
             InventoryBatch.expiry_date >= today
         ).all()
+        stats.rows_scanned = len(batches)
 
         for batch in batches:
             notification = Notification(
@@ -98,14 +124,18 @@ def check_expiring_batches():
             )
             db.session.add(notification)
         db.session.commit()
+        stats.notifications_created = len(batches)
         logger.info('유통기한 확인이 완료되었습니다.')
     except Exception as e:
+        stats.error = str(e)
         logger.error(f'유통기한 확인 중 오류 발생: {str(e)}')
 
 def check_pending_orders():
     """미처리 주문 확인"""
+    stats = job_stats()
     try:
         orders = Order.query.filter_by(status='pending').all()
+        stats.rows_scanned = len(orders)
         for order in orders:
             notification = Notification(
                 title='미처리 주문 알림',
@@ -115,24 +145,85 @@ def check_pending_orders():
             )
             db.session.add(notification)
         db.session.commit()
+        stats.notifications_created = len(orders)
         logger.info('미처리 주문 확인이 완료되었습니다.')
     except Exception as e:
+        stats.error = str(e)
         logger.error(f'미처리 주문 확인 중 오류 발생: {str(e)}')
 
+def archive_old_records():
+    """보관 기준일보다 오래된 발주, 알림 로그, 재고 거래를 보관 테이블로 이동"""
+    stats = job_stats()
+    try:
+        results = archive_cold_rows()
+        stats.rows_scanned = sum(results.values())
+        logger.info(f'오래된 데이터 보관이 완료되었습니다: {results}')
+    except Exception as e:
+        stats.error = str(e)
+        logger.error(f'오래된 데이터 보관 중 오류 발생: {str(e)}')
+
+def snapshot_inventory_month():
+    """지난달 재료별 기초/기말 재고와 발주/입고/사용 합계를 스냅샷으로 저장"""
+    stats = job_stats()
+    try:
+        stats.rows_scanned = snapshot_monthly_inventory()
+        logger.info('월말 재고 스냅샷 저장이 완료되었습니다.')
+    except Exception as e:
+        stats.error = str(e)
+        logger.error(f'월말 재고 스냅샷 저장 중 오류 발생: {str(e)}')
+
+def snapshot_inventory_ledger():
+    """재고 원장 변동이 있는 계정의 잔량 스냅샷을 저장하고 수량 필드와 대조"""
+    stats = job_stats()
+    try:
+        stats.rows_scanned, mismatches = take_ledger_snapshots()
+        if mismatches:
+            logger.warning(f'재고 원장과 수량이 다른 계정: {len(mismatches)}개')
+        logger.info('재고 원장 스냅샷 저장이 완료되었습니다.')
+    except Exception as e:
+        stats.error = str(e)
+        logger.error(f'재고 원장 스냅샷 저장 중 오류 발생: {str(e)}')
+
+def schedule_low_stock_notifier(hour, minute=0):
+    """재고 부족 알림 작업을 지정한 시각으로 등록 (이미 있으면 교체, 실행은 리더 프로세스에서만)"""
+    global scheduler
+    if scheduler is None:
+        init_scheduler()
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('low_stock_notifier', notify_low_stock)),
+                       'low_stock_notifier', hour=hour, minute=minute, jitter=300, job_class='notification')
+
 def schedule_tasks():
     """작업 스케줄링"""
     global scheduler
     if scheduler is None:
         init_scheduler()
 
-    # 재고 수준 확인 - 매일 오전 9시
-    scheduler.add_job(check_inventory_levels, 'cron', hour=9)
+    # 모든 프로세스에 작업을 등록하되, 실행은 리더 프로세스에서만 한다
+    # 실행 이력(소요 시간, 조회/알림 건수, 실패)은 scheduler_job_runs에 기록한다
+    # 정각 알림 작업은 무작위 지연(jitter)을 두고 분류별 동시 실행 한도 안에서 실행한다
+    # 재고 수준 확인 - 매일 오전 9시 (최대 5분 지연)
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('inventory_levels', check_inventory_levels)),
+                       'inventory_levels', hour=9, jitter=300, job_class='notification')
+
+    # 유통기한 확인 - 매일 오전 10시 (최대 5분 지연)
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('expiring_batches', check_expiring_batches)),
+                       'expiring_batches', hour=10, jitter=300, job_class='notification')
+
+    # 오래된 데이터 보관 - 매일 오전 3시 (최대 10분 지연)
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('archive_old_records', archive_old_records)),
+                       'archive_old_records', hour=3, jitter=600, job_class='maintenance')
+
+    # 월말 재고 스냅샷 - 매월 1일 오전 2시 (최대 10분 지연)
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('inventory_month_snapshot', snapshot_inventory_month)),
+                       'inventory_month_snapshot', hour=2, jitter=600, job_class='maintenance', day=1)
 
-    # 유통기한 확인 - 매일 오전 10시
-    scheduler.add_job(check_expiring_batches, 'cron', hour=10)
+    # 재고 원장 스냅샷 - 매일 오전 4시 (최대 10분 지연)
+    add_dispatched_job(scheduler, leader_only(elector, tracked_job('inventory_ledger_snapshot', snapshot_inventory_ledger)),
+                       'inventory_ledger_snapshot', hour=4, jitter=600, job_class='maintenance')
 
     # 미처리 주문 확인 - 매 시간마다
-    scheduler.add_job(check_pending_orders, 'interval', hours=1)
+    scheduler.add_job(leader_only(elector, tracked_job('pending_orders', check_pending_orders)), 'interval', hours=1,
+                      id='pending_orders', replace_existing=True)
 
     logger.info('모든 작업이 스케줄링되었습니다.')
 
@@ -0,0 +1,130 @@
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from app import create_app
+from extensions import db
+from models.inventory import InventoryItem, InventoryBatch
+from models.notification import Notification
+from utils.batch_consumption import BatchHeap
+from utils.inventory import consume_inventory
+
+def make_batch(batch_id, quantity, expiration_date=None, used_quantity=0):
+    return SimpleNamespace(id=batch_id, batch_number=f'B{batch_id}', quantity=quantity,
+                           used_quantity=used_quantity, expiration_date=expiration_date)
+
+class TestBatchHeap(unittest.TestCase):
+    def setUp(self):
+        today = date.today()
+        self.batches = [
+            make_batch(1, 10, today + timedelta(days=5)),
+            make_batch(2, 5, None),
+            make_batch(3, 4, today + timedelta(days=1), used_quantity=1),
+            make_batch(4, 6, today + timedelta(days=1)),
+            make_batch(5, 3, today, used_quantity=3)
+        ]
+
+    def test_allocates_in_expiry_order(self):
+        """유통기한이 빠른 배치부터, 같으면 ID 순, 유통기한 없는 배치는 마지막"""
+        heap = BatchHeap(self.batches)
+        self.assertEqual(heap.available, 24)
+
+        allocations = heap.allocate(24)
+
+        self.assertEqual([(a.batch_id, a.quantity) for a in allocations], [(3, 3), (4, 6), (1, 10), (2, 5)])
+        self.assertEqual(len(heap), 0)
+
+    def test_partial_draw_keeps_remainder(self):
+        """일부만 꺼낸 배치는 남은 수량으로 힙에 남음"""
+        heap = BatchHeap(self.batches)
+        first = heap.allocate(5)
+        second = heap.allocate(5)
+
+        self.assertEqual([(a.batch_id, a.quantity) for a in first], [(3, 3), (4, 2)])
+        self.assertEqual([(a.batch_id, a.quantity) for a in second], [(4, 4), (1, 1)])
+        self.assertEqual(heap.available, 14)
+
+    def test_shortage_leaves_heap_unchanged(self):
+        """가용 수량보다 많이 요청하면 ValueError, 힙은 그대로"""
+        heap = BatchHeap(self.batches)
+        with self.assertRaises(ValueError):
+            heap.allocate(25)
+
+        self.assertEqual(heap.available, 24)
+        self.assertEqual(len(heap), 4)
+
+    def test_unbatched_stock_drawn_last(self):
+        """배치 없는 재고는 유통기한 없는 배치보다도 뒤에 꺼냄"""
+        heap = BatchHeap([make_batch(2, 5, None), make_batch(1, 2, date.today())], unbatched=4)
+
+        allocations = heap.allocate(10)
+
+        self.assertEqual([(a.batch_id, a.quantity) for a in allocations], [(1, 2), (2, 5), (None, 3)])
+        self.assertEqual(heap.available, 1)
+
+class TestConsumeInventory(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        today = date.today()
+        self.item = InventoryItem(name='우유', unit='L', min_quantity=1, current_quantity=8)
+        db.session.add(self.item)
+        db.session.flush()
+        self.late = InventoryBatch(item_id=self.item.id, batch_number='L', quantity=5, used_quantity=0,
+                                   expiration_date=today + timedelta(days=7))
+        self.early = InventoryBatch(item_id=self.item.id, batch_number='E', quantity=3, used_quantity=0,
+                                    expiration_date=today + timedelta(days=2))
+        db.session.add_all([self.late, self.early])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _state(self):
+        db.session.expire_all()
+        return (db.session.get(InventoryItem, self.item.id).current_quantity,
+                db.session.get(InventoryBatch, self.early.id).used_quantity,
+                db.session.get(InventoryBatch, self.late.id).used_quantity)
+
+    def test_consumes_earliest_batches_first(self):
+        """유통기한이 빠른 배치부터 차감하고 품목 현재 수량도 줄임"""
+        self.assertTrue(consume_inventory(self.item.id, 4))
+        db.session.commit()
+
+        self.assertEqual(self._state(), (4, 3, 1))
+
+    def test_caller_owns_transaction(self):
+        """차감은 커밋하지 않으므로 호출한 쪽이 롤백하면 되돌려짐"""
+        self.assertTrue(consume_inventory(self.item.id, 4))
+        db.session.rollback()
+
+        self.assertEqual(self._state(), (8, 0, 0))
+
+    def test_failure_keeps_callers_changes(self):
+        """재고가 부족해 실패해도 같은 트랜잭션의 다른 변경과 앞선 차감은 남음"""
+        db.session.add(Notification(user_id=1, title='판매', message='판매 처리'))
+        self.assertTrue(consume_inventory(self.item.id, 2))
+        self.assertFalse(consume_inventory(self.item.id, 100))
+        db.session.commit()
+
+        self.assertEqual(self._state(), (6, 2, 0))
+        self.assertEqual(Notification.query.filter_by(title='판매').count(), 1)
+
+    def test_consumes_stock_without_batches(self):
+        """배치 없이 현재 수량에만 있는 재고도 배치를 모두 쓴 뒤 차감"""
+        db.session.get(InventoryItem, self.item.id).current_quantity = 10
+        db.session.commit()
+
+        self.assertTrue(consume_inventory(self.item.id, 10))
+        db.session.commit()
+
+        self.assertEqual(self._state(), (0, 3, 5))
+
+if __name__ == '__main__':
+    unittest.main()
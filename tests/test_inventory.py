@@ -2,12 +2,13 @@ import unittest
 from datetime import date, timedelta
 from app import create_app
 from extensions import db
-from models.inventory import InventoryItem, InventoryBatch
+from models.inventory import InventoryItem, InventoryBatch, Ingredient, StockItem, StockTransaction
 from utils.inventory import (
     register_inventory,
     consume_inventory,
     get_inventory_status,
-    check_inventory_availability
+    check_inventory_availability,
+    deduct_stock_bulk
 )
 
 class TestInventorySystem(unittest.TestCase):
@@ -111,5 +112,100 @@ class TestInventorySystem(unittest.TestCase):
         status = get_inventory_status('테스트품목')
         self.assertEqual(status['total_available'], 0)
 
+class TestDeductStockBulk(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # 돼지고기 품목(재고 항목 5 + 10)을 두 재료가 함께 쓰고, 양파 품목(재고 항목 3)은 한 재료만 쓴다
+        pork = InventoryItem(name='돼지고기', unit='kg', min_quantity=1, current_quantity=15)
+        onion = InventoryItem(name='양파', unit='kg', min_quantity=1, current_quantity=3)
+        db.session.add_all([pork, onion])
+        db.session.flush()
+        self.first_stock = StockItem(item_id=pork.id, quantity=5, unit='kg')
+        self.second_stock = StockItem(item_id=pork.id, quantity=10, unit='kg')
+        self.onion_stock = StockItem(item_id=onion.id, quantity=3, unit='kg')
+        self.pork_belly = Ingredient(name='삼겹살', item_id=pork.id, quantity=1, unit='kg')
+        self.pork_neck = Ingredient(name='목살', item_id=pork.id, quantity=1, unit='kg')
+        self.onion = Ingredient(name='양파', item_id=onion.id, quantity=1, unit='kg')
+        db.session.add_all([self.first_stock, self.second_stock, self.onion_stock,
+                            self.pork_belly, self.pork_neck, self.onion])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _quantities(self):
+        return [db.session.get(StockItem, stock.id).quantity
+                for stock in (self.first_stock, self.second_stock, self.onion_stock)]
+
+    def test_deducts_in_stock_item_order(self):
+        """같은 재료의 줄은 합산하고 재고 항목 순서대로 차감"""
+        count = deduct_stock_bulk([
+            {'ingredient_id': self.pork_belly.id, 'quantity': 4},
+            {'ingredient_id': self.pork_belly.id, 'quantity': 3}
+        ], notes='점심 영업')
+        db.session.commit()
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self._quantities(), [0, 8, 3])
+        transactions = StockTransaction.query.order_by(StockTransaction.stock_item_id).all()
+        self.assertEqual(
+            [(t.stock_item_id, t.transaction_type, t.quantity) for t in transactions],
+            [(self.first_stock.id, 'usage', -5), (self.second_stock.id, 'usage', -2)]
+        )
+        self.assertTrue(all(t.notes == '점심 영업' for t in transactions))
+
+    def test_ingredients_share_item_stock(self):
+        """같은 품목을 쓰는 재료는 재고 항목을 나눠 차감"""
+        deduct_stock_bulk([
+            {'ingredient_id': self.pork_belly.id, 'quantity': 6},
+            {'ingredient_id': self.pork_neck.id, 'quantity': 8},
+            {'ingredient_id': self.onion.id, 'quantity': 3}
+        ])
+        db.session.commit()
+
+        self.assertEqual(self._quantities(), [0, 1, 0])
+
+    def test_shortage_writes_nothing(self):
+        """한 줄이라도 재고가 부족하면 아무 것도 차감하지 않음"""
+        with self.assertRaises(ValueError) as context:
+            deduct_stock_bulk([
+                {'ingredient_id': self.pork_belly.id, 'quantity': 2},
+                {'ingredient_id': self.onion.id, 'quantity': 5}
+            ])
+        db.session.rollback()
+
+        self.assertIn('양파', str(context.exception))
+        self.assertEqual(self._quantities(), [5, 10, 3])
+        self.assertEqual(StockTransaction.query.count(), 0)
+
+    def test_shared_stock_shortage(self):
+        """재료별로는 충분해도 같은 품목 재고의 합계가 부족하면 실패"""
+        with self.assertRaises(ValueError):
+            deduct_stock_bulk([
+                {'ingredient_id': self.pork_belly.id, 'quantity': 10},
+                {'ingredient_id': self.pork_neck.id, 'quantity': 6}
+            ])
+        db.session.rollback()
+
+        self.assertEqual(self._quantities(), [5, 10, 3])
+
+    def test_skips_empty_lines(self):
+        """재료가 없거나 수량이 0 이하인 줄은 무시"""
+        count = deduct_stock_bulk([
+            {'ingredient_id': None, 'quantity': 3},
+            {'ingredient_id': self.onion.id, 'quantity': 0}
+        ])
+
+        self.assertEqual(count, 0)
+        self.assertEqual(self._quantities(), [5, 10, 3])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,125 @@
+import unittest
+from datetime import datetime, timedelta
+from app import create_app
+from extensions import db
+from models.inventory import (
+    InventoryItem, InventoryBatch, StockItem, StockTransaction, InventoryLedgerEntry, InventoryLedgerSnapshot
+)
+from utils.inventory_ledger import (
+    ITEM_ACCOUNT,
+    append_ledger_entries,
+    initialize_ledger,
+    take_ledger_snapshots,
+    stock_at
+)
+
+class TestInventoryLedger(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.item = InventoryItem(name='양파', unit='kg', min_quantity=1, current_quantity=0)
+        db.session.add(self.item)
+        db.session.flush()
+        self.stock = StockItem(item_id=self.item.id, quantity=0, unit='kg')
+        db.session.add(self.stock)
+        db.session.commit()
+        self.account = (self.item.id, self.stock.id)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _entries(self):
+        return [
+            (e.item_id, e.stock_item_id, e.quantity, e.source)
+            for e in InventoryLedgerEntry.query.order_by(InventoryLedgerEntry.id)
+        ]
+
+    def test_stock_movements_are_appended(self):
+        """배치 입고와 재고 거래는 flush 시 원장에 추가되고 출고 수량은 음수로 기록"""
+        db.session.add(InventoryBatch(item_id=self.item.id, batch_number='B-1', quantity=10))
+        db.session.add(StockTransaction(stock_item_id=self.stock.id, transaction_type='usage', quantity=3, unit='kg'))
+        db.session.commit()
+
+        self.assertEqual(self._entries(), [
+            (self.item.id, ITEM_ACCOUNT, 10, 'receipt'),
+            (self.item.id, self.stock.id, -3, 'usage')
+        ])
+
+    def test_ledger_is_append_only(self):
+        """원장 행은 수정하거나 삭제할 수 없음"""
+        db.session.add(InventoryBatch(item_id=self.item.id, batch_number='B-1', quantity=10))
+        db.session.commit()
+        entry = InventoryLedgerEntry.query.one()
+
+        entry.quantity = 5
+        with self.assertRaises(ValueError):
+            db.session.flush()
+        db.session.rollback()
+
+        db.session.delete(entry)
+        with self.assertRaises(ValueError):
+            db.session.flush()
+        db.session.rollback()
+        self.assertEqual(InventoryLedgerEntry.query.count(), 1)
+
+    def test_opening_balance_covers_movements_before_initialization(self):
+        """초기화 전에 기록된 변동이 있어도 기초 잔량은 현재 수량 - 기존 원장 합계"""
+        self.item.current_quantity = 20
+        self.stock.quantity = 18
+        db.session.add(StockTransaction(stock_item_id=self.stock.id, transaction_type='usage', quantity=2, unit='kg'))
+        db.session.commit()
+
+        self.assertEqual(initialize_ledger(), 2)
+        self.assertEqual(stock_at(self.item.id), 20)
+        self.assertEqual(stock_at(self.item.id, stock_item_id=self.stock.id), 18)
+        self.assertEqual(take_ledger_snapshots(grace_seconds=0)[1], [])
+
+        # 다시 실행해도 기초 잔량을 중복 추가하지 않음
+        self.assertEqual(initialize_ledger(), 0)
+
+    def test_snapshot_skips_recent_entries(self):
+        """유예 구간 안의 최근 원장은 스냅샷에 포함하지 않고 이후 조회에서 다시 합산"""
+        now = datetime.utcnow()
+        append_ledger_entries(db.session.connection(), [
+            dict(item_id=self.item.id, stock_item_id=self.stock.id, quantity=5, source='opening',
+                 created_at=now - timedelta(hours=1)),
+            dict(item_id=self.item.id, stock_item_id=self.stock.id, quantity=-1, source='usage', created_at=now)
+        ])
+        self.stock.quantity = 4
+        db.session.commit()
+
+        count, mismatches = take_ledger_snapshots(grace_seconds=600)
+        self.assertEqual((count, mismatches), (1, []))
+        snapshot = InventoryLedgerSnapshot.query.one()
+        self.assertEqual(snapshot.quantity, 5)
+        self.assertEqual(stock_at(self.item.id, stock_item_id=self.stock.id), 4)
+
+        # 유예 구간이 지나면 남은 원장까지 스냅샷에 포함
+        self.assertEqual(take_ledger_snapshots(grace_seconds=0)[0], 1)
+        latest = InventoryLedgerSnapshot.query.order_by(InventoryLedgerSnapshot.ledger_id.desc()).first()
+        self.assertEqual(latest.quantity, 4)
+
+    def test_stock_at_point_in_time(self):
+        """기준 시각 이전의 스냅샷과 원장만 반영"""
+        start = datetime(2024, 3, 1, 9, 0)
+        append_ledger_entries(db.session.connection(), [
+            dict(item_id=self.item.id, quantity=10, source='opening', created_at=start),
+            dict(item_id=self.item.id, quantity=-3, source='usage', created_at=start + timedelta(hours=2)),
+            dict(item_id=self.item.id, quantity=5, source='receipt', created_at=start + timedelta(days=1))
+        ])
+        db.session.commit()
+        take_ledger_snapshots(grace_seconds=0)
+
+        self.assertEqual(stock_at(self.item.id, start + timedelta(hours=1)), 10)
+        self.assertEqual(stock_at(self.item.id, start + timedelta(hours=3)), 7)
+        self.assertEqual(stock_at(self.item.id), 12)
+
+if __name__ == '__main__':
+    unittest.main()
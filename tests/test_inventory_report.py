@@ -0,0 +1,80 @@
+import unittest
+from datetime import date, datetime, timedelta
+from app import create_app
+from extensions import db
+from models.inventory import InventoryItem, Ingredient, StockItem, StockTransaction, InventoryMonthlySnapshot
+from utils.archiving import ensure_archive_tables
+from utils.inventory_report import get_monthly_inventory_report, snapshot_monthly_inventory
+
+class TestMonthlyInventoryReport(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        ensure_archive_tables()
+
+        # 돼지고기 품목(재고 항목 5 + 10)을 두 재료가 함께 쓰고, 양파 품목(재고 항목 3)은 한 재료만 쓴다
+        pork = InventoryItem(name='돼지고기', unit='kg', min_quantity=1, current_quantity=15)
+        onion = InventoryItem(name='양파', unit='kg', min_quantity=1, current_quantity=3)
+        db.session.add_all([pork, onion])
+        db.session.flush()
+        self.pork_stock = StockItem(item_id=pork.id, quantity=5, unit='kg')
+        db.session.add_all([
+            self.pork_stock,
+            StockItem(item_id=pork.id, quantity=10, unit='kg'),
+            StockItem(item_id=onion.id, quantity=3, unit='kg'),
+            Ingredient(name='삼겹살', item_id=pork.id, quantity=1, unit='kg'),
+            Ingredient(name='목살', item_id=pork.id, quantity=1, unit='kg'),
+            Ingredient(name='양파', item_id=onion.id, quantity=1, unit='kg')
+        ])
+        db.session.commit()
+
+        last_month = date.today().replace(day=1) - timedelta(days=1)
+        self.year, self.month = last_month.year, last_month.month
+        in_month = datetime(self.year, self.month, 10, 12, 0)
+        # 사용 거래는 음수와 양수로 기록된 경우가 섞여 있다
+        self._add_transaction('purchase', 10, in_month)
+        self._add_transaction('usage', -2, in_month)
+        self._add_transaction('usage', 3, in_month)
+        self._add_transaction('usage', 1, datetime.now())
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_transaction(self, transaction_type, quantity, created_at):
+        db.session.add(StockTransaction(stock_item_id=self.pork_stock.id, transaction_type=transaction_type,
+                                        quantity=quantity, unit='kg', created_at=created_at))
+
+    def test_shared_item_is_reported_once_with_normalized_usage(self):
+        """재료들이 함께 쓰는 품목은 한 행으로, 양수로 기록된 사용도 출고로 합산"""
+        report, _, _ = get_monthly_inventory_report(self.year, self.month)
+
+        self.assertEqual(list(report), ['돼지고기', '양파'])
+        pork = report['돼지고기']
+        self.assertEqual(pork['ingredients'], '목살, 삼겹살')
+        self.assertEqual(pork['current_stock'], 15)
+        self.assertEqual(pork['received_quantity'], 10)
+        self.assertEqual(pork['used_quantity'], 5)
+        # 기말 = 현재 15 + 이번 달 사용 1, 기초 = 기말 16 - (입고 10 - 사용 5)
+        self.assertEqual(pork['closing_stock'], 16)
+        self.assertEqual(pork['opening_stock'], 11)
+        self.assertEqual((report['양파']['opening_stock'], report['양파']['closing_stock']), (3, 3))
+
+    def test_snapshot_matches_computed_report(self):
+        """마감된 월은 스냅샷에 저장한 값으로 같은 리포트를 반환"""
+        computed, _, _ = get_monthly_inventory_report(self.year, self.month)
+        self.assertEqual(snapshot_monthly_inventory(self.year, self.month), 2)
+        self.assertEqual(InventoryMonthlySnapshot.query.count(), 2)
+
+        snapshot, _, _ = get_monthly_inventory_report(self.year, self.month)
+        computed['돼지고기']['current_stock'] = computed['돼지고기']['closing_stock']
+        self.assertEqual(snapshot['돼지고기'], computed['돼지고기'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+from migrations import MigrationManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REVISIONS = {
+    'a1_add_note.py': '''
+        revision = 'a1'
+        down_revision = None
+        from alembic import op
+        import sqlalchemy as sa
+
+        def upgrade():
+            op.add_column('orders', sa.Column('note', sa.String(50)))
+            op.execute("UPDATE orders SET note = 'x'")
+
+        def downgrade():
+            with op.batch_alter_table('orders') as batch_op:
+                batch_op.drop_column('note')
+    ''',
+    'b2_items_index.py': '''
+        revision = 'b2'
+        down_revision = 'a1'
+        from alembic import op
+
+        def upgrade():
+            op.create_index('ix_items_name', 'items', ['name'])
+
+        def downgrade():
+            op.drop_index('ix_items_name', 'items')
+    '''
+}
+
+class TestMigrationManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        versions_dir = os.path.join(self.tmp_dir, 'versions')
+        os.makedirs(versions_dir)
+        for name, source in REVISIONS.items():
+            with open(os.path.join(versions_dir, name), 'w') as f:
+                f.write(textwrap.dedent(source))
+
+        # 운영 DB: orders 500행, items 20행
+        self.db_path = os.path.join(self.tmp_dir, 'live.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE orders (id INTEGER PRIMARY KEY, total INTEGER)')
+        conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+        conn.executemany('INSERT INTO orders (total) VALUES (?)', [(i,) for i in range(500)])
+        conn.executemany('INSERT INTO items (name) VALUES (?)', [(str(i),) for i in range(20)])
+        conn.commit()
+        conn.close()
+
+        with mock.patch.dict(os.environ, {'DATABASE_URL': f'sqlite:///{self.db_path}'}):
+            self.manager = MigrationManager()
+        self.manager.alembic_cfg.set_main_option('script_location', os.path.join(ROOT, 'migrations'))
+        self.manager.alembic_cfg.set_main_option('version_locations', versions_dir)
+
+    def tearDown(self):
+        self.manager.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _order_columns(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return [row[1] for row in conn.execute('PRAGMA table_info(orders)')]
+        finally:
+            conn.close()
+
+    def test_dry_run_leaves_live_database_untouched(self):
+        """드라이런은 샘플 DB에만 적용되고 운영 DB는 바뀌지 않음"""
+        result = self.manager.dry_run(sample_rows=50)
+
+        self.assertEqual([r['revision'] for r in result['revisions']], ['a1', 'b2'])
+        self.assertIsNone(self.manager.current_revision())
+        self.assertEqual(self._order_columns(), ['id', 'total'])
+
+    def test_dry_run_scales_by_touched_tables(self):
+        """리비전별 배율은 그 리비전이 쓰기를 실행한 테이블의 행 수로 계산"""
+        result = self.manager.dry_run(sample_rows=50)
+        revisions = {r['revision']: r for r in result['revisions']}
+
+        self.assertEqual(revisions['a1']['tables'], ['orders'])
+        self.assertAlmostEqual(revisions['a1']['scale'], 10.0)
+        self.assertEqual(revisions['b2']['tables'], ['items'])
+        self.assertAlmostEqual(revisions['b2']['scale'], 1.0)
+
+        history = self.manager.run_history()
+        self.assertTrue(all(row['dry_run'] for row in history))
+
+    def test_downgrade_records_each_revision(self):
+        """여러 리비전을 되돌리면 리비전별로 이력 기록"""
+        self.manager.upgrade()
+        self.assertEqual(self.manager.current_revision(), 'b2')
+
+        records = self.manager.downgrade('base')
+
+        self.assertEqual([r['revision'] for r in records], ['b2', 'a1'])
+        self.assertTrue(all(r['direction'] == 'downgrade' for r in records))
+        self.assertIsNone(self.manager.current_revision())
+        self.assertEqual(self._order_columns(), ['id', 'total'])
+
+if __name__ == '__main__':
+    unittest.main()
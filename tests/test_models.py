@@ -2,6 +2,8 @@ import unittest
 from datetime import datetime, date, timedelta
 from models import db, User, Store, Attendance, UserContract, Schedule, WorkLog, WorkFeedback
 from app import app
+from flask import Flask
+from models import Supplier, Order, OrderItem, order_totals_query
 
 class TestModels(unittest.TestCase):
     def setUp(self):
@@ -115,5 +117,96 @@ class TestModels(unittest.TestCase):
         self.assertEqual(feedback.user_id, self.user.id)
         self.assertEqual(feedback.rating, 5)
 
+class TestOrderTotals(unittest.TestCase):
+    """주문 품목 변경 시 item_count, total_amount 자동 갱신 테스트"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['TESTING'] = True
+        db.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username='orderer', email='orderer@example.com')
+        supplier = Supplier(name='테스트 공급업체')
+        db.session.add_all([user, supplier])
+        db.session.flush()
+        self.orders = [
+            Order(user_id=user.id, supplier_id=supplier.id,
+                  order_date=datetime.now(), delivery_date=datetime.now() + timedelta(days=1))
+            for _ in range(2)
+        ]
+        db.session.add_all(self.orders)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_item(self, order, quantity, unit_price):
+        item = OrderItem(order_id=order.id, item_name='양파', quantity=quantity, unit_price=unit_price)
+        db.session.add(item)
+        db.session.commit()
+        return item
+
+    def assertTotals(self, expected):
+        """저장된 값과 로드된 객체 값이 order_items 집계와 같은지 확인"""
+        order_ids = [order.id for order in self.orders]
+        computed = {
+            order_id: (count, total)
+            for order_id, count, total in db.session.execute(order_totals_query(order_ids))
+        }
+        stored = {
+            order_id: (count, total)
+            for order_id, count, total in db.session.execute(
+                db.select(Order.id, Order.item_count, Order.total_amount).where(Order.id.in_(order_ids))
+            )
+        }
+        for order, (count, total) in zip(self.orders, expected):
+            self.assertEqual(stored[order.id], computed.get(order.id, (0, 0.0)))
+            self.assertEqual(stored[order.id], (count, total))
+            self.assertEqual((order.item_count, order.total_amount), (count, total))
+
+    def test_add_item(self):
+        """품목 추가"""
+        self._add_item(self.orders[0], 2, 1000)
+        self._add_item(self.orders[0], 1, 500)
+        self.assertTotals([(2, 2500.0), (0, 0.0)])
+
+    def test_change_quantity_and_price(self):
+        """품목 수량, 단가 변경"""
+        item = self._add_item(self.orders[0], 2, 1000)
+        item.quantity = 3
+        db.session.commit()
+        self.assertTotals([(1, 3000.0), (0, 0.0)])
+
+        item.unit_price = 1500
+        db.session.commit()
+        self.assertTotals([(1, 4500.0), (0, 0.0)])
+
+    def test_delete_item(self):
+        """품목 삭제"""
+        item = self._add_item(self.orders[0], 2, 1000)
+        self._add_item(self.orders[0], 1, 500)
+        db.session.delete(item)
+        db.session.commit()
+        self.assertTotals([(1, 500.0), (0, 0.0)])
+
+    def test_move_item_between_orders(self):
+        """품목을 다른 주문으로 이동 (외래 키 변경, 관계 변경 모두 이전 주문도 갱신)"""
+        item = self._add_item(self.orders[0], 2, 1000)
+        self._add_item(self.orders[0], 1, 500)
+
+        item.order_id = self.orders[1].id
+        db.session.commit()
+        self.assertTotals([(1, 500.0), (1, 2000.0)])
+
+        item.order = self.orders[0]
+        db.session.commit()
+        self.assertTotals([(2, 2500.0), (0, 0.0)])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app import create_app
+from extensions import db
+from models.notification import Notification
+from utils.pagination import encode_cursor, decode_cursor, keyset_paginate
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # 시각이 같은 행, 시각이 NULL인 행을 섞어서 생성
+        base = datetime(2024, 1, 1, 9, 0)
+        created = [base, base, base + timedelta(minutes=1), None, base + timedelta(minutes=2),
+                   None, base + timedelta(minutes=1), base, None, base + timedelta(minutes=3)]
+        db.session.execute(insert(Notification.__table__), [
+            dict(id=i + 1, user_id=1, title=f'알림 {i + 1}', message='내용', created_at=created_at)
+            for i, created_at in enumerate(created)
+        ])
+        db.session.commit()
+        self.created = {i + 1: created_at for i, created_at in enumerate(created)}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _paginate(self, cursor=None, limit=3):
+        return keyset_paginate(Notification.query, Notification.created_at, Notification.id, cursor, limit)
+
+    def _all_pages(self, limit):
+        ids, cursor = [], None
+        while True:
+            page = self._paginate(cursor, limit)
+            ids.extend(item.id for item in page.items)
+            if not page.has_more:
+                return ids
+            cursor = page.next_cursor
+
+    def test_cursor_round_trip(self):
+        """커서는 (created_at, id)를 그대로 복원 (created_at이 NULL인 경우 포함)"""
+        created_at = datetime(2024, 1, 1, 9, 30, 15)
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 7)), (created_at, 7))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 ValueError"""
+        with self.assertRaises(ValueError):
+            self._paginate('not-a-cursor')
+
+    def test_pages_cover_all_rows_in_order(self):
+        """모든 페이지를 넘기면 모든 행이 (created_at, id) 내림차순으로 한 번씩 조회되고 NULL 행은 마지막"""
+        dated = sorted((i for i, c in self.created.items() if c is not None),
+                       key=lambda i: (self.created[i], i), reverse=True)
+        undated = sorted((i for i, c in self.created.items() if c is None), reverse=True)
+
+        for limit in (1, 3, 4, 10, 20):
+            self.assertEqual(self._all_pages(limit), dated + undated)
+
+    def test_last_page_has_no_cursor(self):
+        """마지막 페이지는 next_cursor가 없음"""
+        page = self._paginate(limit=10)
+        self.assertEqual(len(page.items), 10)
+        self.assertIsNone(page.next_cursor)
+        self.assertFalse(page.has_more)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+from app import create_app
+from extensions import db
+from models import User, Employee, Schedule, ScheduleDigestState
+from scheduler.schedule_checker import check_unconfirmed_schedules
+
+class TestUnconfirmedScheduleDigest(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.admin = User(username='admin', email='admin@example.com', role='admin')
+        worker = User(username='worker', email='worker@example.com', role='user')
+        db.session.add_all([self.admin, worker])
+        db.session.flush()
+        self.employee = Employee(user_id=worker.id, name='김직원', email='kim@example.com')
+        db.session.add(self.employee)
+        db.session.flush()
+
+        today = date.today()
+        self.pending = self._add_schedule(today - timedelta(days=2))
+        self._add_schedule(today - timedelta(days=3), is_approved=True)
+        self._add_schedule(today + timedelta(days=1))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_schedule(self, day, is_approved=False):
+        schedule = Schedule(employee_id=self.employee.id, date=day, start_time=time(9, 0), end_time=time(18, 0),
+                            work_type='정규', is_approved=is_approved)
+        db.session.add(schedule)
+        return schedule
+
+    @patch('scheduler.schedule_checker.send_admin_alert')
+    def test_digest_lists_unapproved_past_schedules(self, send_admin_alert):
+        """1일 이상 지난 미승인 스케줄만 직원 이름과 함께 관리자별로 한 번 요약"""
+        check_unconfirmed_schedules()
+
+        send_admin_alert.assert_called_once()
+        message = send_admin_alert.call_args[0][0]
+        self.assertIn('미확인 스케줄 1건', message)
+        self.assertIn(f"김직원 {self.pending.date.strftime('%Y-%m-%d')} 09:00 ~ 18:00", message)
+
+        state = db.session.get(ScheduleDigestState, self.admin.id)
+        self.assertEqual(state.schedule_ids, [self.pending.id])
+
+    @patch('scheduler.schedule_checker.send_admin_alert')
+    def test_digest_is_coalesced_until_new_schedules(self, send_admin_alert):
+        """병합 간격 안에서는 새 미승인 스케줄이 있을 때만 다시 발송"""
+        check_unconfirmed_schedules()
+        check_unconfirmed_schedules()
+        self.assertEqual(send_admin_alert.call_count, 1)
+
+        self._add_schedule(date.today() - timedelta(days=1))
+        db.session.commit()
+        check_unconfirmed_schedules()
+        self.assertEqual(send_admin_alert.call_count, 2)
+        self.assertIn('미확인 스케줄 2건 (1일 이상 경과), 신규 1건', send_admin_alert.call_args[0][0])
+
+if __name__ == '__main__':
+    unittest.main()
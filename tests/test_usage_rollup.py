@@ -0,0 +1,113 @@
+import unittest
+from datetime import date, datetime
+from app import create_app
+from extensions import db
+from models.inventory import InventoryItem, StockItem, StockTransaction, DailyUsageRollup
+from utils.archiving import ensure_archive_tables
+from utils.usage_rollup import (
+    get_cached_stats,
+    set_cached_stats,
+    clear_stats_cache,
+    set_usage_user,
+    rebuild_daily_usage
+)
+
+class TestDailyUsageRollup(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        clear_stats_cache()
+
+        self.item = InventoryItem(name='양파', unit='kg', min_quantity=1, current_quantity=20)
+        db.session.add(self.item)
+        db.session.flush()
+        self.stock = StockItem(item_id=self.item.id, quantity=20, unit='kg')
+        db.session.add(self.stock)
+        db.session.commit()
+        self.used_at = datetime(2024, 3, 1, 12, 0)
+
+    def tearDown(self):
+        clear_stats_cache()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_transaction(self, quantity, transaction_type='usage'):
+        db.session.add(StockTransaction(
+            stock_item_id=self.stock.id, transaction_type=transaction_type,
+            quantity=quantity, unit='kg', created_at=self.used_at
+        ))
+
+    def _rollups(self):
+        return [
+            (r.date, r.item_id, r.user_id, r.quantity, r.transaction_count)
+            for r in DailyUsageRollup.query.order_by(DailyUsageRollup.user_id)
+        ]
+
+    def test_usage_transactions_are_rolled_up_per_user(self):
+        """ORM으로 추가한 사용 거래는 지정한 사용자별로 일별 집계에 반영"""
+        self._add_transaction(-2)
+        db.session.commit()
+        set_usage_user(db.session, 7)
+        self._add_transaction(-1.5)
+        self._add_transaction(-0.5)
+        self._add_transaction(10, transaction_type='in')
+        db.session.commit()
+
+        self.assertEqual(self._rollups(), [
+            (date(2024, 3, 1), self.item.id, 0, 2.0, 1),
+            (date(2024, 3, 1), self.item.id, 7, 2.0, 2)
+        ])
+
+    def test_rolled_back_usage_is_not_counted(self):
+        """롤백된 사용 거래는 집계에 남지 않음"""
+        self._add_transaction(-3)
+        db.session.flush()
+        db.session.rollback()
+        self._add_transaction(-1)
+        db.session.commit()
+
+        self.assertEqual(self._rollups(), [(date(2024, 3, 1), self.item.id, 0, 1.0, 1)])
+
+    def test_cache_cleared_only_after_commit(self):
+        """통계 캐시는 집계가 바뀐 트랜잭션이 커밋된 뒤에 비워짐"""
+        set_cached_stats('key', 'old')
+        self._add_transaction(-1)
+        db.session.flush()
+        self.assertEqual(get_cached_stats('key', 60), 'old')
+
+        db.session.commit()
+        self.assertIsNone(get_cached_stats('key', 60))
+
+    def test_cache_kept_after_rollback(self):
+        """롤백하면 캐시를 비우지 않고, 다음 커밋에서도 비우지 않음"""
+        set_cached_stats('key', 'old')
+        self._add_transaction(-1)
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+
+        self.assertEqual(get_cached_stats('key', 60), 'old')
+
+    def test_rebuild_daily_usage(self):
+        """재계산은 기간의 집계를 재고 거래로 다시 만들고 캐시를 비움"""
+        ensure_archive_tables()
+        self._add_transaction(-2)
+        self._add_transaction(-3)
+        db.session.commit()
+        DailyUsageRollup.query.delete()
+        db.session.commit()
+        set_cached_stats('key', 'old')
+
+        count = rebuild_daily_usage(db.session, date(2024, 3, 1), date(2024, 3, 1))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(self._rollups(), [(date(2024, 3, 1), self.item.id, 0, 5.0, 2)])
+        self.assertIsNone(get_cached_stats('key', 60))
+
+if __name__ == '__main__':
+    unittest.main()